@@ -67,3 +67,13 @@ DEFAULT_INITIAL_LEVEL = 0.5
 DEFAULT_INITIAL_LEVEL_OPTIM = False
 DEFAULT_SERIES = False
 DEFAULT_CONSTRAINTS = False
+
+
+BATTERIES_NUMERIC_COLUMNS = [
+    InputBatteriesColumns.NET_MAX_CAP_GEN,
+    InputBatteriesColumns.NET_MAX_CAP_DEM,
+    InputBatteriesColumns.STO_CAP,
+]
+INPUT_BATTERIES_DTYPES = {
+    col.value: float if col in BATTERIES_NUMERIC_COLUMNS else str for col in InputBatteriesColumns
+}
@@ -27,6 +27,7 @@ from antares.data_collection.batteries.constants import (
     DEFAULT_SERIES,
     EFFICIENCY_INJECTION,
     GROUP_VALUES,
+    INPUT_BATTERIES_DTYPES,
     OP_STAT_MARKET,
     OP_STAT_RESIDENTIAL,
     PEMMDB_PLANT_TYPE_MARKET,
@@ -35,16 +36,20 @@ from antares.data_collection.batteries.constants import (
     OutputBatteriesColumns,
 )
 from antares.data_collection.constants import ANTARES_NODE_NAME_COLUMN, MAX_DECIMAL_DIGITS, YearId
+from antares.data_collection.filter_pipeline import FilterPipeline
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.referential_data.main_params import MainParams
 from antares.data_collection.utils import (
+    UnitLifetimeIndex,
     add_code_antares_colum,
-    filter_based_on_commission_date,
-    filter_based_on_net_max_gen_cap,
-    filter_based_on_op_stat,
-    filter_based_on_study_scenarios,
-    filter_non_declared_areas,
+    commission_date_stage,
+    convert_commission_dates,
+    declared_areas_stage,
     filter_out_based_on_year,
+    net_max_gen_cap_stage,
+    op_stat_stage,
     parse_input_file,
+    study_scenarios_stage,
 )
 
 
@@ -60,6 +65,7 @@ class BatteriesParser:
         pemmdb_plant_type_residential: list[str] = PEMMDB_PLANT_TYPE_RESIDENTIAL,
         op_stat_residential: list[str] = OP_STAT_RESIDENTIAL,
         efficiency_injection: float = EFFICIENCY_INJECTION,
+        input_cache: InputFileCache | None = None,
     ):
         self.input_folder = input_folder
         self.output_folder = output_folder
@@ -70,25 +76,44 @@ class BatteriesParser:
         self.op_stat_residential = op_stat_residential
         self.efficiency_injection = efficiency_injection
         self.years = years
+        self.input_cache = input_cache
         self.filtered_dataframe = self._build_filtered_batteries_dataframe()
+        self.lifetime_index = UnitLifetimeIndex(
+            self.filtered_dataframe,
+            years,
+            InputBatteriesColumns.COMMISSIONING_DATE,
+            InputBatteriesColumns.DECOMMISSIONING_DATE_EXPECTED,
+        )
 
     def _read_input_file_batteries(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder.joinpath(BATTERIES_INPUT_FILE), list(InputBatteriesColumns))
+        return parse_input_file(
+            self.input_folder.joinpath(BATTERIES_INPUT_FILE),
+            list(InputBatteriesColumns),
+            self.input_cache,
+            INPUT_BATTERIES_DTYPES,
+        )
 
     def _build_filtered_batteries_dataframe(self) -> pd.DataFrame:
-        df = self._read_input_file_batteries()
-        df = filter_non_declared_areas(self.main_params, df, InputBatteriesColumns.MARKET_NODE)
-        df = filter_based_on_study_scenarios(df, self.main_params, self.years, InputBatteriesColumns.STUDY_SCENARIO)
-        df = filter_based_on_commission_date(
-            df,
-            self.years,
-            InputBatteriesColumns.COMMISSIONING_DATE,
-            InputBatteriesColumns.DECOMMISSIONING_DATE_EXPECTED,
+        pipeline = FilterPipeline(
+            [
+                declared_areas_stage(self.main_params, InputBatteriesColumns.MARKET_NODE),
+                study_scenarios_stage(self.main_params, self.years, InputBatteriesColumns.STUDY_SCENARIO),
+                commission_date_stage(
+                    self.years,
+                    InputBatteriesColumns.COMMISSIONING_DATE,
+                    InputBatteriesColumns.DECOMMISSIONING_DATE_EXPECTED,
+                ),
+                op_stat_stage(self.op_stat_market + self.op_stat_residential, InputBatteriesColumns.OP_STAT),
+                net_max_gen_cap_stage(InputBatteriesColumns.NET_MAX_CAP_GEN),
+                net_max_gen_cap_stage(InputBatteriesColumns.NET_MAX_CAP_DEM),
+                net_max_gen_cap_stage(InputBatteriesColumns.STO_CAP),
+            ]
+        )
+        df = pipeline.apply(self._read_input_file_batteries())
+        df = convert_commission_dates(
+            df, InputBatteriesColumns.COMMISSIONING_DATE, InputBatteriesColumns.DECOMMISSIONING_DATE_EXPECTED
         )
-        df = filter_based_on_op_stat(self.op_stat_market + self.op_stat_residential, df, InputBatteriesColumns.OP_STAT)
-        df = filter_based_on_net_max_gen_cap(df, InputBatteriesColumns.NET_MAX_CAP_GEN)
-        df = filter_based_on_net_max_gen_cap(df, InputBatteriesColumns.NET_MAX_CAP_DEM)
-        df = filter_based_on_net_max_gen_cap(df, InputBatteriesColumns.STO_CAP)
+        self.filter_reports = pipeline.reports
         df = add_code_antares_colum(self.main_params, df, InputBatteriesColumns.MARKET_NODE)
 
         return df
@@ -96,7 +121,11 @@ class BatteriesParser:
     def _compute_aggregated_columns_year(self, df: pd.DataFrame, year: int) -> pd.DataFrame:
         # filter for a year
         df = filter_out_based_on_year(
-            df, year, InputBatteriesColumns.COMMISSIONING_DATE, InputBatteriesColumns.DECOMMISSIONING_DATE_EXPECTED
+            df,
+            year,
+            InputBatteriesColumns.COMMISSIONING_DATE,
+            InputBatteriesColumns.DECOMMISSIONING_DATE_EXPECTED,
+            self.lifetime_index,
         )
 
         # duration capacity
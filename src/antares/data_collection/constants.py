@@ -19,5 +19,8 @@ ANTARES_NODE_NAME_COLUMN = "antares_node"
 DEFAULT_DECOMMISSIONING_DATE = pd.Timestamp(year=2100, month=1, day=1)
 YearId: TypeAlias = int
 SCENARIO_TO_ALWAYS_CONSIDER = "All_years_ERAA_TYNDP"
+STUDY_SCENARIO_SEPARATOR = "&"
 OUTPUT_DATE_INT_REFERENCE = 2029
 ANTARES_CLUSTER_NAME_COLUMN = "cluster_name"
+CACHE_MANIFEST_NAME = "manifest.json"
+DEFAULT_CACHE_MAX_SIZE = 5 * 1024**3  # 5 GiB
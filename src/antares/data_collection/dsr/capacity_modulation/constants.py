@@ -12,6 +12,8 @@
 
 from enum import StrEnum
 
+import pandas as pd
+
 from antares.data_collection.dsr.constants import DSR_EXPORT_ROOT_DIR
 
 DSR_DERATING_INDEX_NAME = "DSR Derating Index.csv"
@@ -21,9 +23,15 @@ DSR_EXPORT_DATE_COLUMN = "date"
 DSR_DATE_INT_REFERENCE = 2028
 DSR_CAPACITY_MODULATION_FOLDER = DSR_EXPORT_ROOT_DIR / "capacity_modulation"
 
+# Used when no curve is found for a derating id
+DEFAULT_DSR_DERATING_TS = pd.Series(8760 * [1])
+
 
 class InputDeratingIndexColumns(StrEnum):
     ZONE = "ZONE"
     ID = "ID"
     TARGET_YEAR = "TARGET_YEAR"
     CURVE_UID = "CURVE_UID"
+
+
+INPUT_DERATING_INDEX_DTYPES = {col.value: str for col in InputDeratingIndexColumns}
@@ -10,52 +10,54 @@
 #
 # This file is part of the Antares project.
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TypeAlias
 
+import numpy as np
 import pandas as pd
 
 from antares.data_collection.constants import (
-    ANTARES_NODE_NAME_COLUMN,
     OUTPUT_DATE_INT_REFERENCE,
-    SCENARIO_TO_ALWAYS_CONSIDER,
     YearId,
 )
 from antares.data_collection.dsr.capacity_modulation.constants import (
+    DEFAULT_DSR_DERATING_TS,
     DSR_CAPACITY_MODULATION_FOLDER,
     DSR_CAPACITY_MODULATION_NAME_FILE,
     DSR_DERATING_INDEX_NAME,
     DSR_DERATING_NAME,
     DSR_EXPORT_DATE_COLUMN,
+    INPUT_DERATING_INDEX_DTYPES,
     InputDeratingIndexColumns,
 )
 from antares.data_collection.dsr.constants import DSR_INDEX_GROUP_COLUMNS, InputDsrColumns
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.referential_data.main_params import MainParams
 from antares.data_collection.utils import (
-    filter_index_files_with_scenario_year,
+    CurveIndex,
+    UnitLifetimeIndex,
     filter_out_based_on_year,
     insert_str_date_time_reindex,
     parse_input_file,
+    parse_time_series_file,
     write_excel_workbook,
 )
 
-# mapping used for index file
-ZoneId: TypeAlias = str
+AntaresCodeId: TypeAlias = str
 DeratingId: TypeAlias = str
-CurveIds: TypeAlias = list[str]
-IndexMapping: TypeAlias = dict[ZoneId, dict[DeratingId, CurveIds]]
+CurveUids: TypeAlias = tuple[str, ...]
 
-# mapping used to add/manage weights calculation
-WeightValue: TypeAlias = float
-AntaresCodeId: TypeAlias = str
-IndexDsrClusterWeight: TypeAlias = dict[AntaresCodeId, dict[DeratingId, WeightValue]]
+# Share of the capacity of each area (the `ANTARES_NODE_NAME_COLUMN` level) that uses each derating id
+DsrClusterWeights: TypeAlias = pd.Series
 
 
 @dataclass(frozen=True)
 class InternalMapping:
-    index: IndexMapping
+    index: CurveIndex
     data: pd.DataFrame
+    # Derating curve of each set of curve UIDs, computed once for all the years
+    curves: dict[CurveUids, pd.Series] = field(default_factory=dict)
 
 
 @dataclass
@@ -68,120 +70,99 @@ DsrWeightTsRepartition: TypeAlias = dict[AntaresCodeId, dict[DeratingId, list[Ti
 
 
 class DsrCapacityModulationParser:
-    def __init__(self, input_folder: Path, output_folder: Path, main_params: MainParams, years: list[int]):
+    def __init__(
+        self,
+        input_folder: Path,
+        output_folder: Path,
+        main_params: MainParams,
+        years: list[int],
+        input_cache: InputFileCache | None = None,
+    ):
         self.input_folder = input_folder
         self.output_folder = output_folder
         self.main_params = main_params
         self.years = years
+        self.input_cache = input_cache
 
-    def _build_index_internal_mapping(
-        self, df: pd.DataFrame, year: int, cols_to_group: list[str], curve_id_col: str
-    ) -> IndexMapping:
-        df = filter_index_files_with_scenario_year(
-            self.main_params,
-            df=df,
-            year=year,
-            filter_scenario_value=SCENARIO_TO_ALWAYS_CONSIDER,
-            target_year_col=InputDeratingIndexColumns.TARGET_YEAR.value,
-        )
-        groups = df.groupby(by=cols_to_group, as_index=False)
-        mapping: IndexMapping = {}
-        for (area, cluster), grouped_df in groups:
-            assert isinstance(area, ZoneId)
-            assert isinstance(cluster, DeratingId)
-            mapping.setdefault(area, {})[cluster] = list(grouped_df[curve_id_col])
-        return mapping
-
-    def _build_index_mapping(self, df: pd.DataFrame, year: int) -> IndexMapping:
-        columns_to_group = [InputDeratingIndexColumns.ZONE.value, InputDeratingIndexColumns.ID.value]
-        return self._build_index_internal_mapping(df, year, columns_to_group, InputDeratingIndexColumns.CURVE_UID)
-
-    def _build_index_weight_by_year(self, df: pd.DataFrame, year: YearId) -> IndexDsrClusterWeight:
+    def _build_index_weight_by_year(
+        self, df: pd.DataFrame, year: YearId, lifetime_index: UnitLifetimeIndex | None = None
+    ) -> DsrClusterWeights:
         # filter data dsr cluster
         df = filter_out_based_on_year(
             df,
             year,
             InputDsrColumns.COMMISSIONING_DATE.value,
             InputDsrColumns.DECOMMISSIONING_DATE_EXPECTED.value,
+            lifetime_index,
         )
 
-        # Define grouping columns based on _compute_dsr_cluster_year
-        group_cols = [DSR_INDEX_GROUP_COLUMNS]
-        subgroup_cols = group_cols + [InputDsrColumns.DSR_DERATING_CURVE_ID]
+        # 1. Aggregate capacity by (Area, Curve ID)
+        capacities = df.groupby([DSR_INDEX_GROUP_COLUMNS, InputDsrColumns.DSR_DERATING_CURVE_ID])[
+            InputDsrColumns.NET_MAX_GEN_CAP
+        ].sum()
 
-        # 1. Aggregate capacity by (Area, DSR_cluster, Curve ID)
-        df_weights = df.groupby(subgroup_cols, as_index=False)[InputDsrColumns.NET_MAX_GEN_CAP].sum()
-
-        # 2. Compute total capacity per DSR_cluster
-        df_cluster_total = (
-            df.groupby(group_cols, as_index=False)[[InputDsrColumns.NET_MAX_GEN_CAP]]
-            .sum()
-            .rename(columns={InputDsrColumns.NET_MAX_GEN_CAP: "total_capacity"})
-        )
-
-        # 3. Merge and compute weights
-        df_weights = df_weights.merge(df_cluster_total, on=group_cols)
-        df_weights[InputDsrColumns.NET_MAX_GEN_CAP] = (
-            df_weights[InputDsrColumns.NET_MAX_GEN_CAP] / df_weights["total_capacity"]
+        # 2. Divide by the total capacity of the area
+        total_capacities = df.groupby(DSR_INDEX_GROUP_COLUMNS)[InputDsrColumns.NET_MAX_GEN_CAP].sum()
+        weights: DsrClusterWeights = (
+            capacities / total_capacities.reindex(capacities.index.get_level_values(DSR_INDEX_GROUP_COLUMNS)).to_numpy()
         )
+        return weights
 
-        # 3. Structure into a dictionary
-        dict_of_weight: IndexDsrClusterWeight = {}
-        for _, row in df_weights.iterrows():
-            area = row[ANTARES_NODE_NAME_COLUMN]
-            derating_id = row[InputDsrColumns.DSR_DERATING_CURVE_ID]
-            weight = row[InputDsrColumns.NET_MAX_GEN_CAP]
-
-            dict_of_weight.setdefault(area, {})[derating_id] = weight
-
-        return dict_of_weight
+    @staticmethod
+    def _get_derating_curve(index_derating_data: InternalMapping, uid_names: list[str]) -> pd.Series:
+        """
+        Several time series can be found for on index id corresponding to several curves.
+        In this case, we compute the mean of the time series.
+        If we don't find any time series, we use the value of 1.
+        """
+        key = tuple(uid_names)
+        if key not in index_derating_data.curves:
+            if not uid_names:
+                series = DEFAULT_DSR_DERATING_TS
+            elif len(uid_names) > 1:
+                series = index_derating_data.data[uid_names].mean(axis=1)
+            else:
+                series = index_derating_data.data[uid_names[0]]
+            index_derating_data.curves[key] = series
+        return index_derating_data.curves[key]
 
     def _build_index_weight_repartition(
-        self, index_of_weight: IndexDsrClusterWeight, index_derating_data: InternalMapping
+        self, index_of_weight: DsrClusterWeights, index_derating_data: InternalMapping, year: int
     ) -> DsrWeightTsRepartition:
         """
         Structure data in a dictionary with all data :
             - `weight`: Capacity by area/sector/derating_id / Capacity by zone/sector
             - time series associated to the weight
-        Several time series can be found for on index id corresponding to several curves.
-        In this case, we compute the mean of the time series.
-        If we don't find any time series, we use the value of 1.
         """
         result: DsrWeightTsRepartition = {}
 
-        for zone_id, deratings in index_of_weight.items():
-            for derating_id, weight in deratings.items():
-                uid_name = index_derating_data.index.get(zone_id, {}).get(derating_id)
-
-                if uid_name is None:
-                    series_df = pd.DataFrame({"col": [1] * 8760})
-                else:
-                    series_df = index_derating_data.data[uid_name]
-
-                # compute mean of several time series if necessary
-                if len(series_df.columns) > 1:
-                    series = series_df.mean(axis=1)
-                else:
-                    series = series_df.iloc[:, 0]
-
-                (
-                    result.setdefault(zone_id, {})
-                    .setdefault(derating_id, [])
-                    .append(TimeSeriesAndClusterPair(weight=weight, series=series))
-                )
+        zone_ids = index_of_weight.index.get_level_values(DSR_INDEX_GROUP_COLUMNS)
+        derating_ids = index_of_weight.index.get_level_values(InputDsrColumns.DSR_DERATING_CURVE_ID)
+        for zone_id, derating_id, weight in zip(zone_ids, derating_ids, index_of_weight.tolist()):
+            assert isinstance(zone_id, AntaresCodeId)
+            uid_names = index_derating_data.index.get_curve_uids(zone_id, derating_id, year)
+            series = self._get_derating_curve(index_derating_data, uid_names)
+            (
+                result.setdefault(zone_id, {})
+                .setdefault(derating_id, [])
+                .append(TimeSeriesAndClusterPair(weight=weight, series=series))
+            )
 
         return result
 
     def _build_pegase_dataframe(self, data_repartition: DsrWeightTsRepartition) -> pd.DataFrame:
-        result: dict[str, pd.Series] = {}
-
-        for area, deratings in data_repartition.items():
-            for derating_id, pair_time_series_weights in deratings.items():
-                ts_value = pair_time_series_weights[0].series * pair_time_series_weights[0].weight
-                ts_name = f"{area}_DSR"
-                result[ts_name] = ts_value
-
-        df_result = pd.DataFrame(result)
+        """
+        The series of an area is the curve of its last derating id multiplied by its weight:
+        the curves of all the areas are stacked inside a single (hours x areas) matrix and weighted at once.
+        """
+        df_result = pd.DataFrame()
+        if data_repartition:
+            pairs = [list(deratings.values())[-1][0] for deratings in data_repartition.values()]
+            curves_matrix = np.column_stack([pair.series.to_numpy(dtype=np.float64) for pair in pairs])
+            weights = np.array([pair.weight for pair in pairs], dtype=np.float64)
+            df_result = pd.DataFrame(
+                curves_matrix * weights, columns=[f"{area}_DSR" for area in data_repartition], copy=False
+            )
 
         # Add the Hours columns + reindex with business format
         reindex_df = insert_str_date_time_reindex(df_result, OUTPUT_DATE_INT_REFERENCE, DSR_EXPORT_DATE_COLUMN)
@@ -201,29 +182,43 @@ class DsrCapacityModulationParser:
 
         write_excel_workbook(output_path, dict_to_write)
 
-    def _parse_derating_index(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder / DSR_DERATING_INDEX_NAME, list(InputDeratingIndexColumns))
+    def _parse_derating_index(self) -> CurveIndex:
+        df = parse_input_file(
+            self.input_folder / DSR_DERATING_INDEX_NAME,
+            list(InputDeratingIndexColumns),
+            self.input_cache,
+            INPUT_DERATING_INDEX_DTYPES,
+        )
+        return CurveIndex(
+            df,
+            self.main_params,
+            InputDeratingIndexColumns.ZONE.value,
+            InputDeratingIndexColumns.ID.value,
+            InputDeratingIndexColumns.TARGET_YEAR.value,
+            InputDeratingIndexColumns.CURVE_UID.value,
+        )
 
-    def build_dsr_capacity_modulation(self, df_dsr_cluster_filtered: pd.DataFrame) -> None:
+    def build_dsr_capacity_modulation(
+        self, df_dsr_cluster_filtered: pd.DataFrame, lifetime_index: UnitLifetimeIndex | None = None
+    ) -> None:
         # parsing index file
-        dsr_derating_index_df = self._parse_derating_index()
+        dsr_derating_index = self._parse_derating_index()
 
-        # parsing ts file
-        dsr_derating_ts_df = pd.read_csv(self.input_folder / DSR_DERATING_NAME)
+        # parsing ts file (only the curves used for the requested years)
+        curve_uids = dsr_derating_index.get_referenced_curve_uids(self.years)
+        dsr_derating_ts_df = parse_time_series_file(self.input_folder / DSR_DERATING_NAME, curve_uids, self.input_cache)
+        # the index is looked up for every year
+        derating_index_data = InternalMapping(index=dsr_derating_index, data=dsr_derating_ts_df)
 
         # treatments for every year
         index_of_df_pegase: dict[int, pd.DataFrame] = {}
         for year in self.years:
-            # group index filtered by year + time series (raw data)
-            index_mapping_year = self._build_index_mapping(dsr_derating_index_df, year)
-            derating_index_data = InternalMapping(index=index_mapping_year, data=dsr_derating_ts_df)
-
-            # buil dictionary with weight by sector/derating_id
-            index_cluster_id_weight = self._build_index_weight_by_year(df_dsr_cluster_filtered, year)
+            # weight by area/derating_id
+            index_cluster_id_weight = self._build_index_weight_by_year(df_dsr_cluster_filtered, year, lifetime_index)
 
             # group all data DSR + index/ts in a dictionary
             index_repartition_weight_ts = self._build_index_weight_repartition(
-                index_cluster_id_weight, derating_index_data
+                index_cluster_id_weight, derating_index_data, year
             )
 
             # final treatments to have data frame
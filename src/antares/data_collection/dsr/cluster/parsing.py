@@ -12,6 +12,7 @@
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from antares.data_collection.constants import ANTARES_NODE_NAME_COLUMN, MAX_DECIMAL_DIGITS, YearId
@@ -27,7 +28,7 @@ from antares.data_collection.dsr.cluster.constants import (
 )
 from antares.data_collection.dsr.constants import DSR_INDEX_GROUP_COLUMNS, InputDsrColumns
 from antares.data_collection.referential_data.main_params import MainParams
-from antares.data_collection.utils import filter_out_based_on_year
+from antares.data_collection.utils import UnitLifetimeIndex
 
 
 class DsrClusterParser:
@@ -36,36 +37,53 @@ class DsrClusterParser:
         self.main_params = main_params
         self.years = years
 
-    def _compute_dsr_cluster_year(self, df: pd.DataFrame, year: int) -> pd.DataFrame:
+    def _compute_dsr_cluster_years(
+        self, df: pd.DataFrame, lifetime_index: UnitLifetimeIndex | None = None
+    ) -> dict[YearId, pd.DataFrame]:
         """
-        Compute DSR metrics for a given year:
+        Compute DSR metrics for every year in a single grouped aggregation:
             - sum of capacity
             - number of units
             - modulation flag
             - add new columns
             - naming convention from `OutputDsrColumns`
             - ordering columns from `OutputDsrColumns`
+        Each unit is repeated once per year it is active, and the result is split by year.
         """
-
-        df_year = filter_out_based_on_year(
-            df, year, InputDsrColumns.COMMISSIONING_DATE.value, InputDsrColumns.DECOMMISSIONING_DATE_EXPECTED.value
+        years = sorted(set(self.years))
+        if lifetime_index is None or not lifetime_index.index.equals(df.index):
+            lifetime_index = UnitLifetimeIndex(
+                df, years, InputDsrColumns.COMMISSIONING_DATE, InputDsrColumns.DECOMMISSIONING_DATE_EXPECTED
+            )
+        active_years = np.column_stack(
+            [lifetime_index.get_active_mask(year).to_numpy() for year in years] or [np.zeros(len(df), dtype=bool)]
         )
+        rows, year_positions = np.nonzero(active_years)
 
         # weights
         col_name_weights = "_weighted_max_hours"
-        df_year[col_name_weights] = df_year[InputDsrColumns.MAX_HOURS] * df_year[InputDsrColumns.NET_MAX_GEN_CAP]
+        col_name_modulation = "_has_derating_curve"
+        col_name_year = "_year"
+        exploded = pd.DataFrame(
+            {
+                col_name_year: np.array(years, dtype=np.int64)[year_positions],
+                DSR_INDEX_GROUP_COLUMNS: df[DSR_INDEX_GROUP_COLUMNS].to_numpy()[rows],
+                InputDsrColumns.NET_MAX_GEN_CAP: df[InputDsrColumns.NET_MAX_GEN_CAP].to_numpy()[rows],
+                col_name_weights: (df[InputDsrColumns.MAX_HOURS] * df[InputDsrColumns.NET_MAX_GEN_CAP]).to_numpy()[
+                    rows
+                ],
+                col_name_modulation: df[InputDsrColumns.DSR_DERATING_CURVE_ID].notna().to_numpy()[rows],
+            }
+        )
 
         # Group with aggregations
         result = (
-            df_year.groupby(DSR_INDEX_GROUP_COLUMNS, as_index=False)
+            exploded.groupby([col_name_year, DSR_INDEX_GROUP_COLUMNS], as_index=False)
             .agg(
                 **{
                     OutputDsrColumns.CAPACITY.value: (InputDsrColumns.NET_MAX_GEN_CAP, "sum"),
                     OutputDsrColumns.NB_UNITS.value: (InputDsrColumns.NET_MAX_GEN_CAP, "size"),
-                    OutputDsrColumns.MODULATION.value: (
-                        InputDsrColumns.DSR_DERATING_CURVE_ID,
-                        lambda x: x.notna().any(),
-                    ),
+                    OutputDsrColumns.MODULATION.value: (col_name_modulation, "any"),
                     OutputDsrColumns.MAX_HOUR_PER_DAY.value: (col_name_weights, "sum"),
                 }
             )
@@ -90,17 +108,9 @@ class DsrClusterParser:
         result[OutputDsrColumns.FO_RATE] = DSR_FO_RATE
         result[OutputDsrColumns.FO_DURATION] = DSR_FO_DURATION
 
-        # return with business columns order
-        return result[list(OutputDsrColumns)]
-
-    def _compute_dsr_cluster_years(self, df: pd.DataFrame) -> dict[YearId, pd.DataFrame]:
-        years = sorted(self.years)
-
-        res: dict[YearId, pd.DataFrame] = {}
-        for year in years:
-            res[year] = self._compute_dsr_cluster_year(df, year)
-
-        return res
+        # split by year, with business columns order
+        result_years = result[col_name_year].to_numpy()
+        return {year: result.loc[result_years == year, list(OutputDsrColumns)].reset_index(drop=True) for year in years}
 
     def _export_dsr_cluster_dataframe(self, dict_of_df: dict[int, pd.DataFrame]) -> None:
         parent_dir = self.output_folder / DSR_CLUSTER_FOLDER
@@ -119,6 +129,6 @@ class DsrClusterParser:
                 )
 
     # capacity of DSR clustering
-    def build_dsr_cluster(self, df: pd.DataFrame) -> None:
-        index_of_df_year = self._compute_dsr_cluster_years(df)
+    def build_dsr_cluster(self, df: pd.DataFrame, lifetime_index: UnitLifetimeIndex | None = None) -> None:
+        index_of_df_year = self._compute_dsr_cluster_years(df, lifetime_index)
         self._export_dsr_cluster_dataframe(index_of_df_year)
@@ -37,3 +37,7 @@ class InputDsrColumns(StrEnum):
 
 # used to compute installed capacities + compute weights for capacity modulation
 DSR_INDEX_GROUP_COLUMNS = ANTARES_NODE_NAME_COLUMN
+
+
+DSR_NUMERIC_COLUMNS = [InputDsrColumns.NET_MAX_GEN_CAP, InputDsrColumns.MAX_HOURS, InputDsrColumns.ACT_PRICE_DA]
+INPUT_DSR_DTYPES = {col.value: float if col in DSR_NUMERIC_COLUMNS else str for col in InputDsrColumns}
@@ -18,17 +18,22 @@ from antares.data_collection.dsr.capacity_modulation.parsing import DsrCapacityM
 from antares.data_collection.dsr.cluster.parsing import DsrClusterParser
 from antares.data_collection.dsr.constants import (
     DSR_INPUT_FILE,
+    INPUT_DSR_DTYPES,
     InputDsrColumns,
 )
+from antares.data_collection.filter_pipeline import FilterPipeline, FilterStage
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.referential_data.main_params import MainParams
 from antares.data_collection.utils import (
+    UnitLifetimeIndex,
     add_code_antares_colum,
-    filter_based_on_commission_date,
-    filter_based_on_net_max_gen_cap,
-    filter_based_on_op_stat,
-    filter_based_on_study_scenarios,
-    filter_non_declared_areas,
+    commission_date_stage,
+    convert_commission_dates,
+    declared_areas_stage,
+    net_max_gen_cap_stage,
+    op_stat_stage,
     parse_input_file,
+    study_scenarios_stage,
 )
 
 
@@ -42,6 +47,7 @@ class DsrParser:
         act_price_da: list[int],
         main_params: MainParams,
         years: list[int],
+        input_cache: InputFileCache | None = None,
     ):
         self.input_folder = input_folder
         self.output_folder = output_folder
@@ -50,55 +56,75 @@ class DsrParser:
         self.act_price_da = act_price_da
         self.main_params = main_params
         self.years = years
+        self.input_cache = input_cache
         self.filtered_dataframe = self._build_filtered_dsr_cluster_dataframe()
+        self.lifetime_index = UnitLifetimeIndex(
+            self.filtered_dataframe,
+            years,
+            InputDsrColumns.COMMISSIONING_DATE,
+            InputDsrColumns.DECOMMISSIONING_DATE_EXPECTED,
+        )
 
     def _read_input_file_dsr_cluster(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder.joinpath(DSR_INPUT_FILE), list(InputDsrColumns))
+        return parse_input_file(
+            self.input_folder.joinpath(DSR_INPUT_FILE), list(InputDsrColumns), self.input_cache, INPUT_DSR_DTYPES
+        )
 
-    def _filter_based_on_dsr_type(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _dsr_type_stage(self) -> FilterStage:
         """We want to keep only the lines where the DSR_TYPE value matches the user given ones"""
         dsr_type_values = self.dsr_type_values
-        if not dsr_type_values:
-            return df
-        df = df[df[InputDsrColumns.DSR_TYPE].isin(dsr_type_values)]
-        if df.empty:
-            # We want to raise as soon as possible to have a clear error msg
-            raise ValueError(f"The given dsr_type values {dsr_type_values} are not present in the dataframe")
-        return df
 
-    def _filter_out_based_on_act_price_da(self, df: pd.DataFrame) -> pd.DataFrame:
+        def build_mask(df: pd.DataFrame) -> pd.Series | None:
+            if not dsr_type_values:
+                return None
+            return df[InputDsrColumns.DSR_TYPE].isin(dsr_type_values)
+
+        msg = f"The given dsr_type values {dsr_type_values} are not present in the dataframe"
+        return FilterStage("dsr_type", build_mask, msg)
+
+    def _act_price_da_stage(self) -> FilterStage:
         """We want to exclude only the lines where the ACT_PRICE_DA value matches the user given ones"""
         act_price_da = self.act_price_da
-        if not act_price_da:
-            return df
-        df = df[~df[InputDsrColumns.ACT_PRICE_DA].isin(act_price_da)]
-        if df.empty:
-            # We want to raise as soon as possible to have a clear error msg
-            raise ValueError(f"The given act_price_da values {act_price_da} exclude all row in the dataframe")
-        return df
+
+        def build_mask(df: pd.DataFrame) -> pd.Series | None:
+            if not act_price_da:
+                return None
+            return ~df[InputDsrColumns.ACT_PRICE_DA].isin(act_price_da)
+
+        msg = f"The given act_price_da values {act_price_da} exclude all row in the dataframe"
+        return FilterStage("act_price_da", build_mask, msg)
 
     def _build_filtered_dsr_cluster_dataframe(self) -> pd.DataFrame:
-        df = self._read_input_file_dsr_cluster()
-        df = filter_based_on_op_stat(self.op_stat_values, df, InputDsrColumns.OP_STAT.value)
-        df = self._filter_based_on_dsr_type(df)
-        df = self._filter_out_based_on_act_price_da(df)
-        df = filter_non_declared_areas(self.main_params, df, InputDsrColumns.MARKET_NODE.value)
-        df = filter_based_on_study_scenarios(df, self.main_params, self.years, InputDsrColumns.STUDY_SCENARIO.value)
-        df = filter_based_on_commission_date(
-            df,
-            self.years,
-            InputDsrColumns.COMMISSIONING_DATE.value,
-            InputDsrColumns.DECOMMISSIONING_DATE_EXPECTED.value,
+        pipeline = FilterPipeline(
+            [
+                op_stat_stage(self.op_stat_values, InputDsrColumns.OP_STAT),
+                self._dsr_type_stage(),
+                self._act_price_da_stage(),
+                declared_areas_stage(self.main_params, InputDsrColumns.MARKET_NODE),
+                study_scenarios_stage(self.main_params, self.years, InputDsrColumns.STUDY_SCENARIO),
+                commission_date_stage(
+                    self.years,
+                    InputDsrColumns.COMMISSIONING_DATE,
+                    InputDsrColumns.DECOMMISSIONING_DATE_EXPECTED,
+                ),
+                net_max_gen_cap_stage(InputDsrColumns.NET_MAX_GEN_CAP),
+            ]
         )
-        df = filter_based_on_net_max_gen_cap(df, InputDsrColumns.NET_MAX_GEN_CAP.value)
+        df = pipeline.apply(self._read_input_file_dsr_cluster())
+        df = convert_commission_dates(
+            df, InputDsrColumns.COMMISSIONING_DATE, InputDsrColumns.DECOMMISSIONING_DATE_EXPECTED
+        )
+        self.filter_reports = pipeline.reports
         df = add_code_antares_colum(self.main_params, df, InputDsrColumns.MARKET_NODE.value)
 
         return df
 
     def build_dsr_cluster_part(self) -> None:
         parser = DsrClusterParser(self.output_folder, self.main_params, self.years)
-        parser.build_dsr_cluster(self.filtered_dataframe)
+        parser.build_dsr_cluster(self.filtered_dataframe, self.lifetime_index)
 
     def build_dsr_capacity_modulation_part(self) -> None:
-        parser = DsrCapacityModulationParser(self.input_folder, self.output_folder, self.main_params, self.years)
-        parser.build_dsr_capacity_modulation(self.filtered_dataframe)
+        parser = DsrCapacityModulationParser(
+            self.input_folder, self.output_folder, self.main_params, self.years, self.input_cache
+        )
+        parser.build_dsr_capacity_modulation(self.filtered_dataframe, self.lifetime_index)
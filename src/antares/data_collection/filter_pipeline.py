@@ -0,0 +1,87 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import logging
+import time
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FilterStage:
+    """
+    A filter of an input file.
+
+    `build_mask` returns the rows to keep among the ones kept by the previous stages, or `None` if the filter
+    does not apply (e.g. no user given values). It must not modify the given DataFrame.
+    If no row remains after the stage, `empty_result_msg` is raised.
+    """
+
+    name: str
+    build_mask: Callable[[pd.DataFrame], pd.Series | None]
+    empty_result_msg: str | None = None
+
+
+@dataclass(frozen=True)
+class FilterStageReport:
+    name: str
+    rows_in: int
+    rows_out: int
+    elapsed_time: float
+
+
+class FilterPipeline:
+    """
+    Applies several filters to a DataFrame: each stage is only evaluated on the rows kept by the previous ones,
+    and a new DataFrame is only created when a stage removes rows.
+    The number of remaining rows and the time spent by each stage are kept inside `reports`.
+    """
+
+    def __init__(self, stages: list[FilterStage]):
+        self.stages = stages
+        self.reports: list[FilterStageReport] = []
+
+    @staticmethod
+    def _align_mask(stage: FilterStage, stage_mask: pd.Series, index: pd.Index) -> npt.NDArray[np.bool_]:
+        if not stage_mask.index.equals(index):
+            # e.g. a mask built on the unfiltered DataFrame
+            stage_mask = stage_mask.reindex(index)
+            if stage_mask.isna().any():
+                raise ValueError(f"The mask of the filter '{stage.name}' does not cover all the filtered rows")
+        return stage_mask.to_numpy(dtype=bool)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.reports = []
+        for stage in self.stages:
+            start = time.perf_counter()
+            rows_in = len(df)
+            stage_mask = stage.build_mask(df)
+            if stage_mask is not None:
+                mask = self._align_mask(stage, stage_mask, df.index)
+                if not mask.all():
+                    df = df[mask]
+            rows_out = len(df)
+            report = FilterStageReport(stage.name, rows_in, rows_out, time.perf_counter() - start)
+            self.reports.append(report)
+            logger.debug(f"Filter '{report.name}': {rows_in} -> {rows_out} rows in {report.elapsed_time:.3f}s")
+
+            if stage_mask is not None and rows_out == 0 and stage.empty_result_msg:
+                # We want to raise as soon as possible to have a clear error msg
+                raise ValueError(stage.empty_result_msg)
+
+        return df
@@ -0,0 +1,303 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import pickle
+import time
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from antares.data_collection.constants import CACHE_MANIFEST_NAME, DEFAULT_CACHE_MAX_SIZE
+
+CATALOG_SUFFIX = ".json"
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    fingerprint: FileFingerprint
+    cache_file: str
+    cache_size: int
+    last_access: float
+
+
+@dataclass(frozen=True)
+class TimeSeriesCatalog:
+    columns: list[str]
+    n_rows: int
+    dtype: str
+    integer_columns: list[str]
+
+
+def compute_content_hash(file_path: Path) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class InputFileCache:
+    """
+    Opt-in on-disk cache for the parsed PEMMDB input files.
+
+    Each parsed CSV file is stored as a Parquet file inside `cache_folder` and loaded back on the next runs
+    instead of re-parsing the CSV. An entry is identified by the source path and the reading options, and is
+    only reused if the source fingerprint (size, modification time and content hash) still matches.
+    When the total size of the entries exceeds `max_size` bytes, the least recently used ones are evicted.
+
+    Hourly time series files are stored as memory-mapped binary matrices instead (see `read_time_series`),
+    using `time_series_dtype` (`np.float32` halves their size at the cost of precision).
+
+    Writing Parquet files requires the `pyarrow` package (`cache` extra). Files that cannot be stored as Parquet
+    (e.g. object columns with mixed types) are parsed without being cached.
+    """
+
+    def __init__(
+        self,
+        cache_folder: Path,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        time_series_dtype: type[np.floating[Any]] = np.float64,
+    ):
+        if max_size <= 0:
+            raise ValueError(f"The cache maximum size must be strictly positive, got {max_size}")
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError(
+                "The input files cache requires the `pyarrow` package, "
+                "install it with `pip install antares-data-collection[cache]`"
+            )
+        self.cache_folder = cache_folder
+        self.max_size = max_size
+        self.time_series_dtype = time_series_dtype
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+        self._manifest_path = self.cache_folder / CACHE_MANIFEST_NAME
+        self._entries = self._load_manifest()
+        # Keys of the time series matrices mapped by this cache: their files cannot be removed while in use
+        self._mapped_keys: set[str] = set()
+        # The budget might be smaller than during the previous runs
+        self._evict()
+
+    def _load_manifest(self) -> dict[str, CacheEntry]:
+        if not self._manifest_path.exists():
+            return {}
+        try:
+            content = json.loads(self._manifest_path.read_text())
+        except json.JSONDecodeError:
+            # A corrupted manifest only means we lose the cache, not the run.
+            return {}
+
+        entries: dict[str, CacheEntry] = {}
+        for key, value in content.items():
+            entry = CacheEntry(
+                fingerprint=FileFingerprint(**value["fingerprint"]),
+                cache_file=value["cache_file"],
+                cache_size=value["cache_size"],
+                last_access=value["last_access"],
+            )
+            if (self.cache_folder / entry.cache_file).exists():
+                entries[key] = entry
+        return entries
+
+    def _save_manifest(self) -> None:
+        tmp_path = self._manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({key: asdict(entry) for key, entry in self._entries.items()}, indent=1))
+        os.replace(tmp_path, self._manifest_path)
+
+    @staticmethod
+    def _build_key(file_path: Path, read_options: dict[str, Any]) -> str:
+        options = repr(sorted(read_options.items()))
+        return hashlib.sha256(f"{file_path.resolve()}|{options}".encode()).hexdigest()
+
+    def _is_up_to_date(self, entry: CacheEntry, stat: os.stat_result, file_path: Path) -> bool:
+        fingerprint = entry.fingerprint
+        if fingerprint.size != stat.st_size:
+            return False
+        if fingerprint.mtime_ns == stat.st_mtime_ns:
+            return True
+        # The file was touched: only its content can tell us if it really changed.
+        return fingerprint.content_hash == compute_content_hash(file_path)
+
+    def _remove_entry_files(self, entry: CacheEntry) -> None:
+        cache_file = self.cache_folder / entry.cache_file
+        cache_file.unlink(missing_ok=True)
+        # Time series entries come with their catalog
+        cache_file.with_suffix(CATALOG_SUFFIX).unlink(missing_ok=True)
+
+    def _evict(self, kept_key: str | None = None) -> None:
+        """
+        Removes the least recently used entries until the cache fits inside its size budget.
+        `kept_key` (the entry being read) and the memory-mapped entries are never removed, even if they exceed it.
+        """
+        total_size = sum(entry.cache_size for entry in self._entries.values())
+        if total_size <= self.max_size:
+            return
+        for key in sorted(self._entries, key=lambda k: self._entries[k].last_access):
+            if total_size <= self.max_size:
+                break
+            if key == kept_key or key in self._mapped_keys:
+                continue
+            entry = self._entries.pop(key)
+            self._remove_entry_files(entry)
+            total_size -= entry.cache_size
+        self._save_manifest()
+
+    def _get_up_to_date_entry(self, key: str, file_path: Path, stat: os.stat_result) -> CacheEntry | None:
+        """Returns the entry if it can be used for the current `file_path` content and marks it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None or not self._is_up_to_date(entry, stat, file_path):
+            return None
+        entry = CacheEntry(
+            fingerprint=FileFingerprint(str(file_path), stat.st_size, stat.st_mtime_ns, entry.fingerprint.content_hash),
+            cache_file=entry.cache_file,
+            cache_size=entry.cache_size,
+            last_access=time.time(),
+        )
+        self._entries[key] = entry
+        self._save_manifest()
+        return entry
+
+    def _register_entry(self, key: str, file_path: Path, stat: os.stat_result, cache_files: list[Path]) -> None:
+        fingerprint = FileFingerprint(str(file_path), stat.st_size, stat.st_mtime_ns, compute_content_hash(file_path))
+        self._entries[key] = CacheEntry(
+            fingerprint=fingerprint,
+            cache_file=cache_files[0].name,
+            cache_size=sum(path.stat().st_size for path in cache_files),
+            last_access=time.time(),
+        )
+        self._evict(kept_key=key)
+        self._save_manifest()
+
+    def read_csv(self, file_path: Path, **read_options: Any) -> pd.DataFrame:
+        """Reads `file_path` like `pd.read_csv(file_path, **read_options)` but goes through the cache."""
+        key = self._build_key(file_path, read_options)
+        stat = file_path.stat()
+
+        entry = self._get_up_to_date_entry(key, file_path, stat)
+        if entry is not None:
+            df: pd.DataFrame = pd.read_parquet(self.cache_folder / entry.cache_file)
+            # Parquet gives back `None` for missing strings whereas `read_csv` gives `NaN`.
+            object_cols = df.select_dtypes(include="object").columns
+            df[object_cols] = df[object_cols].where(df[object_cols].notna(), np.nan)
+            return df
+
+        df = pd.read_csv(file_path, **read_options)
+
+        cache_path = self.cache_folder / f"{key}.parquet"
+        tmp_path = cache_path.with_suffix(".tmp")
+        try:
+            df.to_parquet(tmp_path)
+        except (TypeError, ValueError) as e:
+            # pyarrow errors derive from them, the file is still usable without the cache
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"{file_path} could not be cached: {e}")
+            return df
+        os.replace(tmp_path, cache_path)
+
+        self._register_entry(key, file_path, stat, [cache_path])
+        return df
+
+    def read_compiled(self, file_path: Path, name: str, build: Callable[[Path], T]) -> T:
+        """
+        Returns `build(file_path)`, pickled inside the cache so that it is only re-built when `file_path` changes.
+
+        `name` identifies the compiled object: it has to change whenever the object structure does.
+        """
+        key = self._build_key(file_path, {"format": "pickle", "name": name})
+        stat = file_path.stat()
+
+        entry = self._get_up_to_date_entry(key, file_path, stat)
+        if entry is not None:
+            with open(self.cache_folder / entry.cache_file, "rb") as f:
+                compiled: T = pickle.load(f)
+            return compiled
+
+        compiled = build(file_path)
+
+        cache_path = self.cache_folder / f"{key}.pickle"
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+
+        self._register_entry(key, file_path, stat, [cache_path])
+        return compiled
+
+    def _ingest_time_series(self, file_path: Path, key: str) -> None:
+        """Converts the whole CSV file into a column-major matrix and its `column name -> offset` catalog."""
+        df = pd.read_csv(file_path)
+        non_numeric_cols = [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col])]
+        if non_numeric_cols:
+            raise ValueError(f"Time series file {file_path} contains non numeric columns: {non_numeric_cols}")
+
+        catalog = TimeSeriesCatalog(
+            columns=list(df.columns),
+            n_rows=len(df),
+            dtype=np.dtype(self.time_series_dtype).name,
+            integer_columns=[col for col in df.columns if pd.api.types.is_integer_dtype(df[col])],
+        )
+
+        # Each curve is stored contiguously, so that a column can be read without copy
+        matrix_path = self.cache_folder / f"{key}.bin"
+        tmp_path = matrix_path.with_suffix(".tmp")
+        np.ascontiguousarray(df.to_numpy(dtype=self.time_series_dtype).T).tofile(tmp_path)
+        os.replace(tmp_path, matrix_path)
+
+        catalog_path = matrix_path.with_suffix(CATALOG_SUFFIX)
+        catalog_path.write_text(json.dumps(asdict(catalog)))
+
+    def read_time_series(self, file_path: Path, usecols: list[str]) -> pd.DataFrame:
+        """
+        Reads the `usecols` columns of an hourly time series file.
+
+        The whole file is converted once into a binary matrix that is then opened with `numpy.memmap`:
+        the returned DataFrame columns are views on the mapped file, so the data is neither parsed nor copied,
+        and several processes reading the same file share the same memory pages.
+        """
+        key = self._build_key(file_path, {"format": "memmap", "dtype": np.dtype(self.time_series_dtype).name})
+        stat = file_path.stat()
+
+        entry = self._get_up_to_date_entry(key, file_path, stat)
+        if entry is None:
+            self._ingest_time_series(file_path, key)
+            matrix_path = self.cache_folder / f"{key}.bin"
+            self._register_entry(key, file_path, stat, [matrix_path, matrix_path.with_suffix(CATALOG_SUFFIX)])
+        matrix_path = self.cache_folder / f"{key}.bin"
+        self._mapped_keys.add(key)
+
+        catalog = TimeSeriesCatalog(**json.loads(matrix_path.with_suffix(CATALOG_SUFFIX).read_text()))
+        if not usecols:
+            return pd.DataFrame(index=pd.RangeIndex(catalog.n_rows))
+        offsets = {col: k for k, col in enumerate(catalog.columns)}
+        matrix = np.memmap(matrix_path, dtype=catalog.dtype, mode="r", shape=(len(catalog.columns), catalog.n_rows))
+
+        data: dict[str, Any] = {}
+        for col in usecols:
+            values = matrix[offsets[col]]
+            # Integer columns (MONTH, DAY, HOUR) are small, we give them back their original type
+            data[col] = values.astype(np.int64) if col in catalog.integer_columns else values
+        return pd.DataFrame(data, index=pd.RangeIndex(catalog.n_rows), copy=False)
@@ -37,6 +37,38 @@ class Direction(StrEnum):
     INDIRECT = "Indirect"
 
 
+# Values of a link profile: the transfer links of a pair of market zones, summed by zone and direction
+class ProfileColumns(StrEnum):
+    WINTER_HP = "winter_hp"
+    WINTER_HC = "winter_hc"
+    SUMMER_HP = "summer_hp"
+    SUMMER_HC = "summer_hc"
+    REFERENCE_CAPACITY = "reference_capacity"
+    HVDC_MW = "hvdc_mw"
+    HVDC_NB = "hvdc_nb"
+    HVDC_FOR = "hvdc_for"
+    HAS_CURVE = "has_curve"
+
+
+# Medians of a NTC curve, its global median being its reference capacity
+NTC_MEDIAN_COLUMNS = [
+    ProfileColumns.WINTER_HP,
+    ProfileColumns.WINTER_HC,
+    ProfileColumns.SUMMER_HP,
+    ProfileColumns.SUMMER_HC,
+    ProfileColumns.REFERENCE_CAPACITY,
+]
+# The (season, peak) rows each seasonal median is computed on
+NTC_MEDIAN_BLOCKS = {
+    ProfileColumns.WINTER_HP: (WINTER_SEASON, HOUR_PEAK),
+    ProfileColumns.WINTER_HC: (WINTER_SEASON, HOUR_OFFPEAK),
+    ProfileColumns.SUMMER_HP: (SUMMER_SEASON, HOUR_PEAK),
+    ProfileColumns.SUMMER_HC: (SUMMER_SEASON, HOUR_OFFPEAK),
+}
+# Number of rows of the NTC file read at once when the medians are approximated
+NTC_STREAMING_CHUNK_ROWS = 1000
+
+
 # data "Transfer Links.csv"
 class InputTransferLinksColumns(StrEnum):
     ZONE = "ZONE"
@@ -53,6 +85,19 @@ class InputTransferLinksColumns(StrEnum):
     FOR = "FOR"
 
 
+TRANSFER_LINKS_NUMERIC_COLUMNS = [InputTransferLinksColumns.NTC_LIMIT_CAPACITY_STATIC, InputTransferLinksColumns.FOR]
+# Years and number of poles are integers, we let pandas infer them
+TRANSFER_LINKS_INTEGER_COLUMNS = [
+    InputTransferLinksColumns.YEAR_VALID_START,
+    InputTransferLinksColumns.YEAR_VALID_END,
+    InputTransferLinksColumns.NO_POLES,
+]
+INPUT_TRANSFER_LINKS_DTYPES = {
+    col.value: float if col in TRANSFER_LINKS_NUMERIC_COLUMNS else str
+    for col in InputTransferLinksColumns
+    if col not in TRANSFER_LINKS_INTEGER_COLUMNS
+}
+
 # Default value to fill for column "FOR" in "Transfer Links.csv"
 FILL_FOR_VALUES = 0.05
 MAX_DECIMAL_DIGITS_FOR = 2
@@ -65,6 +110,9 @@ class InputNTCsIndexColumns(StrEnum):
     ID = "ID"
 
 
+INPUT_NTCS_INDEX_DTYPES = {col.value: str for col in InputNTCsIndexColumns}
+
+
 # "NTCs.csv"
 class InputNTCsColumns(StrEnum):
     MONTH = "MONTH"
@@ -96,6 +144,25 @@ class ExportLinksColumnsNames(StrEnum):
     HVDC_FOR_INDIRECT = "HVDC_FO_Rate_indirect"
 
 
+# Profile value written inside each export column, for the selected profile of the given direction
+EXPORT_PROFILE_COLUMNS = {
+    ExportLinksColumnsNames.WINTER_HP_DIRECT_MW: (ProfileColumns.WINTER_HP, Direction.DIRECT),
+    ExportLinksColumnsNames.WINTER_HP_INDIRECT_MW: (ProfileColumns.WINTER_HP, Direction.INDIRECT),
+    ExportLinksColumnsNames.WINTER_HC_DIRECT_MW: (ProfileColumns.WINTER_HC, Direction.DIRECT),
+    ExportLinksColumnsNames.WINTER_HC_INDIRECT_MW: (ProfileColumns.WINTER_HC, Direction.INDIRECT),
+    ExportLinksColumnsNames.SUMMER_HP_DIRECT_MW: (ProfileColumns.SUMMER_HP, Direction.DIRECT),
+    ExportLinksColumnsNames.SUMMER_HP_INDIRECT_MW: (ProfileColumns.SUMMER_HP, Direction.INDIRECT),
+    ExportLinksColumnsNames.SUMMER_HC_DIRECT_MW: (ProfileColumns.SUMMER_HC, Direction.DIRECT),
+    ExportLinksColumnsNames.SUMMER_HC_INDIRECT_MW: (ProfileColumns.SUMMER_HC, Direction.INDIRECT),
+    ExportLinksColumnsNames.HVDC_DIRECT: (ProfileColumns.HVDC_MW, Direction.DIRECT),
+    ExportLinksColumnsNames.HVDC_INDIRECT: (ProfileColumns.HVDC_MW, Direction.INDIRECT),
+    ExportLinksColumnsNames.HVDC_NB_DIRECT: (ProfileColumns.HVDC_NB, Direction.DIRECT),
+    ExportLinksColumnsNames.HVDC_NB_INDIRECT: (ProfileColumns.HVDC_NB, Direction.INDIRECT),
+    ExportLinksColumnsNames.HVDC_FOR_DIRECT: (ProfileColumns.HVDC_FOR, Direction.DIRECT),
+    ExportLinksColumnsNames.HVDC_FOR_INDIRECT: (ProfileColumns.HVDC_FOR, Direction.INDIRECT),
+}
+
+
 # The first tab in the export file is a data frame of constant parameters
 DEFAULT_LINK_PARAMETERS = pd.DataFrame(
     data=[0.1, False],
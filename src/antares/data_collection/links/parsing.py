@@ -9,21 +9,25 @@
 # SPDX-License-Identifier: MPL-2.0
 #
 # This file is part of the Antares project.
+import warnings
+
 from dataclasses import dataclass
 from pathlib import Path
-from statistics import mean
-from typing import NamedTuple, TypeAlias
+from typing import Any, TypeAlias
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.links.constants import (
-    CURVE_UID_SPLIT_SYMBOL,
     DEFAULT_LINK_PARAMETERS,
+    EXPORT_PROFILE_COLUMNS,
     FILL_FOR_VALUES,
     FIRST_SHEET_NAME,
-    HOUR_OFFPEAK,
-    HOUR_PEAK,
     HVDC_NAME_TECHNOLOGY,
+    INPUT_NTCS_INDEX_DTYPES,
+    INPUT_TRANSFER_LINKS_DTYPES,
     LINKS_CLUSTER_FOLDER,
     LINKS_NTC_INDEX_NAME,
     LINKS_NTC_TS_NAME,
@@ -31,73 +35,38 @@ from antares.data_collection.links.constants import (
     LINKS_TRANSFER_LINKS_NAME,
     MAX_DECIMAL_DIGITS_FOR,
     NTC_FILTER_STR_VALUE,
-    SUMMER_SEASON,
-    WINTER_SEASON,
+    NTC_MEDIAN_BLOCKS,
+    NTC_MEDIAN_COLUMNS,
+    NTC_STREAMING_CHUNK_ROWS,
     Direction,
     ExportLinksColumnsNames,
     InputNTCsColumns,
     InputNTCsIndexColumns,
     InputTransferLinksColumns,
+    ProfileColumns,
 )
+from antares.data_collection.quantile_sketch import BinnedMedianSketch
 from antares.data_collection.referential_data.main_params import MainParams
 from antares.data_collection.utils import (
     filter_based_on_study_scenarios,
     filter_non_declared_areas,
     parse_input_file,
+    parse_time_series_file,
+    read_time_series_header,
 )
 
-# mapping used for an index file
-ZoneId: TypeAlias = str
-NtcCurveId: TypeAlias = str
-CurveUid: TypeAlias = str
-
-IndexMapping: TypeAlias = dict[ZoneId, dict[NtcCurveId, CurveUid]]
-
-
-@dataclass
-class TimeSeriesMedianValues:
-    winter_hc: float
-    winter_hp: float
-    summer_hc: float
-    summer_hp: float
-    median_value: float
-
+# Medians of each NTC curve (`NTC_MEDIAN_COLUMNS`), indexed by curve UID
+NtcMedianRepartition: TypeAlias = pd.DataFrame
 
-NtcMedianRepartition: TypeAlias = dict[ZoneId, dict[CurveUid, TimeSeriesMedianValues]]
+# The directions of a profile, in the order of the aggregated values columns
+DIRECTIONS = [Direction.DIRECT, Direction.INDIRECT]
 
 
 @dataclass(frozen=True)
 class InternalMapping:
-    index: IndexMapping
-    data: NtcMedianRepartition
-
-
-class AggregatedValues(NamedTuple):
-    winter_hp: float = 0.0
-    winter_hc: float = 0.0
-    summer_hp: float = 0.0
-    summer_hc: float = 0.0
-    reference_capacity: float = 0.0
-    hvdc_mw: float = 0.0
-    hvdc_nb: int = 0
-    hvdc_for: float = 0.0
-    has_curve: bool = False
-
-    @property
-    def selection_priority(self) -> tuple[int, int, float, float]:
-        is_hvdc = self.hvdc_nb > 0
-        hvdc_for_priority = self.hvdc_for
-
-        return (
-            1 if is_hvdc else 0,  # HVDC
-            0 if self.has_curve else 1,  # curve first
-            self.reference_capacity,  # value capacity curve or NTC
-            hvdc_for_priority,  # value to discriminate
-        )
-
-
-# index by "border" pair (sorted), tuple(sorted([node1, node2])) -> "FR-IT"
-CrossGrtIndex: TypeAlias = dict[tuple[str, str], dict[ZoneId, dict[Direction, AggregatedValues]]]
+    # `ZONE`, `ID` and `CURVE_UID` columns of the index file, with a single curve by (zone, id)
+    index: pd.DataFrame
+    medians: NtcMedianRepartition
 
 
 class LinksParser:
@@ -108,15 +77,28 @@ class LinksParser:
         main_params: MainParams,
         years: list[int],
         for_limit_value: float = FILL_FOR_VALUES,
+        input_cache: InputFileCache | None = None,
+        median_tolerance: float | None = None,
     ):
+        """
+        By default, the NTC medians are exact. If `median_tolerance` is given, the NTC file is read by chunks of rows
+        and the medians are approximated, with at most `median_tolerance / 2` error.
+        """
         self.input_folder = input_folder
         self.output_folder = output_folder
         self.main_params = main_params
         self.years = years
         self.for_limit_value = for_limit_value
+        self.input_cache = input_cache
+        self.median_tolerance = median_tolerance
 
     def _parse_transfer_links(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder / LINKS_TRANSFER_LINKS_NAME, list(InputTransferLinksColumns))
+        return parse_input_file(
+            self.input_folder / LINKS_TRANSFER_LINKS_NAME,
+            list(InputTransferLinksColumns),
+            self.input_cache,
+            INPUT_TRANSFER_LINKS_DTYPES,
+        )
 
     def _fill_values_column_for(self, df: pd.DataFrame) -> pd.DataFrame:
         name_col_to_fill = InputTransferLinksColumns.FOR
@@ -131,7 +113,28 @@ class LinksParser:
         return df[df[InputTransferLinksColumns.TRANSFER_TYPE] == NTC_FILTER_STR_VALUE]
 
     def _parse_index_links(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder / LINKS_NTC_INDEX_NAME, list(InputNTCsIndexColumns))
+        return parse_input_file(
+            self.input_folder / LINKS_NTC_INDEX_NAME,
+            list(InputNTCsIndexColumns),
+            self.input_cache,
+            INPUT_NTCS_INDEX_DTYPES,
+        )
+
+    @staticmethod
+    def _build_active_years(df: pd.DataFrame, years: list[int]) -> npt.NDArray[np.bool_]:
+        """(rows x years) matrix of the rows that satisfy: start_column <= year <= end_column"""
+        year_values = np.array(years)
+        starts = df[InputTransferLinksColumns.YEAR_VALID_START].to_numpy()[:, np.newaxis]
+        ends = df[InputTransferLinksColumns.YEAR_VALID_END].to_numpy()[:, np.newaxis]
+        active_years: npt.NDArray[np.bool_] = (starts <= year_values) & (ends >= year_values)
+        return active_years
+
+    @staticmethod
+    def _build_no_input_data_error(years: list[int]) -> ValueError:
+        return ValueError(
+            f"No input data matched the given years {years} in range "
+            f"{InputTransferLinksColumns.YEAR_VALID_START} - {InputTransferLinksColumns.YEAR_VALID_END}"
+        )
 
     @staticmethod
     def _filter_based_on_year_range(df: pd.DataFrame, years: list[int]) -> pd.DataFrame:
@@ -139,26 +142,19 @@ class LinksParser:
         Keep rows where at least one year in `years` satisfies:
         start_column <= year <= end_column
         """
-        # Create a mask that is True if any of the requested years are within the range
-        mask = pd.Series(False, index=df.index)
-        for year in years:
-            mask |= (df[InputTransferLinksColumns.YEAR_VALID_START] <= year) & (
-                df[InputTransferLinksColumns.YEAR_VALID_END] >= year
-            )
-
-        df_filtered = df[mask]
+        active_rows = pd.Series(LinksParser._build_active_years(df, years).any(axis=1), index=df.index)
+        df_filtered = df[active_rows]
 
         if df_filtered.empty:
-            raise ValueError(
-                f"No input data matched the given years {years} in range "
-                f"{InputTransferLinksColumns.YEAR_VALID_START} - {InputTransferLinksColumns.YEAR_VALID_END}"
-            )
+            raise LinksParser._build_no_input_data_error(years)
 
         return df_filtered
 
     def _add_links_code_antares_column(self, df: pd.DataFrame, market_node_name_column: str) -> pd.DataFrame:
-        node_list = df[market_node_name_column].tolist()
-        df[market_node_name_column] = self.main_params.get_antares_codes(node_list)
+        # The missing nodes were reported by `filter_non_declared_areas`
+        df[market_node_name_column], _ = self.main_params.map_antares_codes(
+            df[market_node_name_column], report_missing=False
+        )
         return df
 
     def _filter_duplicate_market_zone(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -169,76 +165,68 @@ class LinksParser:
             ~(df[InputTransferLinksColumns.MARKET_ZONE_SOURCE] == df[InputTransferLinksColumns.MARKET_ZONE_DESTINATION])
         ]
 
-    def _compute_ntc_median_repartition(self, df: pd.DataFrame) -> NtcMedianRepartition:
-        # Identify data columns (excluding technical columns)
-        exclude_columns = list(InputNTCsColumns)
-        cols_to_use = df.columns.difference(exclude_columns)
-
-        # Compute Grouped Medians (HC/HP/Summer/Winter)
+    def _build_median_blocks(self, df: pd.DataFrame) -> dict[ProfileColumns, npt.NDArray[np.bool_]]:
+        """The rows of each (season, peak) block of a NTC file."""
+        # Each distinct hour and month is labelled once
         hours = df[InputNTCsColumns.HOUR]
         months = df[InputNTCsColumns.MONTH]
+        hour_labels = hours.map({h: self.main_params.get_peak_hour_label(h) for h in hours.unique()}).to_numpy()
+        month_labels = months.map({m: self.main_params.get_peak_month_label(m) for m in months.unique()}).to_numpy()
 
-        hour_labels = [self.main_params.get_peak_hour_label(h) for h in hours]
-        month_labels = [self.main_params.get_peak_month_label(m) for m in months]
-
-        df_labels = pd.DataFrame({"hour_label": hour_labels, "month_label": month_labels}, index=df.index)
-        df_full = pd.concat([df, df_labels], axis=1)
-
-        # Calculate medians grouped by labels
-        grouped = df_full.groupby(["month_label", "hour_label"], as_index=False)
-
-        dict_medians: dict[str, dict[str, dict[str, float]]] = {}
-        for (month, hour), group in grouped:
-            assert isinstance(month, str)
-            assert isinstance(hour, str)
-
-            medians = group[cols_to_use].median(numeric_only=True).to_dict()
+        return {
+            col: (month_labels == season) & (hour_labels == peak) for col, (season, peak) in NTC_MEDIAN_BLOCKS.items()
+        }
 
-            typed_medians: dict[str, float] = {}
-
-            for col, value in medians.items():
-                assert isinstance(col, str)
-                typed_medians[col] = float(value)
-
-            dict_medians.setdefault(month, {})[hour] = typed_medians
-
-        # Build the final NtcMedianRepartition using direct lookups and asserts
-        result: NtcMedianRepartition = {}
-
-        for col in cols_to_use:
-            zone_id = col.split(CURVE_UID_SPLIT_SYMBOL)[0]
-            w_hc = dict_medians[WINTER_SEASON][HOUR_OFFPEAK][col]
-            w_hp = dict_medians[WINTER_SEASON][HOUR_PEAK][col]
-            s_hc = dict_medians[SUMMER_SEASON][HOUR_OFFPEAK][col]
-            s_hp = dict_medians[SUMMER_SEASON][HOUR_PEAK][col]
-            g_median = df[col].median()
-
-            # Create the dataclass instance
-            median_stats = TimeSeriesMedianValues(
-                winter_hc=w_hc, winter_hp=w_hp, summer_hc=s_hc, summer_hp=s_hp, median_value=g_median
-            )
+    def _compute_ntc_median_repartition(self, df: pd.DataFrame) -> NtcMedianRepartition:
+        """
+        Computes the medians of all the curves at once, on the (hours x curves) matrix: the seasonal ones on the
+        rows of each (season, peak) block and the global one on the whole matrix. Missing values are skipped.
+        """
+        # Identify data columns (excluding technical columns)
+        exclude_columns = list(InputNTCsColumns)
+        cols_to_use = df.columns.difference(exclude_columns)
+        values = df[cols_to_use].to_numpy(dtype=np.float64)
 
-            # Assign to the nested mapping
-            result.setdefault(zone_id, {})[col] = median_stats
+        medians: dict[str, npt.NDArray[np.float64]] = {}
+        with warnings.catch_warnings():
+            # A curve without any value inside a block has a NaN median
+            warnings.simplefilter("ignore", RuntimeWarning)
+            for col, block_rows in self._build_median_blocks(df).items():
+                medians[col] = np.nanmedian(values[block_rows], axis=0)
+            medians[ProfileColumns.REFERENCE_CAPACITY] = np.nanmedian(values, axis=0)
 
-        return result
+        return pd.DataFrame(medians, index=pd.Index(cols_to_use, name=InputNTCsIndexColumns.CURVE_UID.value))
 
-    def _build_links_index_mapping(self, df: pd.DataFrame) -> IndexMapping:
-        mapping: IndexMapping = {}
+    def _estimate_ntc_median_repartition(self, curve_uids: set[str], tolerance: float) -> NtcMedianRepartition:
+        """
+        Same as `_compute_ntc_median_repartition`, but the NTC file is streamed by chunks of rows into a
+        `BinnedMedianSketch`: only the counts of the rounded values are kept in memory.
+        The series of the sketch are the curves of each block, then the whole curves.
+        """
+        file_path = self.input_folder / LINKS_NTC_TS_NAME
+        header = read_time_series_header(file_path, curve_uids)
+        cols_to_use = pd.Index([col for col in header if col in curve_uids]).sort_values()
+        usecols = [col for col in header if col in curve_uids or col in list(InputNTCsColumns)]
+        series_keys = {col: k for k, col in enumerate(NTC_MEDIAN_COLUMNS)}
+
+        sketch = BinnedMedianSketch(tolerance)
+        curve_keys = np.arange(len(cols_to_use))
+        for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=NTC_STREAMING_CHUNK_ROWS):
+            values = chunk[cols_to_use].to_numpy(dtype=np.float64)
+            blocks = self._build_median_blocks(chunk)
+            blocks[ProfileColumns.REFERENCE_CAPACITY] = np.ones(len(chunk), dtype=bool)
+            for col, block_rows in blocks.items():
+                block_values = values[block_rows]
+                keys = np.broadcast_to(series_keys[col] * len(cols_to_use) + curve_keys, block_values.shape)
+                sketch.update(keys.ravel(), block_values.ravel())
+
+        medians = {col: sketch.medians(series_keys[col] * len(cols_to_use) + curve_keys) for col in NTC_MEDIAN_COLUMNS}
+        return pd.DataFrame(medians, index=pd.Index(cols_to_use, name=InputNTCsIndexColumns.CURVE_UID.value))
+
+    def _build_links_index_mapping(self, df: pd.DataFrame) -> pd.DataFrame:
         cols = [InputNTCsIndexColumns.ZONE.value, InputNTCsIndexColumns.ID.value, InputNTCsIndexColumns.CURVE_UID.value]
-
-        for row in df[cols].itertuples(index=False):
-            zone = row[0]
-            ntc_id = row[1]
-            curve_uid = row[2]
-
-            assert isinstance(zone, ZoneId)
-            assert isinstance(ntc_id, NtcCurveId)
-            assert isinstance(curve_uid, CurveUid)
-
-            mapping.setdefault(zone, {})[ntc_id] = curve_uid
-
-        return mapping
+        # The last curve given for a (zone, id) pair is the one used
+        return df[cols].dropna().drop_duplicates(subset=cols[:2], keep="last")
 
     def _build_transfer_links_filtered(self, df: pd.DataFrame) -> pd.DataFrame:
         # process transfer links file pre filter
@@ -259,154 +247,169 @@ class LinksParser:
 
         return df
 
-    def _get_profile_values(self, row: pd.Series, mapping: InternalMapping) -> AggregatedValues:
+    @staticmethod
+    def _get_curve_uids(df: pd.DataFrame, index: pd.DataFrame) -> pd.Series:
+        """The NTC curve of every transfer link, given by the index file for its zone (NaN if there is none)."""
+        curve_keys = pd.DataFrame(
+            {
+                InputNTCsIndexColumns.ZONE.value: df[InputTransferLinksColumns.ZONE].to_numpy(),
+                InputNTCsIndexColumns.ID.value: df[InputTransferLinksColumns.NTC_CURVE_ID].to_numpy(),
+            }
+        )
+        merged = curve_keys.merge(
+            index, how="left", on=[InputNTCsIndexColumns.ZONE.value, InputNTCsIndexColumns.ID.value]
+        )
+        return merged[InputNTCsIndexColumns.CURVE_UID.value]
+
+    def _build_profile_values(self, df: pd.DataFrame, mapping: InternalMapping) -> pd.DataFrame:
         """
-        For every row we build a profile and then select links with minimum values later.
-        The profile is modeled by `AggregatedValues` dataclass.
-        We need to know the following:
-            - NTC curve id
-            - NTC static value
-            - HVDC nb poles
-            - HVDC for value
-            - Transfer technology (HVAC/HVDC)
+        For every row we build a profile (`ProfileColumns`) and then select links with minimum values later.
+        A row with a NTC curve id given by the index file of its zone takes the median values of the curve,
+        the other ones take their static NTC value.
+        Only HVDC rows have HVDC values (capacity, number of poles and FOR).
         """
-        tech = row[InputTransferLinksColumns.TRANSFER_TECHNOLOGY]
-        curve_id = row[InputTransferLinksColumns.NTC_CURVE_ID]
-        static_ntc = row[InputTransferLinksColumns.NTC_LIMIT_CAPACITY_STATIC]
-        zone = row[InputTransferLinksColumns.ZONE]
-
-        # HVDC
-        is_hvdc = tech == HVDC_NAME_TECHNOLOGY
-        hvdc_nb = int(row[InputTransferLinksColumns.NO_POLES]) if is_hvdc else 0
-        hvdc_for = float(row[InputTransferLinksColumns.FOR]) if is_hvdc else 0.0
-
-        # CASE: curve (priority)
-        if pd.notna(curve_id) and curve_id in mapping.index.get(zone, {}):
-            curve_uid = mapping.index[zone][curve_id]
-            stats = mapping.data[zone][curve_uid]
-
-            ref_cap = stats.median_value
-            hvdc_mw = ref_cap if is_hvdc else 0.0
-
-            val = AggregatedValues(
-                winter_hp=stats.winter_hp,
-                winter_hc=stats.winter_hc,
-                summer_hp=stats.summer_hp,
-                summer_hc=stats.summer_hc,
-                reference_capacity=ref_cap,
-                hvdc_mw=hvdc_mw,
-                hvdc_nb=hvdc_nb,
-                hvdc_for=hvdc_for,
-                has_curve=True,
-            )
-            return val
-
-        # CASE (only static value)
-        val_static = float(static_ntc) if pd.notna(static_ntc) else 0.0
-        return AggregatedValues(
-            winter_hp=val_static,
-            winter_hc=val_static,
-            summer_hp=val_static,
-            summer_hc=val_static,
-            reference_capacity=val_static,
-            hvdc_mw=val_static if is_hvdc else 0.0,
-            hvdc_nb=hvdc_nb,
-            hvdc_for=hvdc_for,
+        is_hvdc = (df[InputTransferLinksColumns.TRANSFER_TECHNOLOGY] == HVDC_NAME_TECHNOLOGY).to_numpy()
+
+        curve_uids = self._get_curve_uids(df, mapping.index)
+        has_curve = curve_uids.notna().to_numpy()
+        medians = mapping.medians.reindex(curve_uids)
+
+        static_ntc = df[InputTransferLinksColumns.NTC_LIMIT_CAPACITY_STATIC].fillna(0.0).to_numpy(dtype=np.float64)
+        profiles = pd.DataFrame(
+            {
+                col: np.where(has_curve, medians[col].to_numpy(dtype=np.float64), static_ntc)
+                for col in NTC_MEDIAN_COLUMNS
+            }
         )
+        profiles[ProfileColumns.HVDC_MW] = np.where(is_hvdc, profiles[ProfileColumns.REFERENCE_CAPACITY], 0.0)
+        no_poles = df[InputTransferLinksColumns.NO_POLES].to_numpy()
+        profiles[ProfileColumns.HVDC_NB] = np.where(is_hvdc, no_poles, 0).astype(np.int64)
+        profiles[ProfileColumns.HVDC_FOR] = np.where(
+            is_hvdc, df[InputTransferLinksColumns.FOR].to_numpy(dtype=np.float64), 0.0
+        )
+        profiles[ProfileColumns.HAS_CURVE] = has_curve
+        return profiles
 
-    def _mean_strict_positive(self, x: list[int | float]) -> float:
-        positive = [v for v in x if v > 0]
-        if len(positive) == 0:
-            return 0.0
-        return mean(positive)
-
-    def _select_links_profile(self, df: pd.DataFrame, mapping: InternalMapping) -> pd.DataFrame:
+    @staticmethod
+    def _aggregate_profiles(
+        profiles: pd.DataFrame,
+        profile_ids: npt.NDArray[np.integer[Any]],
+        directions: npt.NDArray[np.integer[Any]],
+        nb_profiles: int,
+    ) -> dict[ProfileColumns, npt.NDArray[Any]]:
+        """
+        Sums the rows of the same profile and direction, in the order of the rows: each value is a
+        (profiles x directions) matrix. A profile with no row in a direction has null values in it.
+        The FOR is the mean of the strictly positive ones, updated row after row.
+        """
+        aggregated: dict[ProfileColumns, npt.NDArray[Any]] = {}
+        for col in NTC_MEDIAN_COLUMNS + [ProfileColumns.HVDC_MW, ProfileColumns.HVDC_NB]:
+            values = profiles[col].to_numpy()
+            summed = np.zeros((nb_profiles, len(DIRECTIONS)), dtype=values.dtype)
+            np.add.at(summed, (profile_ids, directions), values)
+            aggregated[col] = summed
+
+        has_curve = np.zeros((nb_profiles, len(DIRECTIONS)), dtype=bool)
+        np.logical_or.at(has_curve, (profile_ids, directions), profiles[ProfileColumns.HAS_CURVE].to_numpy())
+        aggregated[ProfileColumns.HAS_CURVE] = has_curve
+
+        # The k-th strictly positive FOR of every profile is averaged with the current value at once
+        hvdc_for = np.zeros((nb_profiles, len(DIRECTIONS)))
+        for_values = profiles[ProfileColumns.HVDC_FOR].to_numpy()
+        positive = for_values > 0
+        positive_ids, positive_directions, positive_values = (
+            profile_ids[positive],
+            directions[positive],
+            for_values[positive],
+        )
+        ranks = (
+            pd.DataFrame({"id": positive_ids, "direction": positive_directions})
+            .groupby(["id", "direction"])
+            .cumcount()
+            .to_numpy()
+        )
+        for rank in range(int(ranks.max()) + 1 if len(ranks) else 0):
+            at_rank = ranks == rank
+            cells = (positive_ids[at_rank], positive_directions[at_rank])
+            if rank == 0:
+                hvdc_for[cells] = positive_values[at_rank]
+            else:
+                hvdc_for[cells] = (hvdc_for[cells] + positive_values[at_rank]) / 2
+        aggregated[ProfileColumns.HVDC_FOR] = hvdc_for
+        return aggregated
+
+    def _select_links_profiles(
+        self, df: pd.DataFrame, mapping: InternalMapping, active_sets: list[npt.NDArray[np.bool_]]
+    ) -> list[pd.DataFrame]:
+        """
+        Selects the link profiles of each set of active rows (e.g. the links of a year), in a single pass:
+        the rows are repeated for each set they belong to, and the set is part of the pair and profile keys.
+        """
         # 1. Build an index by pair of nodes (source/destination)
         # Identify a direction: "Direct" versus "Indirect" (alphabetical order)
-        processed_data: CrossGrtIndex = {}
-
-        for _, row in df.iterrows():
-            n1, n2 = (
-                row[InputTransferLinksColumns.MARKET_ZONE_SOURCE],
-                row[InputTransferLinksColumns.MARKET_ZONE_DESTINATION],
-            )
-            pair = tuple(sorted([n1, n2]))
-            direction = Direction.DIRECT if n1 < n2 else Direction.INDIRECT
-            zone = row[InputTransferLinksColumns.ZONE]
+        sources = df[InputTransferLinksColumns.MARKET_ZONE_SOURCE].to_numpy()
+        destinations = df[InputTransferLinksColumns.MARKET_ZONE_DESTINATION].to_numpy()
+        is_direct = sources < destinations
+        rows = np.concatenate([np.flatnonzero(active_rows) for active_rows in active_sets])
+        keys = pd.DataFrame(
+            {
+                "set": np.repeat(np.arange(len(active_sets)), [int(active_rows.sum()) for active_rows in active_sets]),
+                "first_node": np.where(is_direct, sources, destinations)[rows],
+                "second_node": np.where(is_direct, destinations, sources)[rows],
+                "zone": df[InputTransferLinksColumns.ZONE].to_numpy()[rows],
+            }
+        )
+        directions = np.where(is_direct, DIRECTIONS.index(Direction.DIRECT), DIRECTIONS.index(Direction.INDIRECT))
 
-            aggregated_values = self._get_profile_values(row, mapping)
+        # The same GRT can contain different "technology" (hvac/hvdc)
+        # Same profile (set/pair/zone/direction) is summed
+        # Profiles and pairs are numbered in the order of their first row
+        profile_ids = keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+        _, profile_first_rows = np.unique(profile_ids, return_index=True)
+        pair_ids = keys.groupby(["set", "first_node", "second_node"], sort=False).ngroup().to_numpy()
+        _, pair_first_rows = np.unique(pair_ids, return_index=True)
+        profile_pairs = pair_ids[profile_first_rows]
 
-            # Init structure
-            pair_data = processed_data.setdefault(pair, {})
-            grt_data = pair_data.setdefault(
-                zone, {Direction.DIRECT: AggregatedValues(), Direction.INDIRECT: AggregatedValues()}
-            )
-
-            # The same GRT can contain different "technology" (hvac/hvdc)
-            # Same profile (pair/zone/direction) is summed
-            current = grt_data[direction]
-
-            # exclude 0 of computation
-            valid_hvdc_for = self._mean_strict_positive([current.hvdc_for, aggregated_values.hvdc_for])
-
-            grt_data[direction] = AggregatedValues(
-                winter_hp=current.winter_hp + aggregated_values.winter_hp,
-                winter_hc=current.winter_hc + aggregated_values.winter_hc,
-                summer_hp=current.summer_hp + aggregated_values.summer_hp,
-                summer_hc=current.summer_hc + aggregated_values.summer_hc,
-                reference_capacity=current.reference_capacity + aggregated_values.reference_capacity,
-                hvdc_mw=current.hvdc_mw + aggregated_values.hvdc_mw,
-                hvdc_nb=current.hvdc_nb + aggregated_values.hvdc_nb,
-                hvdc_for=valid_hvdc_for,
-                has_curve=current.has_curve or aggregated_values.has_curve,
-            )
+        # The values of a row do not depend on its set
+        profiles = self._build_profile_values(df, mapping).take(rows)
+        aggregated = self._aggregate_profiles(profiles, profile_ids, directions[rows], len(profile_first_rows))
 
         # 2. Selection with minimum values (by NTC Capacity or by median value)
-        # Select by GRT with the same direction (row selection)
-        final_output = []
-        for pair, grts_aggregated in processed_data.items():
-            name = f"{pair[0]}-{pair[1]}"
-
-            # DIRECT minimum Selection
-            direct_minimum = min(grts_aggregated.values(), key=lambda x: x[Direction.DIRECT].selection_priority)[
-                Direction.DIRECT
-            ]
-
-            # INDIRECT minimum selection
-            indirect_minimum = min(grts_aggregated.values(), key=lambda x: x[Direction.INDIRECT].selection_priority)[
-                Direction.INDIRECT
-            ]
-
-            final_output.append(
-                {
-                    ExportLinksColumnsNames.NAME: name,
-                    ExportLinksColumnsNames.WINTER_HP_DIRECT_MW: direct_minimum.winter_hp,
-                    ExportLinksColumnsNames.WINTER_HP_INDIRECT_MW: indirect_minimum.winter_hp,
-                    ExportLinksColumnsNames.WINTER_HC_DIRECT_MW: direct_minimum.winter_hc,
-                    ExportLinksColumnsNames.WINTER_HC_INDIRECT_MW: indirect_minimum.winter_hc,
-                    ExportLinksColumnsNames.SUMMER_HP_DIRECT_MW: direct_minimum.summer_hp,
-                    ExportLinksColumnsNames.SUMMER_HP_INDIRECT_MW: indirect_minimum.summer_hp,
-                    ExportLinksColumnsNames.SUMMER_HC_DIRECT_MW: direct_minimum.summer_hc,
-                    ExportLinksColumnsNames.SUMMER_HC_INDIRECT_MW: indirect_minimum.summer_hc,
-                    ExportLinksColumnsNames.FLOWBASED_PERIMETER: False,
-                    ExportLinksColumnsNames.HVDC_DIRECT: direct_minimum.hvdc_mw,
-                    ExportLinksColumnsNames.HVDC_INDIRECT: indirect_minimum.hvdc_mw,
-                    ExportLinksColumnsNames.HVDC_NB_DIRECT: direct_minimum.hvdc_nb,
-                    ExportLinksColumnsNames.HVDC_NB_INDIRECT: indirect_minimum.hvdc_nb,
-                    ExportLinksColumnsNames.HVDC_FOR_DIRECT: direct_minimum.hvdc_for,
-                    ExportLinksColumnsNames.HVDC_FOR_INDIRECT: indirect_minimum.hvdc_for,
-                }
+        # Select by GRT with the same direction (row selection): HVDC last, curve first, then the lowest capacity
+        # and the lowest FOR. On equal values, the first profile is selected.
+        selected_profiles: dict[Direction, npt.NDArray[np.intp]] = {}
+        for position, direction in enumerate(DIRECTIONS):
+            order = np.lexsort(
+                (
+                    np.arange(len(profile_pairs)),
+                    aggregated[ProfileColumns.HVDC_FOR][:, position],
+                    aggregated[ProfileColumns.REFERENCE_CAPACITY][:, position],
+                    ~aggregated[ProfileColumns.HAS_CURVE][:, position],
+                    aggregated[ProfileColumns.HVDC_NB][:, position] > 0,
+                    profile_pairs,
+                )
             )
-
-        return pd.DataFrame(final_output).sort_values(by=ExportLinksColumnsNames.NAME)
-
-    def _build_pegase_dataframe(self, df: pd.DataFrame, year: int, data: InternalMapping) -> pd.DataFrame:
-        # filter on year
-        df = self._filter_based_on_year_range(df, [year])
-
-        # profile processing
-        df_pegase = self._select_links_profile(df, data)
-        return df_pegase
+            sorted_pairs = profile_pairs[order]
+            is_first_of_pair = np.r_[True, sorted_pairs[1:] != sorted_pairs[:-1]]
+            selected_profiles[direction] = order[is_first_of_pair]
+
+        final_output: dict[str, npt.ArrayLike] = {
+            ExportLinksColumnsNames.NAME: keys["first_node"].iloc[pair_first_rows].to_numpy()
+            + "-"
+            + keys["second_node"].iloc[pair_first_rows].to_numpy()
+        }
+        for export_col, (profile_col, direction) in EXPORT_PROFILE_COLUMNS.items():
+            if export_col == ExportLinksColumnsNames.HVDC_DIRECT:
+                final_output[ExportLinksColumnsNames.FLOWBASED_PERIMETER] = False
+            values = aggregated[profile_col][:, DIRECTIONS.index(direction)]
+            final_output[export_col] = values[selected_profiles[direction]]
+
+        df_output = pd.DataFrame(final_output)
+        pair_sets = keys["set"].to_numpy()[pair_first_rows]
+        return [
+            df_output[pair_sets == set_id].reset_index(drop=True).sort_values(by=ExportLinksColumnsNames.NAME)
+            for set_id in range(len(active_sets))
+        ]
 
     def _transform_year_to_straddling_year(self) -> list[str]:
         result_list = []
@@ -447,18 +450,35 @@ class LinksParser:
         links_index_df = self._parse_index_links()
         index_mapping = self._build_links_index_mapping(links_index_df)
 
-        # parsing time series file
-        links_ntc_ts_df = pd.read_csv(self.input_folder / LINKS_NTC_TS_NAME)
+        # parsing time series file: only the curves of the transfer links are used
+        curve_uids = set(self._get_curve_uids(df, index_mapping).dropna())
 
         # build index of median values
-        indexes_ntc_median_repartition = self._compute_ntc_median_repartition(links_ntc_ts_df)
-
-        all_data_indexes = InternalMapping(index=index_mapping, data=indexes_ntc_median_repartition)
-
-        # treatments for every year
-        index_of_df_pegase: dict[int, pd.DataFrame] = {}
-        for year in self.years:
-            df_year = self._build_pegase_dataframe(df, year, all_data_indexes)
-            index_of_df_pegase[year] = df_year
+        if self.median_tolerance is None:
+            links_ntc_ts_df = parse_time_series_file(
+                self.input_folder / LINKS_NTC_TS_NAME, curve_uids, self.input_cache, list(InputNTCsColumns)
+            )
+            indexes_ntc_median_repartition = self._compute_ntc_median_repartition(links_ntc_ts_df)
+        else:
+            indexes_ntc_median_repartition = self._estimate_ntc_median_repartition(curve_uids, self.median_tolerance)
+
+        all_data_indexes = InternalMapping(index=index_mapping, medians=indexes_ntc_median_repartition)
+
+        # treatments for every year: the years with the same active links share their profiles
+        active_years = self._build_active_years(df, self.years)
+        active_sets: list[npt.NDArray[np.bool_]] = []
+        set_ids: dict[bytes, int] = {}
+        year_set_ids: dict[int, int] = {}
+        for position, year in enumerate(self.years):
+            active_rows = active_years[:, position]
+            if not active_rows.any():
+                raise self._build_no_input_data_error([year])
+            if active_rows.tobytes() not in set_ids:
+                set_ids[active_rows.tobytes()] = len(active_sets)
+                active_sets.append(active_rows)
+            year_set_ids[year] = set_ids[active_rows.tobytes()]
+
+        profiles_by_set = self._select_links_profiles(df, all_data_indexes, active_sets)
+        index_of_df_pegase = {year: profiles_by_set[set_id] for year, set_id in year_set_ids.items()}
 
         self._export_links_to_excel(index_of_df_pegase)
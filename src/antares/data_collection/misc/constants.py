@@ -28,3 +28,5 @@ class InputMiscColumns(StrEnum):
 
 
 MISC_ROOT_FOLDER = Path("MISC")
+
+INPUT_MISC_DTYPES = {col.value: float if col == InputMiscColumns.NET_MAX_GEN_CAP else str for col in InputMiscColumns}
@@ -23,7 +23,7 @@ from antares.data_collection.misc.installed_power.constants import (
     OutputMiscPowerColumns,
 )
 from antares.data_collection.referential_data.main_params import MainParams
-from antares.data_collection.utils import filter_out_based_on_year
+from antares.data_collection.utils import UnitLifetimeIndex, filter_out_based_on_year
 
 AntaresNodeId: TypeAlias = str
 PemmdbPlantTypeId: TypeAlias = str
@@ -38,14 +38,20 @@ class MiscInstalledPowerParser:
         self.main_params = main_params
         self.years = years
 
-    def _compute_installed_power_year(self, df: pd.DataFrame, year: int) -> IndexCapacityCluster:
+    def _compute_installed_power_year(
+        self, df: pd.DataFrame, year: int, lifetime_index: UnitLifetimeIndex | None = None
+    ) -> IndexCapacityCluster:
         """
         Compute MISC metrics for a given year:
             - sum of capacity installed for each cluster (rounded to MAX_DECIMAL_DIGITS)
         """
 
         df_year = filter_out_based_on_year(
-            df, year, InputMiscColumns.COMMISSIONING_DATE.value, InputMiscColumns.DECOMMISSIONING_DATE_EXPECTED.value
+            df,
+            year,
+            InputMiscColumns.COMMISSIONING_DATE.value,
+            InputMiscColumns.DECOMMISSIONING_DATE_EXPECTED.value,
+            lifetime_index,
         )
 
         # Group (specific to misc, group by pemmdb cluster+cluster bp due to export format)
@@ -64,11 +70,13 @@ class MiscInstalledPowerParser:
 
         return output_dict
 
-    def _build_pegase_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _build_pegase_dataframe(
+        self, df: pd.DataFrame, lifetime_index: UnitLifetimeIndex | None = None
+    ) -> pd.DataFrame:
         records = []
 
         for year in self.years:
-            for area, cluster_dict in self._compute_installed_power_year(df, year).items():
+            for area, cluster_dict in self._compute_installed_power_year(df, year, lifetime_index).items():
                 for cluster, capacity in cluster_dict.items():
                     records.append((area, cluster[1], cluster[0], year, capacity))
 
@@ -109,6 +117,6 @@ class MiscInstalledPowerParser:
         output_path = parent_dir / MISC_INSTALL_POWER_NAME_FILE
         df.to_excel(output_path, index=False)
 
-    def build_misc_installed_power(self, df: pd.DataFrame) -> None:
-        df = self._build_pegase_dataframe(df)
+    def build_misc_installed_power(self, df: pd.DataFrame, lifetime_index: UnitLifetimeIndex | None = None) -> None:
+        df = self._build_pegase_dataframe(df, lifetime_index)
         self._export_misc_installed_power(df)
@@ -27,3 +27,6 @@ class InputLoadFactorIndexColumns(StrEnum):
 EXPORT_DATE_COLUMN = "date"
 
 MISC_LOAD_FACTOR_FOLDER = MISC_ROOT_FOLDER / "load factor" / "PEMMDB"
+
+
+INPUT_LOAD_FACTOR_INDEX_DTYPES = {col.value: str for col in InputLoadFactorIndexColumns}
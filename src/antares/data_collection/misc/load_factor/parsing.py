@@ -19,11 +19,12 @@ from antares.data_collection.constants import (
     ANTARES_CLUSTER_NAME_COLUMN,
     ANTARES_NODE_NAME_COLUMN,
     OUTPUT_DATE_INT_REFERENCE,
-    SCENARIO_TO_ALWAYS_CONSIDER,
 )
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.misc.constants import InputMiscColumns
 from antares.data_collection.misc.load_factor.constants import (
     EXPORT_DATE_COLUMN,
+    INPUT_LOAD_FACTOR_INDEX_DTYPES,
     LOAD_FACTOR_FILE_INDEX_NAME,
     LOAD_FACTOR_FILE_TS_NAME,
     MISC_LOAD_FACTOR_FOLDER,
@@ -31,10 +32,12 @@ from antares.data_collection.misc.load_factor.constants import (
 )
 from antares.data_collection.referential_data.main_params import MainParams
 from antares.data_collection.utils import (
-    filter_index_files_with_scenario_year,
+    CurveIndex,
+    UnitLifetimeIndex,
     filter_out_based_on_year,
     insert_str_date_time_reindex,
     parse_input_file,
+    parse_time_series_file,
     write_csv_file,
 )
 
@@ -42,15 +45,11 @@ from antares.data_collection.utils import (
 ZoneId: TypeAlias = str
 CurveId: TypeAlias = str
 
-# one curve id can be associated to multiple curve uid
-CurveUIDIds: TypeAlias = list[str]
-
-IndexTsMapping: TypeAlias = dict[ZoneId, dict[CurveId, CurveUIDIds]]
-
 
 @dataclass(frozen=True)
 class InternalIndexTsMapping:
-    index: IndexTsMapping
+    # one curve id can be associated to multiple curve uid
+    index: CurveIndex
     data: pd.DataFrame
 
 
@@ -78,40 +77,39 @@ class LoadFactorParser:
         output_folder: Path,
         main_params: MainParams,
         years: list[int],
+        input_cache: InputFileCache | None = None,
     ):
         self.input_folder = input_folder
         self.output_folder = output_folder
         self.main_params = main_params
         self.years = years
-
-    def _read_input_file(self) -> pd.DataFrame:
-        return parse_input_file(
-            self.input_folder.joinpath(LOAD_FACTOR_FILE_INDEX_NAME), list(InputLoadFactorIndexColumns)
+        self.input_cache = input_cache
+
+    def _read_input_file(self) -> CurveIndex:
+        df = parse_input_file(
+            self.input_folder.joinpath(LOAD_FACTOR_FILE_INDEX_NAME),
+            list(InputLoadFactorIndexColumns),
+            self.input_cache,
+            INPUT_LOAD_FACTOR_INDEX_DTYPES,
         )
-
-    def _build_index_mapping_year(self, df: pd.DataFrame, year: int) -> IndexTsMapping:
-        columns_to_group = [InputLoadFactorIndexColumns.ZONE, InputLoadFactorIndexColumns.ID]
-        df = filter_index_files_with_scenario_year(
+        return CurveIndex(
+            df,
             self.main_params,
-            df=df,
-            year=year,
-            filter_scenario_value=SCENARIO_TO_ALWAYS_CONSIDER,
-            target_year_col=InputLoadFactorIndexColumns.TARGET_YEAR.value,
+            InputLoadFactorIndexColumns.ZONE.value,
+            InputLoadFactorIndexColumns.ID.value,
+            InputLoadFactorIndexColumns.TARGET_YEAR.value,
+            InputLoadFactorIndexColumns.CURVE_UID.value,
         )
-        groups = df.groupby(by=columns_to_group, as_index=False)
-        mapping: IndexTsMapping = {}
-        for (area, curve), grouped_df in groups:
-            assert isinstance(area, ZoneId)
-            assert isinstance(curve, CurveId)
-            mapping.setdefault(area, {})[curve] = list(grouped_df[InputLoadFactorIndexColumns.CURVE_UID])
-        return mapping
-
-    def _build_index_weight_year(self, df: pd.DataFrame, year: int) -> IndexClusterWeight:
+
+    def _build_index_weight_year(
+        self, df: pd.DataFrame, year: int, lifetime_index: UnitLifetimeIndex | None = None
+    ) -> IndexClusterWeight:
         df = filter_out_based_on_year(
             df,
             year,
             InputMiscColumns.COMMISSIONING_DATE,
             InputMiscColumns.DECOMMISSIONING_DATE_EXPECTED,
+            lifetime_index,
         )
 
         # group by zone, cluster, curve
@@ -157,7 +155,7 @@ class LoadFactorParser:
         return dict_of_weight
 
     def _build_index_ts_weighted_average_year(
-        self, index_mapping: InternalIndexTsMapping, index_weight_cluster: IndexClusterWeight
+        self, index_mapping: InternalIndexTsMapping, index_weight_cluster: IndexClusterWeight, year: int
     ) -> IndexTimeSeriesWeightedAverage:
         result: IndexTimeSeriesWeightedAverage = {}
 
@@ -169,7 +167,7 @@ class LoadFactorParser:
 
                     for curve_id, weight in curves.items():
                         # get name(s) of ts uid(s)
-                        uids = index_mapping.index.get(zone_id, {}).get(curve_id, [])
+                        uids = index_mapping.index.get_curve_uids(zone_id, curve_id, year)
 
                         if not uids:
                             # default series if no mapping
@@ -225,27 +223,27 @@ class LoadFactorParser:
                 )
                 write_csv_file(file_path, df_cluster)
 
-    def build_load_factor(self, df_misc_filtered: pd.DataFrame) -> None:
+    def build_load_factor(
+        self, df_misc_filtered: pd.DataFrame, lifetime_index: UnitLifetimeIndex | None = None
+    ) -> None:
         # parsing index file
-        df_index = self._read_input_file()
+        curve_index = self._read_input_file()
+
+        # parsing ts file (only the curves used for the requested years)
+        curve_uids = curve_index.get_referenced_curve_uids(self.years)
+        df_ts = parse_time_series_file(self.input_folder / LOAD_FACTOR_FILE_TS_NAME, curve_uids, self.input_cache)
 
-        # parsing ts file
-        df_ts = pd.read_csv(self.input_folder / LOAD_FACTOR_FILE_TS_NAME)
+        # structure index and time series dataclass, the index is looked up for every year
+        index_ts_dataclass = InternalIndexTsMapping(index=curve_index, data=df_ts)
 
         # treatments for every year
         index_of_df_pegase: dict[int, dict[tuple[PemmdbPlantTypeId, ClusterId], pd.DataFrame]] = {}
         for year in self.years:
-            # group index filtered by year + time series (raw data)
-            index_mapping_year = self._build_index_mapping_year(df_index, year)
-
-            # structure index and time series dataclass
-            index_ts_dataclass_year = InternalIndexTsMapping(index=index_mapping_year, data=df_ts)
-
-            index_cluster_weight = self._build_index_weight_year(df_misc_filtered, year)
+            index_cluster_weight = self._build_index_weight_year(df_misc_filtered, year, lifetime_index)
 
             # build dictionary with zone/cluster who contains weighted average time series
             index_ts_weighted_average = self._build_index_ts_weighted_average_year(
-                index_ts_dataclass_year, index_cluster_weight
+                index_ts_dataclass, index_cluster_weight, year
             )
 
             # final df with Pegase format
@@ -14,18 +14,22 @@ from pathlib import Path
 import pandas as pd
 
 from antares.data_collection.constants import ANTARES_CLUSTER_NAME_COLUMN
-from antares.data_collection.misc.constants import MISC_INPUT_FILE, InputMiscColumns
+from antares.data_collection.filter_pipeline import FilterPipeline, FilterStage
+from antares.data_collection.input_cache import InputFileCache
+from antares.data_collection.misc.constants import INPUT_MISC_DTYPES, MISC_INPUT_FILE, InputMiscColumns
 from antares.data_collection.misc.installed_power.parsing import MiscInstalledPowerParser
 from antares.data_collection.misc.load_factor.parsing import LoadFactorParser
 from antares.data_collection.referential_data.main_params import MainParams
 from antares.data_collection.utils import (
+    UnitLifetimeIndex,
     add_code_antares_colum,
-    filter_based_on_commission_date,
-    filter_based_on_net_max_gen_cap,
-    filter_based_on_op_stat,
-    filter_based_on_study_scenarios,
-    filter_non_declared_areas,
+    commission_date_stage,
+    convert_commission_dates,
+    declared_areas_stage,
+    net_max_gen_cap_stage,
+    op_stat_stage,
     parse_input_file,
+    study_scenarios_stage,
 )
 
 
@@ -37,54 +41,68 @@ class MiscParser:
         op_stat_values: list[str],
         main_params: MainParams,
         years: list[int],
+        input_cache: InputFileCache | None = None,
     ):
         self.input_folder = input_folder
         self.output_folder = output_folder
         self.op_stat_values = op_stat_values
         self.main_params = main_params
         self.years = years
+        self.input_cache = input_cache
         self.filtered_dataframe = self._build_filtered_dataframe()
+        self.lifetime_index = UnitLifetimeIndex(
+            self.filtered_dataframe,
+            years,
+            InputMiscColumns.COMMISSIONING_DATE,
+            InputMiscColumns.DECOMMISSIONING_DATE_EXPECTED,
+        )
 
     def _read_input_file(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder.joinpath(MISC_INPUT_FILE), list(InputMiscColumns))
+        return parse_input_file(
+            self.input_folder.joinpath(MISC_INPUT_FILE), list(InputMiscColumns), self.input_cache, INPUT_MISC_DTYPES
+        )
 
-    def _filter_non_declared_misc_clusters(self, df: pd.DataFrame, pemmdb_cluster_column: str) -> pd.DataFrame:
-        all_pemmdb_clusters = set(df[pemmdb_cluster_column])
-        missing_mappings = []
-        for cluster_pemmdb in all_pemmdb_clusters:
-            antares_cluster = self.main_params.get_misc_cluster_bp(cluster_pemmdb)
-            if not antares_cluster:
-                missing_mappings.append(cluster_pemmdb)
+    def _declared_misc_clusters_stage(self, pemmdb_cluster_column: str) -> FilterStage:
+        def build_mask(df: pd.DataFrame) -> pd.Series:
+            _, missing_mask = self.main_params.map_misc_clusters_bp(df[pemmdb_cluster_column])
+            return ~missing_mask
 
-        if missing_mappings:
-            return df[~df[pemmdb_cluster_column].isin(missing_mappings)]
-        return df
+        return FilterStage("declared_misc_clusters", build_mask)
 
     def _add_antares_misc_cluster_name_colum(self, df: pd.DataFrame, pemmdb_cluster_column: str) -> pd.DataFrame:
-        cluster_list = df[pemmdb_cluster_column].tolist()
-        df[ANTARES_CLUSTER_NAME_COLUMN] = self.main_params.get_misc_clusters_bp(cluster_list)
+        # The missing clusters were reported by `_declared_misc_clusters_stage`
+        df[ANTARES_CLUSTER_NAME_COLUMN], _ = self.main_params.map_misc_clusters_bp(
+            df[pemmdb_cluster_column], report_missing=False
+        )
         return df
 
     def _build_filtered_dataframe(self) -> pd.DataFrame:
-        df = self._read_input_file()
-        df = filter_based_on_op_stat(self.op_stat_values, df, InputMiscColumns.OP_STAT)
-        df = filter_non_declared_areas(self.main_params, df, InputMiscColumns.MARKET_NODE)
-        df = self._filter_non_declared_misc_clusters(df, InputMiscColumns.PEMMDB_PLANT_TYPE)
-        df = filter_based_on_study_scenarios(df, self.main_params, self.years, InputMiscColumns.STUDY_SCENARIO)
-        df = filter_based_on_commission_date(
-            df,
-            self.years,
-            InputMiscColumns.COMMISSIONING_DATE,
-            InputMiscColumns.DECOMMISSIONING_DATE_EXPECTED,
+        pipeline = FilterPipeline(
+            [
+                op_stat_stage(self.op_stat_values, InputMiscColumns.OP_STAT),
+                declared_areas_stage(self.main_params, InputMiscColumns.MARKET_NODE),
+                self._declared_misc_clusters_stage(InputMiscColumns.PEMMDB_PLANT_TYPE),
+                study_scenarios_stage(self.main_params, self.years, InputMiscColumns.STUDY_SCENARIO),
+                commission_date_stage(
+                    self.years,
+                    InputMiscColumns.COMMISSIONING_DATE,
+                    InputMiscColumns.DECOMMISSIONING_DATE_EXPECTED,
+                ),
+                net_max_gen_cap_stage(InputMiscColumns.NET_MAX_GEN_CAP),
+            ]
+        )
+        df = pipeline.apply(self._read_input_file())
+        df = convert_commission_dates(
+            df, InputMiscColumns.COMMISSIONING_DATE, InputMiscColumns.DECOMMISSIONING_DATE_EXPECTED
         )
+        self.filter_reports = pipeline.reports
         df = self._add_antares_misc_cluster_name_colum(df, InputMiscColumns.PEMMDB_PLANT_TYPE)
-        df = filter_based_on_net_max_gen_cap(df, InputMiscColumns.NET_MAX_GEN_CAP.value)
         return add_code_antares_colum(self.main_params, df, InputMiscColumns.MARKET_NODE.value)
 
     def build_misc_installed_power_part(self) -> None:
         parser = MiscInstalledPowerParser(self.output_folder, self.main_params, self.years)
-        parser.build_misc_installed_power(self.filtered_dataframe)
+        parser.build_misc_installed_power(self.filtered_dataframe, self.lifetime_index)
 
     def build_misc_load_factor_part(self) -> None:
-        parser = LoadFactorParser(self.input_folder, self.output_folder, self.main_params, self.years)
-        parser.build_load_factor(self.filtered_dataframe)
+        parser = LoadFactorParser(self.input_folder, self.output_folder, self.main_params, self.years, self.input_cache)
+        parser.build_load_factor(self.filtered_dataframe, self.lifetime_index)
@@ -0,0 +1,77 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+class BinnedMedianSketch:
+    """
+    Approximate medians of several series whose values are streamed by parts.
+
+    The series are identified by non-negative integer keys. Each value is only counted inside the bin of its nearest
+    multiple of `tolerance`, in a dense (keys x bins) matrix of counts: the memory depends on the range of the values,
+    not on their number, and the medians are at most `tolerance / 2` away from the exact ones. Counts are additive,
+    so the sketch can be updated part by part in any order.
+    """
+
+    def __init__(self, tolerance: float):
+        if tolerance <= 0:
+            raise ValueError(f"The median tolerance must be strictly positive, got {tolerance}")
+        self.tolerance = tolerance
+        self._counts: npt.NDArray[np.int64] = np.zeros((0, 0), dtype=np.int64)
+        # Bin of the first column of the counts
+        self._min_bin = 0
+
+    def _grow(self, n_keys: int, min_bin: int, max_bin: int) -> None:
+        """Widens the counts so that they hold the given keys and bins. They are only copied if they grow."""
+        if self._counts.size:
+            n_keys = max(n_keys, self._counts.shape[0])
+            min_bin = min(min_bin, self._min_bin)
+            max_bin = max(max_bin, self._min_bin + self._counts.shape[1] - 1)
+        shape = (n_keys, max_bin - min_bin + 1)
+        if shape == self._counts.shape:
+            return
+        counts = np.zeros(shape, dtype=np.int64)
+        offset = self._min_bin - min_bin
+        counts[: self._counts.shape[0], offset : offset + self._counts.shape[1]] = self._counts
+        self._counts, self._min_bin = counts, min_bin
+
+    def update(self, keys: npt.NDArray[np.integer[Any]], values: npt.NDArray[np.float64]) -> None:
+        """Adds each value to the series of the key at the same position. Missing values are skipped."""
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return
+        keys = keys[valid].astype(np.int64)
+        bins = np.rint(values[valid] / self.tolerance).astype(np.int64)
+        self._grow(int(keys.max()) + 1, int(bins.min()), int(bins.max()))
+
+        # The cost only depends on the size of the part: each distinct (key, bin) cell is incremented once
+        cells, counts = np.unique(keys * self._counts.shape[1] + (bins - self._min_bin), return_counts=True)
+        self._counts.reshape(-1)[cells] += counts
+
+    def medians(self, keys: npt.NDArray[np.integer[Any]]) -> npt.NDArray[np.float64]:
+        """The median of each key, the mean of its two middle values if it has an even number of them."""
+        medians = np.full(len(keys), np.nan)
+        known = keys < self._counts.shape[0]
+        cumulative_counts = np.cumsum(self._counts[keys[known]], axis=1)
+        totals = cumulative_counts[:, -1] if cumulative_counts.size else np.zeros(len(cumulative_counts), np.int64)
+        present = totals > 0
+        cumulative_counts, totals = cumulative_counts[present], totals[present, np.newaxis]
+
+        # The k-th value of a key (0-based) is inside the first bin whose cumulative count exceeds k
+        lower = (cumulative_counts <= (totals - 1) // 2).sum(axis=1)
+        upper = (cumulative_counts <= totals // 2).sum(axis=1)
+        known[known] = present
+        medians[known] = (lower + upper + 2 * self._min_bin) * self.tolerance / 2
+        return medians
@@ -9,14 +9,28 @@
 # SPDX-License-Identifier: MPL-2.0
 #
 # This file is part of the Antares project.
-from dataclasses import dataclass
+import hashlib
+import sys
+
+from dataclasses import asdict, dataclass, field, fields
 
 # structure Referential (MAIN_PARAMS.xlsx)
 from enum import StrEnum
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
+from typing import Any, Literal
 
+import numpy as np
 import pandas as pd
 
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from antares.data_collection.input_cache import InputFileCache
+from antares.data_collection.referential_data.missing_mappings import MissingMappingCategory, MissingMappingsReport
+
 
 # all workbook sheet names
 class ReferentialSheetNames(StrEnum):
@@ -87,6 +101,16 @@ class ClusterParams:
     min_stable_generation_default: float
 
 
+ExcelEngine = Literal["openpyxl", "calamine", "odf", "pyxlsb", "xlrd"]
+
+EXPECTED_SHEETS = [
+    ReferentialSheetNames.PAYS,
+    ReferentialSheetNames.STUDY_SCENARIO,
+    ReferentialSheetNames.CLUSTER,
+    ReferentialSheetNames.COMMON_DATA,
+    ReferentialSheetNames.PEAK_PARAMS,
+]
+
 RATIO_FIELDS = [
     CommonDataColumnsNames.EFFICIENCY_DEFAULT.value,
     CommonDataColumnsNames.FO_RATE_DEFAULT.value,
@@ -115,6 +139,10 @@ class MainParams:
             Mapping from study year to scenario type.
         _cluster_antares (dict[str, ClusterParams]):
             Mapping from BP cluster to its attribute `fuel` and `type`
+        _common_data (pd.DataFrame):
+            `_cluster_antares` as a DataFrame indexed by BP cluster, with one column per `ClusterParams` attribute.
+        _missing_mappings (MissingMappingsReport):
+            Values that were looked up without being found, see `pop_missing_mappings_report`.
     """
 
     _market_to_antares: dict[str, str]
@@ -124,17 +152,73 @@ class MainParams:
     _cluster_antares: dict[str, ClusterParams]
     _peak_hour_label: dict[int, str]
     _peak_month_label: dict[int, str]
+    _common_data: pd.DataFrame = field(init=False, repr=False, compare=False)
+    # Belongs to the current build, not to the referential: it is neither compared nor pickled
+    _missing_mappings: MissingMappingsReport = field(
+        default_factory=MissingMappingsReport, init=False, repr=False, compare=False
+    )
 
-    def get_antares_code(self, market_code: str) -> str | None:
-        value = self._market_to_antares.get(market_code)
+    def __post_init__(self) -> None:
+        self._common_data = pd.DataFrame.from_records(
+            [asdict(params) for params in self._cluster_antares.values()],
+            index=pd.Index(list(self._cluster_antares), name=CommonDataColumnsNames.CLUSTER_BP.value),
+            columns=[f.name for f in fields(ClusterParams)],
+        )
+
+    @override
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_missing_mappings"] = MissingMappingsReport()
+        return state
+
+    def pop_missing_mappings_report(self) -> MissingMappingsReport:
+        """Returns the values that were not found since the last call."""
+        report = self._missing_mappings
+        self._missing_mappings = MissingMappingsReport()
+        return report
+
+    def record_missing_mappings(self, report: MissingMappingsReport) -> None:
+        """Adds values that were not found by another `MainParams` (e.g. inside a worker process)."""
+        self._missing_mappings.merge(report)
+
+    def _get_value(self, category: MissingMappingCategory, mapping: dict[str, str], key: str) -> str | None:
+        value = mapping.get(key)
         if pd.isna(value):
-            # The value is either missing or the line does not even exist. We should log the information but not crash.
-            print(f"Market node '{market_code}' was not found inside `MainParams`")
+            # The value is either missing or the line does not even exist. We should report it but not crash.
+            self._missing_mappings.add(category, {key: 1})
             return None
         return value
 
+    def _map_values(
+        self, category: MissingMappingCategory, mapping: dict[str, str], keys: pd.Series, report_missing: bool
+    ) -> tuple[pd.Series, pd.Series]:
+        """
+        Maps a whole column with one hash join instead of one dictionary lookup per row.
+        Returns the mapped values and the mask of the ones that are missing (or mapped to an empty value).
+        The missing ones are only reported if `report_missing`: rows mapped again (e.g. once filtered on the same
+        mapping) were already counted by their first lookup.
+        """
+        mapped_values = keys.map(mapping)
+        missing_mask = mapped_values.isna() | (mapped_values == "")
+        if report_missing and missing_mask.any():
+            self._missing_mappings.add_rows(category, keys[missing_mask])
+        return mapped_values, missing_mask
+
+    @staticmethod
+    def _to_optional_values(mapped_values: pd.Series, missing_mask: pd.Series) -> list[str | None]:
+        values: list[str | None] = mapped_values.astype(object).where(~missing_mask, None).tolist()
+        return values
+
+    def get_antares_code(self, market_code: str) -> str | None:
+        return self._get_value(MissingMappingCategory.MARKET_NODE, self._market_to_antares, market_code)
+
+    def map_antares_codes(self, market_codes: pd.Series, report_missing: bool = True) -> tuple[pd.Series, pd.Series]:
+        return self._map_values(
+            MissingMappingCategory.MARKET_NODE, self._market_to_antares, market_codes, report_missing
+        )
+
     def get_antares_codes(self, market_codes: list[str]) -> list[str | None]:
-        return [self.get_antares_code(c) for c in market_codes]
+        return self._to_optional_values(*self.map_antares_codes(pd.Series(market_codes, dtype=object)))
 
     def get_scenario_type(self, year: int) -> str:
         if year not in self._year_to_scenario:
@@ -146,27 +230,38 @@ class MainParams:
 
     # thermal
     def get_thermal_cluster_bp(self, cluster_pemmdb: str) -> str | None:
-        value = self._thermal_cluster_pemmdb_to_antares.get(cluster_pemmdb)
-        if pd.isna(value):
-            # The value is either missing or the line does not even exist. We should log the information but not crash.
-            print(f"ENTSOE Cluster '{cluster_pemmdb}' was not found inside `MainParams`")
-            return None
-        return value
+        return self._get_value(
+            MissingMappingCategory.THERMAL_CLUSTER, self._thermal_cluster_pemmdb_to_antares, cluster_pemmdb
+        )
+
+    def map_thermal_clusters_bp(
+        self, clusters_pemmdb: pd.Series, report_missing: bool = True
+    ) -> tuple[pd.Series, pd.Series]:
+        return self._map_values(
+            MissingMappingCategory.THERMAL_CLUSTER,
+            self._thermal_cluster_pemmdb_to_antares,
+            clusters_pemmdb,
+            report_missing,
+        )
 
     def get_thermal_clusters_bp(self, clusters_pemmdb: list[str]) -> list[str | None]:
-        return [self.get_thermal_cluster_bp(c) for c in clusters_pemmdb]
+        return self._to_optional_values(*self.map_thermal_clusters_bp(pd.Series(clusters_pemmdb, dtype=object)))
 
     # misc
     def get_misc_cluster_bp(self, cluster_pemmdb: str) -> str | None:
-        value = self._misc_cluster_pemmdb_to_antares.get(cluster_pemmdb)
-        if pd.isna(value):
-            # The value is either missing or the line does not even exist. We should log the information but not crash.
-            print(f"ENTSOE Cluster '{cluster_pemmdb}' was not found inside `MainParams`")
-            return None
-        return value
+        return self._get_value(
+            MissingMappingCategory.MISC_CLUSTER, self._misc_cluster_pemmdb_to_antares, cluster_pemmdb
+        )
+
+    def map_misc_clusters_bp(
+        self, clusters_pemmdb: pd.Series, report_missing: bool = True
+    ) -> tuple[pd.Series, pd.Series]:
+        return self._map_values(
+            MissingMappingCategory.MISC_CLUSTER, self._misc_cluster_pemmdb_to_antares, clusters_pemmdb, report_missing
+        )
 
     def get_misc_clusters_bp(self, clusters_pemmdb: list[str]) -> list[str | None]:
-        return [self.get_misc_cluster_bp(c) for c in clusters_pemmdb]
+        return self._to_optional_values(*self.map_misc_clusters_bp(pd.Series(clusters_pemmdb, dtype=object)))
 
     def get_antares_cluster_common_data_params(self, antares_cluster: str) -> ClusterParams:
         if self._cluster_antares is None or antares_cluster not in self._cluster_antares:
@@ -176,6 +271,10 @@ class MainParams:
     def get_antares_clusters_common_data_params(self, antares_clusters: list[str]) -> list[ClusterParams]:
         return [self.get_antares_cluster_common_data_params(c) for c in antares_clusters]
 
+    def get_antares_clusters_common_data(self) -> pd.DataFrame:
+        """Returns the `ClusterParams` of all the BP clusters, indexed by cluster name (one column per attribute)."""
+        return self._common_data.copy()
+
     def get_peak_hour_label(self, hour_value: int) -> str:
         return self._peak_hour_label[hour_value]
 
@@ -183,7 +282,20 @@ class MainParams:
         return self._peak_month_label[month_value]
 
 
-def parse_main_params(file_path: Path) -> MainParams:
+def _build_main_params_cache_name() -> str:
+    """The cached `MainParams` objects are re-built whenever the package version or their structure changes."""
+    schema = [(cls.__name__, f.name, str(f.type)) for cls in (MainParams, ClusterParams) for f in fields(cls)]
+    try:
+        package_version = version("antares-data-collection")
+    except PackageNotFoundError:
+        # Running from the sources: only the structure can tell
+        package_version = "dev"
+    return f"main_params_{package_version}_{hashlib.sha256(repr(schema).encode()).hexdigest()[:16]}"
+
+
+def parse_main_params(
+    file_path: Path, input_cache: InputFileCache | None = None, engine: ExcelEngine | None = None
+) -> MainParams:
     """Parse and validate a MAIN_PARAMS.xlsx workbook.
 
     This function:
@@ -198,6 +310,10 @@ def parse_main_params(file_path: Path) -> MainParams:
 
     Args:
         file_path: Path to the MAIN_PARAMS.xlsx file.
+        input_cache: If given, the parsed MainParams object is stored inside it
+            and re-used as long as the workbook content is unchanged.
+        engine: Excel engine given to pandas (e.g. "calamine", which is much
+            faster but requires the `python-calamine` package).
 
     Returns:
         A validated MainParams object containing referential mappings.
@@ -210,17 +326,20 @@ def parse_main_params(file_path: Path) -> MainParams:
     if not file_path.exists():
         raise FileNotFoundError(f"Input file does not exist: {file_path}")
 
-    expected_sheets = [
-        ReferentialSheetNames.PAYS,
-        ReferentialSheetNames.STUDY_SCENARIO,
-        ReferentialSheetNames.CLUSTER,
-        ReferentialSheetNames.COMMON_DATA,
-        ReferentialSheetNames.PEAK_PARAMS,
-    ]
-    excel_sheets = pd.read_excel(file_path, sheet_name=None)
-    for sheet in expected_sheets:
-        if sheet not in excel_sheets:
-            raise ValueError(f"Worksheet named '{sheet}' not found")
+    if input_cache is None:
+        return _read_main_params(file_path, engine)
+    return input_cache.read_compiled(
+        file_path, _build_main_params_cache_name(), lambda path: _read_main_params(path, engine)
+    )
+
+
+def _read_main_params(file_path: Path, engine: ExcelEngine | None) -> MainParams:
+    # Only the required sheets are parsed
+    with pd.ExcelFile(file_path, engine=engine) as workbook:
+        for sheet in EXPECTED_SHEETS:
+            if sheet not in workbook.sheet_names:
+                raise ValueError(f"Worksheet named '{sheet}' not found")
+        excel_sheets = {sheet: workbook.parse(sheet) for sheet in EXPECTED_SHEETS}
 
     # Parse the `PAYS` sheet
     df = excel_sheets[ReferentialSheetNames.PAYS]
@@ -254,11 +373,11 @@ def parse_main_params(file_path: Path) -> MainParams:
 
     df = df[df[ClusterColumnsNames.TYPE] == THERMAL_TYPE_NAME]
 
-    thermal_pemmdb_to_antares_mapping = {}
-    intermediate_dict = {}  # Used to get the Technology attribute for the upcoming `ClusterParams` class
-    for _, row in df.iterrows():
-        thermal_pemmdb_to_antares_mapping[row[ClusterColumnsNames.CLUSTER_PEMMDB]] = row[ClusterColumnsNames.CLUSTER_BP]
-        intermediate_dict[row[ClusterColumnsNames.CLUSTER_BP]] = row[ClusterColumnsNames.TECHNOLOGY]
+    thermal_pemmdb_to_antares_mapping = dict(
+        zip(df[ClusterColumnsNames.CLUSTER_PEMMDB], df[ClusterColumnsNames.CLUSTER_BP])
+    )
+    # Used to get the Technology attribute for the upcoming `ClusterParams` class
+    intermediate_dict = dict(zip(df[ClusterColumnsNames.CLUSTER_BP], df[ClusterColumnsNames.TECHNOLOGY]))
 
     # Parse the `Common Data` sheet
     df = excel_sheets[ReferentialSheetNames.COMMON_DATA]
@@ -274,30 +393,22 @@ def parse_main_params(file_path: Path) -> MainParams:
 
     # check that columns are integer values
     for column_int in [CommonDataColumnsNames.FO_DURATION_DEFAULT, CommonDataColumnsNames.PO_DURATION_DEFAULT]:
-        if not df[column_int].apply(lambda x: float(x).is_integer()).all():
+        if not (np.mod(df[column_int].astype(float), 1) == 0).all():
             raise ValueError(f"Column '{column_int}' must be integer")
 
-    cluster_antares_dict = {}
-    for _, row in df.iterrows():
-        bp_name = row[CommonDataColumnsNames.CLUSTER_BP]
-        fuel = row[CommonDataColumnsNames.FUEL]
-        efficiency_default = row[CommonDataColumnsNames.EFFICIENCY_DEFAULT]
-        fo_rate_default = row[CommonDataColumnsNames.FO_RATE_DEFAULT]
-        fo_duration_default = row[CommonDataColumnsNames.FO_DURATION_DEFAULT]
-        po_duration_default = row[CommonDataColumnsNames.PO_DURATION_DEFAULT]
-        po_winter_default = row[CommonDataColumnsNames.PO_WINTER_DEFAULT]
-        min_stable_generation_default = row[CommonDataColumnsNames.MIN_STABLE_GENERATION_DEFAULT]
-
-        cluster_antares_dict[bp_name] = ClusterParams(
-            technology=intermediate_dict[bp_name],
-            fuel=fuel,
-            efficiency_default=efficiency_default,
-            fo_rate_default=fo_rate_default,
-            fo_duration_default=fo_duration_default,
-            po_duration_default=po_duration_default,
-            po_winter_default=po_winter_default,
-            min_stable_generation_default=min_stable_generation_default,
+    cluster_antares_dict = {
+        row[CommonDataColumnsNames.CLUSTER_BP]: ClusterParams(
+            technology=intermediate_dict[row[CommonDataColumnsNames.CLUSTER_BP]],
+            fuel=row[CommonDataColumnsNames.FUEL],
+            efficiency_default=row[CommonDataColumnsNames.EFFICIENCY_DEFAULT],
+            fo_rate_default=row[CommonDataColumnsNames.FO_RATE_DEFAULT],
+            fo_duration_default=row[CommonDataColumnsNames.FO_DURATION_DEFAULT],
+            po_duration_default=row[CommonDataColumnsNames.PO_DURATION_DEFAULT],
+            po_winter_default=row[CommonDataColumnsNames.PO_WINTER_DEFAULT],
+            min_stable_generation_default=row[CommonDataColumnsNames.MIN_STABLE_GENERATION_DEFAULT],
         )
+        for row in df[list(CommonDataColumnsNames)].to_dict("records")
+    }
 
     # Parse the Misc `CLUSTER` sheet
     df = excel_sheets[ReferentialSheetNames.CLUSTER]
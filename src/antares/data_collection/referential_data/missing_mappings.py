@@ -0,0 +1,60 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import logging
+
+from collections import Counter
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, Mapping
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class MissingMappingCategory(StrEnum):
+    MARKET_NODE = "Market node"
+    THERMAL_CLUSTER = "Thermal ENTSOE Cluster"
+    MISC_CLUSTER = "Misc ENTSOE Cluster"
+
+
+@dataclass
+class MissingMappingsReport:
+    """
+    Values that were looked up inside `MainParams` without being found, with the number of times they were.
+
+    Lookups only record the misses: the report is logged once the output files are built.
+    """
+
+    missing_values: dict[MissingMappingCategory, Counter[Any]] = field(default_factory=dict)
+
+    def add(self, category: MissingMappingCategory, counts: Mapping[Any, int]) -> None:
+        self.missing_values.setdefault(category, Counter()).update(counts)
+
+    def add_rows(self, category: MissingMappingCategory, values: pd.Series) -> None:
+        """Counts each row of `values`, the missing values being counted as `None`."""
+        counts: dict[Any, int] = values.value_counts().to_dict()
+        if values.hasnans:
+            counts[None] = int(values.isna().sum())
+        self.add(category, counts)
+
+    def merge(self, other: "MissingMappingsReport") -> None:
+        for category, counts in other.missing_values.items():
+            self.add(category, counts)
+
+    def is_empty(self) -> bool:
+        return not any(self.missing_values.values())
+
+    def log(self) -> None:
+        for category, counter in self.missing_values.items():
+            for value, count in counter.items():
+                logger.warning(f"{category} '{value}' was not found inside `MainParams` ({count} occurrences)")
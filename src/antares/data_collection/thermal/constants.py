@@ -44,3 +44,16 @@ class InputThermalColumns(StrEnum):
 
 class OutputModulationColumns(StrEnum):
     DATE = "DATE_HEURE"
+
+
+THERMAL_NUMERIC_COLUMNS = [
+    InputThermalColumns.SCND_FUEL_RT,
+    InputThermalColumns.NET_MAX_GEN_CAP,
+    InputThermalColumns.STD_EFF_NCV,
+    InputThermalColumns.FORCED_OUTAGE_RATE,
+    InputThermalColumns.MEAN_TIME_REPAIR,
+    InputThermalColumns.PLAN_OUTAGE_ANNUAL_DAYS,
+    InputThermalColumns.PLAN_OUTAGE_WINTER,
+    InputThermalColumns.NET_MIN_STAB_GEN,
+]
+INPUT_THERMAL_DTYPES = {col.value: float if col in THERMAL_NUMERIC_COLUMNS else str for col in InputThermalColumns}
@@ -13,6 +13,7 @@
 from pathlib import Path
 from typing import Any, Iterator
 
+import numpy as np
 import pandas as pd
 
 from antares.data_collection.constants import ANTARES_CLUSTER_NAME_COLUMN, ANTARES_NODE_NAME_COLUMN, MAX_DECIMAL_DIGITS
@@ -59,64 +60,76 @@ class ThermalInstallerPowerParser:
                 return value
         return self.main_params.get_antares_cluster_common_data_params(unit_name).fuel
 
-    def _build_pegase_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _build_monthly_grid(self) -> pd.DatetimeIndex:
         date_ranges = list(self._get_start_and_end_timestamps_for_outputs())
+        if not date_ranges:
+            return pd.DatetimeIndex([])
+        return pd.DatetimeIndex(date_ranges[0].append(date_ranges[1:]))
 
-        start_dates = list(df[InputThermalColumns.COMMISSIONING_DATE])
-        end_dates = list(df[InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED])
-        capacities = list(df[InputThermalColumns.NET_MAX_GEN_CAP])
-        cluster_names = list(df[ANTARES_CLUSTER_NAME_COLUMN])
-        node_names = list(df[ANTARES_NODE_NAME_COLUMN])
-
-        cluster_groups: dict[str, dict[str, dict[pd.Timestamp, list[int | float]]]] = {}
-
-        for k in range(len(df)):
-            cluster_name = cluster_names[k]
-            antares_node = node_names[k]
-
-            cluster_groups.setdefault(antares_node, {}).setdefault(cluster_name, {})
-
-            for date_range in date_ranges:
-                for month in date_range:
-                    if start_dates[k] <= month <= end_dates[k]:
-                        cluster_groups[antares_node][cluster_name].setdefault(month, []).append(capacities[k])
-
-        output_data: dict[str, list[Any]] = {
-            OutputThermalInstallPowerColumns.AREA: [],
-            OutputThermalInstallPowerColumns.FUEL: [],
-            OutputThermalInstallPowerColumns.TECHNOLOGY: [],
-            OutputThermalInstallPowerColumns.CLUSTER: [],
-            OutputThermalInstallPowerColumns.CATEGORY: [],
+    def _build_pegase_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        months = self._build_monthly_grid()
+        n_months = len(months)
+
+        # Each (area, cluster) couple gets 2 rows (power and number), sorted by area then cluster
+        group_columns = [ANTARES_NODE_NAME_COLUMN, ANTARES_CLUSTER_NAME_COLUMN]
+        groups = df[group_columns].drop_duplicates().sort_values(group_columns)
+        group_ids = pd.MultiIndex.from_frame(groups).get_indexer(pd.MultiIndex.from_frame(df[group_columns]))
+        n_groups = len(groups)
+
+        # A unit is installed during the months `[first_month, end_month)` of the grid
+        start_dates = df[InputThermalColumns.COMMISSIONING_DATE].to_numpy(dtype="datetime64[ns]")
+        end_dates = df[InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED].to_numpy(dtype="datetime64[ns]")
+        first_months = np.searchsorted(months.to_numpy(), start_dates, side="left")
+        end_months = np.searchsorted(months.to_numpy(), end_dates, side="right")
+        # Missing dates never match (`NaT` is sorted after the whole grid)
+        end_months[np.isnat(end_dates)] = 0
+        n_installed_months = np.maximum(end_months - first_months, 0)
+        installed = n_installed_months > 0
+
+        # Number of units: +1 when a unit is installed, -1 when it is removed, then a cumulative sum over the months
+        unit_deltas = np.zeros((n_groups, n_months + 1), dtype=np.int64)
+        np.add.at(unit_deltas, (group_ids[installed], first_months[installed]), 1)
+        np.add.at(unit_deltas, (group_ids[installed], end_months[installed]), -1)
+        numbers = np.cumsum(unit_deltas, axis=1)[:, :n_months]
+
+        # Capacities are summed unit by unit (in the input file order) to give the exact same sums as before
+        units = np.repeat(np.arange(len(df)), n_installed_months)
+        months_offset = np.arange(len(units)) - np.repeat(
+            np.cumsum(n_installed_months) - n_installed_months, n_installed_months
+        )
+        capacities = np.zeros((n_groups, n_months))
+        np.add.at(
+            capacities,
+            (group_ids[units], first_months[units] + months_offset),
+            df[InputThermalColumns.NET_MAX_GEN_CAP].to_numpy(dtype=float)[units],
+        )
+
+        fuels = []
+        technologies = []
+        for cluster in groups[ANTARES_CLUSTER_NAME_COLUMN]:
+            # We have to handle `Bio` clusters as we don't have their mapping inside the `MainParams` class
+            unit_name = cluster.removesuffix(f" {BIOMASS_CLUSTER_SUFFIX}")
+            technologies.append(self.main_params.get_antares_cluster_common_data_params(unit_name).technology)
+            fuels.append(self._find_fuel(unit_name))
+
+        output_data: dict[str, Any] = {
+            OutputThermalInstallPowerColumns.TO_USE: 1,
+            OutputThermalInstallPowerColumns.AREA: np.repeat(groups[ANTARES_NODE_NAME_COLUMN].to_numpy(), 2),
+            OutputThermalInstallPowerColumns.FUEL: np.repeat(fuels, 2),
+            OutputThermalInstallPowerColumns.TECHNOLOGY: np.repeat(technologies, 2),
+            OutputThermalInstallPowerColumns.CLUSTER: np.repeat(groups[ANTARES_CLUSTER_NAME_COLUMN].to_numpy(), 2),
+            OutputThermalInstallPowerColumns.CATEGORY: np.tile(["power", "number"], n_groups),
         }
-        for date_range in date_ranges:
-            for month in date_range:
-                month_as_string = month.strftime("%Y_%m")
-                output_data[month_as_string] = []
-
-        for area in sorted(cluster_groups):
-            for cluster in sorted(cluster_groups[area]):
-                # We have to handle `Bio` clusters as we don't have their mapping inside the `MainParams` class
-                unit_name = cluster.removesuffix(f" {BIOMASS_CLUSTER_SUFFIX}")
-                technology = self.main_params.get_antares_cluster_common_data_params(unit_name).technology
-                fuel = self._find_fuel(unit_name)
-                output_data[OutputThermalInstallPowerColumns.AREA] += 2 * [area]
-                output_data[OutputThermalInstallPowerColumns.FUEL] += 2 * [fuel]
-                output_data[OutputThermalInstallPowerColumns.TECHNOLOGY] += 2 * [technology]
-                output_data[OutputThermalInstallPowerColumns.CLUSTER] += 2 * [cluster]
-                output_data[OutputThermalInstallPowerColumns.CATEGORY] += ["power", "number"]
-
-                for date_range in date_ranges:
-                    for month in date_range:
-                        data = cluster_groups[area][cluster].get(month, [])
-                        output_data[month.strftime("%Y_%m")] += [round(sum(data), MAX_DECIMAL_DIGITS), len(data)]
-
-        # Add the `ToUse` column with every value being a 1
-        dataframe = pd.DataFrame(output_data)
-        to_use_col = OutputThermalInstallPowerColumns.TO_USE
-        dataframe[to_use_col] = 1
-
-        # Reorder the dataframe columns (just need to put `ToUse` in first)
-        return dataframe[[to_use_col] + [col for col in dataframe.columns if col != to_use_col]]
+        for k, month_as_string in enumerate(months.strftime("%Y_%m")):
+            if numbers[:, k].any():
+                month_capacities = [round(capacity, MAX_DECIMAL_DIGITS) for capacity in capacities[:, k].tolist()]
+                # Interleaves the `power` and `number` rows
+                output_data[month_as_string] = np.column_stack([month_capacities, numbers[:, k]]).ravel()
+            else:
+                # No unit is installed this month
+                output_data[month_as_string] = np.zeros(2 * n_groups, dtype=np.int64)
+
+        return pd.DataFrame(output_data, index=pd.RangeIndex(2 * n_groups))
 
     def _export_dataframe(self, df: pd.DataFrame) -> None:
         parent_dir = self.output_folder / THERMAL_INSTALL_POWER_FOLDER
@@ -58,3 +58,6 @@ class InputGroupMustRunIndexColumns(StrEnum):
     TARGET_YEAR = "TARGET_YEAR"
     CURVE_UID = "CURVE_UID"
     LABEL = "LABEL"
+
+
+INPUT_INDEX_DTYPES = {col.value: str for col in InputGroupMustRunIndexColumns}
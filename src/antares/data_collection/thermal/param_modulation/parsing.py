@@ -9,22 +9,28 @@
 # SPDX-License-Identifier: MPL-2.0
 #
 # This file is part of the Antares project.
-import math
-import operator
+import multiprocessing
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
-from typing import Callable, TypeAlias
+from typing import Any, TypeAlias
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
 from antares.data_collection.constants import (
     ANTARES_CLUSTER_NAME_COLUMN,
     ANTARES_NODE_NAME_COLUMN,
+    MAX_DECIMAL_DIGITS,
     OUTPUT_DATE_INT_REFERENCE,
-    SCENARIO_TO_ALWAYS_CONSIDER,
+    YearId,
 )
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.referential_data.main_params import MainParams
+from antares.data_collection.referential_data.missing_mappings import MissingMappingsReport
 from antares.data_collection.thermal.constants import (
     InputThermalColumns,
     OutputModulationColumns,
@@ -41,6 +47,7 @@ from antares.data_collection.thermal.param_modulation.constants import (
     GROUP_MUST_RUN_NAME,
     INELASTIC_INDEX_NAME,
     INELASTIC_NAME,
+    INPUT_INDEX_DTYPES,
     MUST_RUN_INDEX_NAME,
     MUST_RUN_NAME,
     MUST_RUN_OUTPUT_NAME,
@@ -49,27 +56,92 @@ from antares.data_collection.thermal.param_modulation.constants import (
     InputIndexColumns,
 )
 from antares.data_collection.thermal.utils import (
+    CapacityModulationMinima,
+    compute_capacity_modulation_minima,
     get_path_capacity_modulation_file,
 )
 from antares.data_collection.utils import (
+    CurveIndex,
+    StudyScenarioIndex,
+    UnitLifetimeIndex,
     filter_based_on_study_scenarios,
-    filter_index_files_with_scenario_year,
     filter_out_based_on_year,
     insert_str_date_time_reindex,
     parse_input_file,
+    parse_time_series_file,
     write_csv_file,
 )
 
 ZoneId: TypeAlias = str
 ClusterId: TypeAlias = str
-CurveIds: TypeAlias = list[str]
-IndexMapping: TypeAlias = dict[ZoneId, dict[ClusterId, CurveIds]]
 
 
 @dataclass(frozen=True)
-class InternalMapping:
-    index: IndexMapping
+class LoadedCurves:
+    """The curves parsed from a time series file, with the mean of each curve computed once."""
+
     data: pd.DataFrame
+    means: pd.Series
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame) -> "LoadedCurves":
+        return cls(data, pd.Series({curve_uid: data[curve_uid].mean() for curve_uid in data.columns}, dtype=float))
+
+
+@dataclass(frozen=True)
+class SharedCurves:
+    """
+    `LoadedCurves` copied once inside a shared memory block, as a (curves x hours) float64 matrix.
+
+    Only this description is pickled to the worker processes, which read the curves through views on the block.
+    """
+
+    block_name: str
+    columns: list[str]
+    dtypes: list[np.dtype[Any]]
+    index: pd.Index
+    means: pd.Series
+
+    @classmethod
+    def create(cls, curves: LoadedCurves) -> tuple["SharedCurves", SharedMemory]:
+        """The returned block has to be closed and unlinked by the caller once the workers are done."""
+        data = curves.data
+        shape = (len(data.columns), len(data))
+        block = SharedMemory(create=True, size=max(shape[0] * shape[1] * np.dtype(np.float64).itemsize, 1))
+        matrix: npt.NDArray[np.float64] = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        for k, curve_uid in enumerate(data.columns):
+            matrix[k] = data[curve_uid].to_numpy(dtype=np.float64)
+        return cls(block.name, list(data.columns), list(data.dtypes), data.index, curves.means), block
+
+    def attach(self) -> tuple[LoadedCurves, SharedMemory]:
+        """The block has to stay open as long as the returned curves are used."""
+        block = SharedMemory(name=self.block_name)
+        matrix: npt.NDArray[np.float64] = np.ndarray(
+            (len(self.columns), len(self.index)), dtype=np.float64, buffer=block.buf
+        )
+        matrix.flags.writeable = False
+        data: dict[str, Any] = {}
+        for k, (curve_uid, dtype) in enumerate(zip(self.columns, self.dtypes)):
+            # Curves that were not float64 (e.g. integer or float32 ones) get back their type
+            data[curve_uid] = matrix[k] if dtype == np.float64 else matrix[k].astype(dtype)
+        return LoadedCurves(pd.DataFrame(data, index=self.index, copy=False), self.means), block
+
+
+@dataclass(frozen=True)
+class YearInputs:
+    """What the must run and capacity modulation files of a year are built from, besides the curves."""
+
+    year: int
+    thermal_df: pd.DataFrame
+    # Rows of each index file used for the year, by time series file name
+    indexes: dict[str, pd.DataFrame]
+
+
+@dataclass(frozen=True)
+class InternalMapping:
+    # Rows of the index file used for the year: `ZONE`, `ID` and `CURVE_UID` columns
+    index: pd.DataFrame
+    curves: LoadedCurves
 
 
 @dataclass(frozen=True)
@@ -90,72 +162,87 @@ class TimeSeriesAndClusterPair:
 
 @dataclass(frozen=True)
 class SearchDirection:
-    starting_point: float
-    operator: Callable[[float, float], bool]
+    # Whether the candidate curve with the lowest mean is selected, or the highest one.
+    # On equal means, the last candidate is selected.
+    lowest_mean: bool
 
 
 ClusterGroupTsRepartition: TypeAlias = dict[ZoneId, dict[ClusterId, list[TimeSeriesAndClusterPair]]]
 
 
 class ThermalParamModulationParser:
-    def __init__(self, input_folder: Path, output_folder: Path, main_params: MainParams, years: list[int]):
+    def __init__(
+        self,
+        input_folder: Path,
+        output_folder: Path,
+        main_params: MainParams,
+        years: list[int],
+        input_cache: InputFileCache | None = None,
+        max_workers: int | None = None,
+    ):
+        """
+        If `max_workers` is greater than 1, the years are built in parallel by a pool of `max_workers` processes.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"The number of workers must be strictly positive, got {max_workers}")
         self.input_folder = input_folder
         self.output_folder = output_folder
         self.main_params = main_params
         self.years = years
+        self.input_cache = input_cache
+        self.max_workers = max_workers
+        self.capacity_modulation_minima: dict[YearId, CapacityModulationMinima] = {}
 
-    def _parse_inelastic_index(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder / INELASTIC_INDEX_NAME, list(InputIndexColumns))
-
-    def _parse_derating_index(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder / DERATING_INDEX_NAME, list(InputIndexColumns))
-
-    def _parse_group_derating_index(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder / GROUP_DERATING_INDEX_NAME, list(InputIndexColumns))
-
-    def _parse_must_run_index(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder / MUST_RUN_INDEX_NAME, list(InputIndexColumns))
+    def _build_curve_index(self, df: pd.DataFrame) -> CurveIndex:
+        return CurveIndex(
+            df,
+            self.main_params,
+            InputIndexColumns.ZONE.value,
+            InputIndexColumns.ID.value,
+            InputIndexColumns.TARGET_YEAR.value,
+            InputIndexColumns.CURVE_UID.value,
+        )
 
-    def _parse_group_must_run_index(self) -> pd.DataFrame:
-        df = parse_input_file(self.input_folder / GROUP_MUST_RUN_INDEX_NAME, list(InputGroupMustRunIndexColumns))
+    def _parse_index(self, file_name: str) -> CurveIndex:
+        df = parse_input_file(
+            self.input_folder / file_name, list(InputIndexColumns), self.input_cache, INPUT_INDEX_DTYPES
+        )
+        return self._build_curve_index(df)
+
+    def _parse_group_must_run_index(self) -> CurveIndex:
+        df = parse_input_file(
+            self.input_folder / GROUP_MUST_RUN_INDEX_NAME,
+            list(InputGroupMustRunIndexColumns),
+            self.input_cache,
+            INPUT_INDEX_DTYPES,
+        )
         df = df[df[InputGroupMustRunIndexColumns.LABEL] == GROUP_MUST_RUN_LABEL]
         df = df.drop(columns=[InputGroupMustRunIndexColumns.LABEL])
-        return df
+        return self._build_curve_index(df)
 
-    def _build_index_mapping(self, df: pd.DataFrame, year: int) -> IndexMapping:
-        columns_to_group = [InputIndexColumns.ZONE.value, InputIndexColumns.ID.value]
-        return self._build_index_internal_mapping(df, year, columns_to_group, InputIndexColumns.CURVE_UID)
-
-    def _build_group_must_run_index_mapping(self, df: pd.DataFrame, year: int) -> IndexMapping:
-        columns_to_group = [InputGroupMustRunIndexColumns.ZONE.value, InputGroupMustRunIndexColumns.ID.value]
-        return self._build_index_internal_mapping(df, year, columns_to_group, InputGroupMustRunIndexColumns.CURVE_UID)
-
-    def _build_index_internal_mapping(
-        self, df: pd.DataFrame, year: int, cols_to_group: list[str], curve_id_col: str
-    ) -> IndexMapping:
-        df = filter_index_files_with_scenario_year(
-            main_params=self.main_params,
-            df=df,
-            year=year,
-            filter_scenario_value=SCENARIO_TO_ALWAYS_CONSIDER,
-            target_year_col=InputIndexColumns.TARGET_YEAR.value,
-        )
-        groups = df.groupby(by=cols_to_group, as_index=False)
-        mapping: IndexMapping = {}
-        for (area, cluster), grouped_df in groups:
-            assert isinstance(area, ZoneId)
-            assert isinstance(cluster, ClusterId)
-            mapping.setdefault(area, {})[cluster] = list(grouped_df[curve_id_col])
-        return mapping
+    def _parse_time_series(self, file_name: str, curve_index: CurveIndex) -> LoadedCurves:
+        """Only parses the curves the index file references for the requested years."""
+        curve_uids = curve_index.get_referenced_curve_uids(self.years)
+        data = parse_time_series_file(self.input_folder / file_name, curve_uids, self.input_cache)
+        return LoadedCurves.from_data(data)
 
-    def _filter_thermal_input_file(self, df: pd.DataFrame, year: int) -> pd.DataFrame:
-        df = filter_based_on_study_scenarios(df, self.main_params, [year], InputThermalColumns.STUDY_SCENARIO.value)
+    def _filter_thermal_input_file(
+        self,
+        df: pd.DataFrame,
+        year: int,
+        scenario_index: StudyScenarioIndex | None = None,
+        lifetime_index: UnitLifetimeIndex | None = None,
+    ) -> pd.DataFrame:
+        df = filter_based_on_study_scenarios(
+            df, self.main_params, [year], InputThermalColumns.STUDY_SCENARIO.value, scenario_index
+        )
 
         df = filter_out_based_on_year(
             df,
             year,
             InputThermalColumns.COMMISSIONING_DATE.value,
             InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED.value,
+            lifetime_index,
         )
 
         useful_columns = [
@@ -172,35 +259,69 @@ class ThermalParamModulationParser:
         ]
         return df[useful_columns]
 
+    @staticmethod
     def _build_index_to_timeseries_object(
-        self,
-        year: int,
-        *,
-        inelastic_index: pd.DataFrame,
-        derating_index: pd.DataFrame,
-        group_derating_index: pd.DataFrame,
-        must_run_index: pd.DataFrame,
-        group_must_run_index: pd.DataFrame,
-        inelastic: pd.DataFrame,
-        derating: pd.DataFrame,
-        group_derating: pd.DataFrame,
-        must_run: pd.DataFrame,
-        group_must_run: pd.DataFrame,
+        indexes: dict[str, pd.DataFrame], curves: dict[str, LoadedCurves]
     ) -> IndexesToTimeSeries:
-        inelastic_index_mapping = self._build_index_mapping(df=inelastic_index, year=year)
-        derating_index_mapping = self._build_index_mapping(df=derating_index, year=year)
-        group_derating_index_mapping = self._build_index_mapping(df=group_derating_index, year=year)
-        must_run_index_mapping = self._build_index_mapping(df=must_run_index, year=year)
-        group_must_run_index_mapping = self._build_group_must_run_index_mapping(group_must_run_index, year)
+        def build_mapping(file_name: str) -> InternalMapping:
+            return InternalMapping(index=indexes[file_name], curves=curves[file_name])
 
         return IndexesToTimeSeries(
-            inelastic=InternalMapping(index=inelastic_index_mapping, data=inelastic),
-            group_must_run=InternalMapping(index=group_must_run_index_mapping, data=group_must_run),
-            must_run=InternalMapping(index=must_run_index_mapping, data=must_run),
-            derating=InternalMapping(index=derating_index_mapping, data=derating),
-            group_derating=InternalMapping(index=group_derating_index_mapping, data=group_derating),
+            inelastic=build_mapping(INELASTIC_NAME),
+            group_must_run=build_mapping(GROUP_MUST_RUN_NAME),
+            must_run=build_mapping(MUST_RUN_NAME),
+            derating=build_mapping(DERATING_NAME),
+            group_derating=build_mapping(GROUP_DERATING_NAME),
         )
 
+    def _select_curves(
+        self,
+        groups: pd.DataFrame,
+        zone_col: str,
+        group_index_to_internal_mapping: dict[int, InternalMapping],
+        search_direction: SearchDirection,
+    ) -> tuple[pd.DataFrame, npt.NDArray[np.bool_]]:
+        """
+        Selects the curve of every group, among the ones the index files give for its curve ids.
+
+        Returns the selected curves (`group` position, `mapping` key and `CURVE_UID` columns) and the groups that
+        have a curve id which is not present inside its index file.
+        """
+        candidates = []
+        curve_id_not_present_in_index = np.zeros(len(groups), dtype=bool)
+        for group_index, internal_mapping in group_index_to_internal_mapping.items():
+            curve_ids = pd.DataFrame(
+                {
+                    InputIndexColumns.ZONE.value: groups[zone_col].to_numpy(),
+                    InputIndexColumns.ID.value: groups.iloc[:, group_index].to_numpy(),
+                    "group": np.arange(len(groups)),
+                }
+            ).dropna(subset=[InputIndexColumns.ID.value])
+
+            matches = curve_ids.merge(
+                internal_mapping.index.reset_index(names="position"),
+                on=[InputIndexColumns.ZONE.value, InputIndexColumns.ID.value],
+            )
+            not_present = ~curve_ids["group"].isin(matches["group"])
+            curve_id_not_present_in_index[curve_ids.loc[not_present, "group"].to_numpy()] = True
+
+            matches["mapping"] = group_index
+            # Raises a `KeyError` if a curve is missing from its time series file
+            matches["mean"] = internal_mapping.curves.means.loc[matches[InputIndexColumns.CURVE_UID.value]].to_numpy()
+            candidates.append(matches)
+
+        # Candidates in the order they are given for each group, curves with no values are never selected
+        all_candidates = pd.concat(candidates, ignore_index=True).sort_values(
+            ["group", "mapping", "position"], kind="stable"
+        )
+        all_candidates = all_candidates[all_candidates["mean"].notna()]
+
+        # The last candidate has to win on equal means: the first one is looked for in the reversed order
+        reversed_means = all_candidates.iloc[::-1].groupby("group")["mean"]
+        selected_labels = reversed_means.idxmin() if search_direction.lowest_mean else reversed_means.idxmax()
+        selected = all_candidates.loc[selected_labels, ["group", "mapping", InputIndexColumns.CURVE_UID.value]]
+        return selected, curve_id_not_present_in_index
+
     def _build_cluster_group_repartition(
         self,
         df: pd.DataFrame,
@@ -209,51 +330,41 @@ class ThermalParamModulationParser:
         search_direction: SearchDirection,
         default_ts: pd.Series,
     ) -> ClusterGroupTsRepartition:
+        """
+        `columns_to_use` are the 3 curve id columns, whose index is given by `group_index_to_internal_mapping`,
+        followed by the cluster, zone and market node columns.
+        """
         result: ClusterGroupTsRepartition = {}
 
         useful_cols = columns_to_use + [InputThermalColumns.NET_MAX_GEN_CAP.value]
-        df_groups = df[useful_cols].groupby(by=columns_to_use, dropna=False)
-        for group, data in df_groups:
-            zone = group[4]
-            assert isinstance(zone, ZoneId)
-            market_node = group[5]
-            assert isinstance(market_node, str)
-            cluster_id = group[3]
-            assert isinstance(cluster_id, ClusterId)
-
-            starting_mean = search_direction.starting_point
-            final_ts = pd.Series()
-
-            # If no curve id is provided -> we SHOULD NOT write the final data
-            # If a curve id is provided but does not exist in the index -> we SHOULD write the final data
-            should_write_the_series = True
-            curve_id_exists_but_not_present_in_index = False
+        weights = df[useful_cols].groupby(by=columns_to_use, dropna=False)[InputThermalColumns.NET_MAX_GEN_CAP].sum()
+        groups = weights.index.to_frame(index=False)
 
-            for group_index, internal_mapping in group_index_to_internal_mapping.items():
-                value: str = group[group_index]  # type: ignore
-                if pd.isna(value):
-                    continue
-
-                if value not in internal_mapping.index.get(zone, {}):
-                    curve_id_exists_but_not_present_in_index = True
-                    continue
+        selected, curve_id_not_present_in_index = self._select_curves(
+            groups, columns_to_use[4], group_index_to_internal_mapping, search_direction
+        )
+        selected_curves = dict(
+            zip(selected["group"], zip(selected["mapping"], selected[InputIndexColumns.CURVE_UID.value]))
+        )
 
-                curve_ids = internal_mapping.index[zone][value]
-                for curve_id in curve_ids:
-                    ts = internal_mapping.data[curve_id]
-                    ts_mean = ts.mean()
-                    if search_direction.operator(starting_mean, ts_mean):
-                        final_ts = ts
-                        starting_mean = ts_mean
+        for position, (cluster_id, market_node, weight) in enumerate(
+            zip(groups[columns_to_use[3]], groups[columns_to_use[5]], weights)
+        ):
+            assert isinstance(market_node, str)
+            assert isinstance(cluster_id, ClusterId)
 
-            # Use default value for empty rows
-            if final_ts.empty:
+            if position in selected_curves:
+                group_index, curve_uid = selected_curves[position]
+                final_ts = group_index_to_internal_mapping[group_index].curves.data[curve_uid]
+                should_write_the_series = True
+            else:
+                # Use default value for empty rows
+                # If no curve id is provided -> we SHOULD NOT write the final data
+                # If a curve id is provided but does not exist in the index -> we SHOULD write the final data
                 final_ts = default_ts
-                if not curve_id_exists_but_not_present_in_index:
-                    should_write_the_series = False
+                should_write_the_series = bool(curve_id_not_present_in_index[position])
 
             # Fill the result
-            weight = data[InputThermalColumns.NET_MAX_GEN_CAP].sum()
             ts_pair = TimeSeriesAndClusterPair(weight, final_ts, should_write_the_series)
             result.setdefault(market_node, {}).setdefault(cluster_id, []).append(ts_pair)
 
@@ -275,7 +386,7 @@ class ThermalParamModulationParser:
             2: index_to_ts.inelastic,
         }
 
-        direction = SearchDirection(starting_point=math.inf, operator=operator.ge)
+        direction = SearchDirection(lowest_mean=True)
 
         return self._build_cluster_group_repartition(df, must_run_cols, mapping, direction, DEFAULT_MUST_RUN_TS)
 
@@ -297,86 +408,205 @@ class ThermalParamModulationParser:
             2: index_to_ts.inelastic,
         }
 
-        direction = SearchDirection(starting_point=-math.inf, operator=operator.le)
+        direction = SearchDirection(lowest_mean=False)
         default_ts = DEFAULT_CAPACITY_MODULATION_TS
         return self._build_cluster_group_repartition(df, modulation_cols, mapping, direction, default_ts)
 
     def _build_pegase_dataframe(self, data_repartition: ClusterGroupTsRepartition, year: int) -> pd.DataFrame:
-        pegase_df_as_dict = {}
+        columns_ts: dict[str, list[TimeSeriesAndClusterPair]] = {}
         # Sort values for output reproduction
         for market_node in sorted(data_repartition):
             for cluster in sorted(data_repartition[market_node]):
                 ts_list = data_repartition[market_node][cluster]
-                if len(ts_list) == 1:
-                    if not ts_list[0].should_write_the_series:
-                        # We don't want to write this TS, so we just skip it
-                        continue
-                    # We just need to write the TS as is
-                    final_ts = ts_list[0].series
-                else:
-                    # We have to merge all TS in just one using the weights and the values of each TS
-                    total_weight = sum(ts.weight for ts in ts_list)
-                    final_ts = sum(ts.weight * ts.series for ts in ts_list) / total_weight  # type: ignore
-
+                if len(ts_list) == 1 and not ts_list[0].should_write_the_series:
+                    # We don't want to write this TS, so we just skip it
+                    continue
                 zone = self.main_params.get_antares_code(market_node)
                 assert isinstance(zone, str)
-                column_name = f"{zone}_{cluster}"
-                pegase_df_as_dict[column_name] = final_ts
+                columns_ts[f"{zone}_{cluster}"] = ts_list
 
-        df = pd.DataFrame.from_dict(pegase_df_as_dict)
+        df = self._merge_weighted_time_series(columns_ts)
 
         # Add the Hours columns
         reindex_df = insert_str_date_time_reindex(df, OUTPUT_DATE_INT_REFERENCE, OutputModulationColumns.DATE.value)
 
         return reindex_df
 
+    @staticmethod
+    def _merge_weighted_time_series(columns_ts: dict[str, list[TimeSeriesAndClusterPair]]) -> pd.DataFrame:
+        """
+        Builds the output columns, each one being the average of its TS weighted by their capacity.
+
+        This is the product of the (hours x curves) matrix by the sparse (curves x columns) weight matrix:
+        the k-th TS of all the columns are added at once, directly inside the output buffer.
+        A column with a single TS is written as is.
+        """
+        if not columns_ts:
+            return pd.DataFrame()
+
+        # Every distinct TS is stored once inside the curves matrix
+        curve_positions: dict[int, int] = {}
+        curves: list[pd.Series] = []
+        for ts_list in columns_ts.values():
+            for ts in ts_list:
+                if id(ts.series) not in curve_positions:
+                    curve_positions[id(ts.series)] = len(curves)
+                    curves.append(ts.series)
+        curves_matrix = np.column_stack([curve.to_numpy(dtype=np.float64) for curve in curves])
+
+        output = np.zeros((curves_matrix.shape[0], len(columns_ts)))
+        single_columns = [k for k, ts_list in enumerate(columns_ts.values()) if len(ts_list) == 1]
+        output[:, single_columns] = curves_matrix[
+            :, [curve_positions[id(ts_list[0].series)] for ts_list in columns_ts.values() if len(ts_list) == 1]
+        ]
+
+        # Weighted columns: the k-th TS of each column is added in order, then the column is normalized
+        weighted_columns = [(k, ts_list) for k, ts_list in enumerate(columns_ts.values()) if len(ts_list) > 1]
+        max_nb_ts = max((len(ts_list) for _, ts_list in weighted_columns), default=0)
+        for rank in range(max_nb_ts):
+            rank_columns = [(k, ts_list[rank]) for k, ts_list in weighted_columns if rank < len(ts_list)]
+            column_indexes = [k for k, _ in rank_columns]
+            weights = np.array([ts.weight for _, ts in rank_columns], dtype=np.float64)
+            curve_indexes = [curve_positions[id(ts.series)] for _, ts in rank_columns]
+            output[:, column_indexes] += curves_matrix[:, curve_indexes] * weights
+        if weighted_columns:
+            total_weights = np.array([sum(ts.weight for ts in ts_list) for _, ts_list in weighted_columns])
+            output[:, [k for k, _ in weighted_columns]] /= total_weights
+
+        df = pd.DataFrame(output, columns=list(columns_ts), copy=False)
+
+        # Integer TS (e.g. the default ones) keep their type when written as is
+        for column, ts_list in columns_ts.items():
+            if len(ts_list) == 1 and pd.api.types.is_integer_dtype(ts_list[0].series):
+                df[column] = df[column].astype(ts_list[0].series.dtype)
+        return df
+
     def _write_must_run_file(self, year: int, data_repartition: ClusterGroupTsRepartition) -> None:
         df = self._build_pegase_dataframe(data_repartition, year)
         file_path = self.output_folder / TECHNICAL_PARAMS_FOLDER / f"{MUST_RUN_OUTPUT_NAME}_{year - 1}-{year}.csv"
         write_csv_file(file_path, df)
 
-    def _write_capacity_modulation_file(self, year: int, data_repartition: ClusterGroupTsRepartition) -> None:
+    def _write_capacity_modulation_file(
+        self, year: int, data_repartition: ClusterGroupTsRepartition
+    ) -> CapacityModulationMinima:
+        """Writes the file and returns the minimal value of its time series, used by the specific parameters."""
         df = self._build_pegase_dataframe(data_repartition, year)
         file_path = get_path_capacity_modulation_file(year, self.output_folder)
         write_csv_file(file_path, df)
-
-    def build_param_modulation(self, thermal_df: pd.DataFrame) -> None:
-        # Parse Index files
-        inelastic_index_df = self._parse_inelastic_index()
-        group_must_run_index_df = self._parse_group_must_run_index()
-        derating_index_df = self._parse_derating_index()
-        group_derating_index_df = self._parse_group_derating_index()
-        must_run_index_df = self._parse_must_run_index()
+        return compute_capacity_modulation_minima(df, MAX_DECIMAL_DIGITS)
+
+    def _build_year_files(self, inputs: YearInputs, curves: dict[str, LoadedCurves]) -> CapacityModulationMinima:
+        """Writes the must run and capacity modulation files of a year, and returns the capacity modulation minima."""
+        # Builds an object with the whole data regrouped
+        index_to_timeseries = self._build_index_to_timeseries_object(inputs.indexes, curves)
+
+        # Write the `Must Run` file
+        must_run_cluster_group_ts_repartition = self._build_must_run(inputs.thermal_df, index_to_timeseries)
+        self._write_must_run_file(inputs.year, must_run_cluster_group_ts_repartition)
+
+        # Write the `Capacity Modulation` file
+        capacity_modulation_repartition = self._build_capacity_modulation(inputs.thermal_df, index_to_timeseries)
+        return self._write_capacity_modulation_file(inputs.year, capacity_modulation_repartition)
+
+    def _build_years_in_parallel(
+        self, years_inputs: list[YearInputs], curves: dict[str, LoadedCurves]
+    ) -> list[CapacityModulationMinima]:
+        """
+        Each year is built by a worker process. The curves are put once inside shared memory blocks, instead of
+        being pickled to every worker; the results are given back in the order of `years_inputs`.
+
+        The workers are spawned rather than forked: a forked process inherits the locks held by the threads of
+        the parent (e.g. the polars thread pool) without the threads that would release them.
+        """
+        blocks: list[SharedMemory] = []
+        try:
+            shared_curves: dict[str, SharedCurves] = {}
+            for file_name, loaded_curves in curves.items():
+                shared_curves[file_name], block = SharedCurves.create(loaded_curves)
+                blocks.append(block)
+
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers or 1, len(years_inputs)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_year_worker,
+                initargs=(self.output_folder, self.main_params, self.years, shared_curves),
+            ) as executor:
+                results = list(executor.map(_build_year_in_worker, years_inputs))
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        minima = []
+        for year_minima, missing_mappings in results:
+            # The lookups done by the workers are reported as if they were done here
+            self.main_params.record_missing_mappings(missing_mappings)
+            minima.append(year_minima)
+        return minima
+
+    def build_param_modulation(self, thermal_df: pd.DataFrame, lifetime_index: UnitLifetimeIndex | None = None) -> None:
+        # Parse Index files, by the name of the time series file they refer to
+        curve_indexes = {
+            INELASTIC_NAME: self._parse_index(INELASTIC_INDEX_NAME),
+            GROUP_MUST_RUN_NAME: self._parse_group_must_run_index(),
+            DERATING_NAME: self._parse_index(DERATING_INDEX_NAME),
+            GROUP_DERATING_NAME: self._parse_index(GROUP_DERATING_INDEX_NAME),
+            MUST_RUN_NAME: self._parse_index(MUST_RUN_INDEX_NAME),
+        }
 
         # Parse data files
-        inelastic_df = pd.read_csv(self.input_folder / INELASTIC_NAME)
-        must_run_df = pd.read_csv(self.input_folder / MUST_RUN_NAME)
-        group_must_run_df = pd.read_csv(self.input_folder / GROUP_MUST_RUN_NAME)
-        derating_df = pd.read_csv(self.input_folder / DERATING_NAME)
-        group_derating_df = pd.read_csv(self.input_folder / GROUP_DERATING_NAME)
-
-        for year in self.years:
-            # Builds an object with the whole data regrouped
-            index_to_timeseries = self._build_index_to_timeseries_object(
+        curves = {file_name: self._parse_time_series(file_name, index) for file_name, index in curve_indexes.items()}
+
+        # The thermal input file is filtered for each year
+        scenario_index = StudyScenarioIndex(thermal_df[InputThermalColumns.STUDY_SCENARIO])
+        years_inputs = [
+            YearInputs(
                 year,
-                inelastic_index=inelastic_index_df,
-                derating_index=derating_index_df,
-                group_derating_index=group_derating_index_df,
-                must_run_index=must_run_index_df,
-                group_must_run_index=group_must_run_index_df,
-                inelastic=inelastic_df,
-                derating=derating_df,
-                group_derating=group_derating_df,
-                must_run=must_run_df,
-                group_must_run=group_must_run_df,
+                self._filter_thermal_input_file(thermal_df, year, scenario_index, lifetime_index),
+                {file_name: index.select_year(year) for file_name, index in curve_indexes.items()},
             )
+            for year in self.years
+        ]
+
+        if self.max_workers is not None and self.max_workers > 1 and len(years_inputs) > 1:
+            minima = self._build_years_in_parallel(years_inputs, curves)
+        else:
+            minima = [self._build_year_files(inputs, curves) for inputs in years_inputs]
 
-            thermal_df_year = self._filter_thermal_input_file(thermal_df, year)
+        for inputs, year_minima in zip(years_inputs, minima):
+            self.capacity_modulation_minima[inputs.year] = year_minima
 
-            # Write the `Must Run` file
-            must_run_cluster_group_ts_repartition = self._build_must_run(thermal_df_year, index_to_timeseries)
-            self._write_must_run_file(year, must_run_cluster_group_ts_repartition)
 
-            # Write the `Capacity Modulation` file
-            capacity_modulation_repartition = self._build_capacity_modulation(thermal_df_year, index_to_timeseries)
-            self._write_capacity_modulation_file(year, capacity_modulation_repartition)
+@dataclass(frozen=True)
+class _YearWorkerState:
+    parser: ThermalParamModulationParser
+    curves: dict[str, LoadedCurves]
+    # Kept open as long as the worker process lives, the curves being views on them
+    blocks: list[SharedMemory]
+
+
+_year_worker_state: _YearWorkerState | None = None
+
+
+def _init_year_worker(
+    output_folder: Path, main_params: MainParams, years: list[int], shared_curves: dict[str, SharedCurves]
+) -> None:
+    global _year_worker_state
+    # The input files are already parsed: the worker parser never reads them
+    parser = ThermalParamModulationParser(Path(), output_folder, main_params, years)
+    # Only the lookups done by this worker have to be reported
+    parser.main_params.pop_missing_mappings_report()
+
+    curves: dict[str, LoadedCurves] = {}
+    blocks: list[SharedMemory] = []
+    for file_name, shared in shared_curves.items():
+        curves[file_name], block = shared.attach()
+        blocks.append(block)
+    _year_worker_state = _YearWorkerState(parser, curves, blocks)
+
+
+def _build_year_in_worker(inputs: YearInputs) -> tuple[CapacityModulationMinima, MissingMappingsReport]:
+    assert _year_worker_state is not None
+    parser = _year_worker_state.parser
+    minima = parser._build_year_files(inputs, _year_worker_state.curves)
+    return minima, parser.main_params.pop_missing_mappings_report()
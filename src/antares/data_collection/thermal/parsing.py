@@ -14,25 +14,31 @@ from pathlib import Path
 
 import pandas as pd
 
-from antares.data_collection.constants import ANTARES_CLUSTER_NAME_COLUMN
+from antares.data_collection.constants import ANTARES_CLUSTER_NAME_COLUMN, YearId
+from antares.data_collection.filter_pipeline import FilterPipeline, FilterStage
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.referential_data.main_params import MainParams
 from antares.data_collection.thermal.constants import (
     BIOMASS_CLUSTER_SUFFIX,
     BIOMASS_SNCD_FUEL_VALUE,
+    INPUT_THERMAL_DTYPES,
     THERMAL_INPUT_FILE,
     InputThermalColumns,
 )
 from antares.data_collection.thermal.installed_power.parsing import ThermalInstallerPowerParser
 from antares.data_collection.thermal.param_modulation.parsing import ThermalParamModulationParser
 from antares.data_collection.thermal.specific_param.parsing import ThermalSpecificParamParser
+from antares.data_collection.thermal.utils import CapacityModulationMinima
 from antares.data_collection.utils import (
+    UnitLifetimeIndex,
     add_code_antares_colum,
-    filter_based_on_commission_date,
-    filter_based_on_net_max_gen_cap,
-    filter_based_on_op_stat,
-    filter_based_on_study_scenarios,
-    filter_non_declared_areas,
+    commission_date_stage,
+    convert_commission_dates,
+    declared_areas_stage,
+    net_max_gen_cap_stage,
+    op_stat_stage,
     parse_input_file,
+    study_scenarios_stage,
 )
 
 
@@ -44,38 +50,51 @@ class ThermalParser:
         op_stat_values: list[str],
         main_params: MainParams,
         years: list[int],
+        input_cache: InputFileCache | None = None,
+        max_workers: int | None = None,
     ):
         self.input_folder = input_folder
         self.output_folder = output_folder
         self.op_stat_values = op_stat_values
         self.main_params = main_params
         self.years = years
+        self.input_cache = input_cache
+        self.max_workers = max_workers
         self.filtered_dataframe = self._build_filtered_dataframe()
+        self.lifetime_index = UnitLifetimeIndex(
+            self.filtered_dataframe,
+            years,
+            InputThermalColumns.COMMISSIONING_DATE,
+            InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED,
+        )
+        self.capacity_modulation_minima: dict[YearId, CapacityModulationMinima] | None = None
 
     def _read_input_file(self) -> pd.DataFrame:
-        return parse_input_file(self.input_folder.joinpath(THERMAL_INPUT_FILE), list(InputThermalColumns))
+        return parse_input_file(
+            self.input_folder.joinpath(THERMAL_INPUT_FILE),
+            list(InputThermalColumns),
+            self.input_cache,
+            INPUT_THERMAL_DTYPES,
+        )
 
     def _add_antares_thermal_cluster_name_colum(self, df: pd.DataFrame) -> pd.DataFrame:
-        cluster_list = df[InputThermalColumns.PEMMDB_TECHNOLOGY].tolist()
-        df[ANTARES_CLUSTER_NAME_COLUMN] = self.main_params.get_thermal_clusters_bp(cluster_list)
+        # The missing clusters were reported by `_declared_thermal_clusters_stage`
+        df[ANTARES_CLUSTER_NAME_COLUMN], _ = self.main_params.map_thermal_clusters_bp(
+            df[InputThermalColumns.PEMMDB_TECHNOLOGY], report_missing=False
+        )
         return df
 
-    def _filter_non_declared_thermal_clusters(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _declared_thermal_clusters_stage(self) -> FilterStage:
         """
         Some mapping between ENTSOE clusters and Antares ones might be missing in the `MainParams` file.
         If so, we do not want to crash but rather log that we'll not consider them.
         """
-        key_column = InputThermalColumns.PEMMDB_TECHNOLOGY
-        all_pemmdb_clusters = set(df[key_column])
-        missing_mappings = []
-        for cluster_pemmdb in all_pemmdb_clusters:
-            antares_cluster = self.main_params.get_thermal_cluster_bp(cluster_pemmdb)
-            if not antares_cluster:
-                missing_mappings.append(cluster_pemmdb)
-
-        if missing_mappings:
-            return df[~df[key_column].isin(missing_mappings)]
-        return df
+
+        def build_mask(df: pd.DataFrame) -> pd.Series:
+            _, missing_mask = self.main_params.map_thermal_clusters_bp(df[InputThermalColumns.PEMMDB_TECHNOLOGY])
+            return ~missing_mask
+
+        return FilterStage("declared_thermal_clusters", build_mask)
 
     def _split_clusters_with_biomass_rule(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -103,20 +122,29 @@ class ThermalParser:
         return df
 
     def _build_filtered_dataframe(self) -> pd.DataFrame:
-        df = self._read_input_file()
-        df = filter_based_on_op_stat(self.op_stat_values, df, InputThermalColumns.OP_STAT.value)
-        df = filter_non_declared_areas(self.main_params, df, InputThermalColumns.MARKET_NODE.value)
-        df = self._filter_non_declared_thermal_clusters(df)
-        df = filter_based_on_study_scenarios(df, self.main_params, self.years, InputThermalColumns.STUDY_SCENARIO.value)
-        df = filter_based_on_commission_date(
-            df,
-            self.years,
-            InputThermalColumns.COMMISSIONING_DATE.value,
-            InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED.value,
+        pipeline = FilterPipeline(
+            [
+                op_stat_stage(self.op_stat_values, InputThermalColumns.OP_STAT),
+                declared_areas_stage(self.main_params, InputThermalColumns.MARKET_NODE),
+                self._declared_thermal_clusters_stage(),
+                study_scenarios_stage(self.main_params, self.years, InputThermalColumns.STUDY_SCENARIO),
+                commission_date_stage(
+                    self.years,
+                    InputThermalColumns.COMMISSIONING_DATE,
+                    InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED,
+                ),
+            ]
+        )
+        df = pipeline.apply(self._read_input_file())
+        df = convert_commission_dates(
+            df, InputThermalColumns.COMMISSIONING_DATE, InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED
         )
         df = self._add_antares_thermal_cluster_name_colum(df)
+        # The capacities are only known once the biomass clusters are split
         df = self._split_clusters_with_biomass_rule(df)
-        df = filter_based_on_net_max_gen_cap(df, InputThermalColumns.NET_MAX_GEN_CAP.value)
+        capacity_pipeline = FilterPipeline([net_max_gen_cap_stage(InputThermalColumns.NET_MAX_GEN_CAP)])
+        df = capacity_pipeline.apply(df)
+        self.filter_reports = pipeline.reports + capacity_pipeline.reports
         return add_code_antares_colum(self.main_params, df, InputThermalColumns.MARKET_NODE.value)
 
     def build_installed_power(self) -> None:
@@ -124,9 +152,15 @@ class ThermalParser:
         parser.build_thermal_installed_power(self.filtered_dataframe)
 
     def build_param_modulation(self) -> None:
-        parser = ThermalParamModulationParser(self.input_folder, self.output_folder, self.main_params, self.years)
-        parser.build_param_modulation(self.filtered_dataframe)
+        parser = ThermalParamModulationParser(
+            self.input_folder, self.output_folder, self.main_params, self.years, self.input_cache, self.max_workers
+        )
+        parser.build_param_modulation(self.filtered_dataframe, self.lifetime_index)
+        # Handed to the specific parameters, so that the capacity modulation files are not read again
+        self.capacity_modulation_minima = parser.capacity_modulation_minima
 
     def build_specific_param(self) -> None:
         parser = ThermalSpecificParamParser(self.output_folder, self.main_params, self.years)
-        parser.build_thermal_specific_param(self.filtered_dataframe)
+        parser.build_thermal_specific_param(
+            self.filtered_dataframe, self.lifetime_index, self.capacity_modulation_minima
+        )
@@ -13,29 +13,12 @@
 from enum import StrEnum
 from pathlib import Path
 
-import numpy as np
-import pandas as pd
+from antares.data_collection.thermal.constants import InputThermalColumns
 
 SPECIFIC_PARAM_FOLDER = Path("thermal") / "technical parameters"
 SPECIFIC_PARAM_NAME_FILE = "specific_param_PEMMDB.xlsx"
 
 
-def weighted_avg(df: pd.DataFrame, value_col: str, weight_col: str) -> float:
-    """
-    Compute weighted average for a given column from a Data Frame
-
-    Args:
-        df: Input pandas DataFrame containing the data.
-        value_col: Name of the column containing the values to average.
-        weight_col: Name of the column containing the weights associated
-            with each value.
-
-    Returns:
-        The weighted average as a float.
-    """
-    return float(np.average(df[value_col], weights=df[weight_col]))
-
-
 class OutputThermalSpecificColumns(StrEnum):
     NODE = "node"
     CLUSTER = "Cluster"
@@ -58,3 +41,33 @@ class OutputThermalSpecificColumns(StrEnum):
 F_COLUMNS = [f"F{i}" for i in range(1, 13)]
 P_COLUMNS = [f"P{i}" for i in range(1, 13)]
 P_COLUMNS_WINTER = [f"P{i}" for i in [1, 2, 3, 10, 11, 12]]
+
+MR_SPECIFIC_COLUMNS = [
+    InputThermalColumns.GRP_MRUN_CURVE_ID,
+    InputThermalColumns.GEN_UNT_MRUN_CURVE_ID,
+    InputThermalColumns.GEN_UNT_INELASTIC_ID,
+]
+CM_SPECIFIC_COLUMNS = [
+    InputThermalColumns.GEN_UNT_D_CURVE_ID,
+    InputThermalColumns.GRP_D_CURVE_ID,
+    InputThermalColumns.GEN_UNT_INELASTIC_ID,
+]
+
+# Output columns computed as averages of input columns weighted by `NET_MAX_GEN_CAP`
+WEIGHTED_AVERAGE_COLUMNS = {
+    OutputThermalSpecificColumns.EFFICIENCY: InputThermalColumns.STD_EFF_NCV,
+    OutputThermalSpecificColumns.FO_RATE: InputThermalColumns.FORCED_OUTAGE_RATE,
+    OutputThermalSpecificColumns.FO_DURATION: InputThermalColumns.MEAN_TIME_REPAIR,
+    OutputThermalSpecificColumns.PO_DURATION: InputThermalColumns.PLAN_OUTAGE_ANNUAL_DAYS,
+    OutputThermalSpecificColumns.PO_WINTER: InputThermalColumns.PLAN_OUTAGE_WINTER,
+}
+
+# Input columns filled with the `ClusterParams` attribute of the cluster when the value is missing
+COMMON_DATA_DEFAULT_COLUMNS = {
+    InputThermalColumns.STD_EFF_NCV: "efficiency_default",
+    InputThermalColumns.FORCED_OUTAGE_RATE: "fo_rate_default",
+    InputThermalColumns.MEAN_TIME_REPAIR: "fo_duration_default",
+    InputThermalColumns.PLAN_OUTAGE_ANNUAL_DAYS: "po_duration_default",
+    InputThermalColumns.PLAN_OUTAGE_WINTER: "po_winter_default",
+    InputThermalColumns.NET_MIN_STAB_GEN: "min_stable_generation_default",
+}
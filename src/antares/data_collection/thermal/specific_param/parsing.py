@@ -12,29 +12,35 @@
 from pathlib import Path
 from typing import Any, TypeAlias
 
+import numpy as np
 import pandas as pd
 
 from antares.data_collection.constants import ANTARES_CLUSTER_NAME_COLUMN, ANTARES_NODE_NAME_COLUMN, YearId
-from antares.data_collection.referential_data.main_params import MainParams
+from antares.data_collection.referential_data.main_params import MainParams, ReferentialSheetNames
 from antares.data_collection.thermal.constants import (
     BIOMASS_CLUSTER_SUFFIX,
     BIOMASS_SNCD_FUEL_VALUE,
     InputThermalColumns,
-    OutputModulationColumns,
 )
 from antares.data_collection.thermal.specific_param.constants import (
+    CM_SPECIFIC_COLUMNS,
+    COMMON_DATA_DEFAULT_COLUMNS,
     F_COLUMNS,
+    MR_SPECIFIC_COLUMNS,
     P_COLUMNS,
     P_COLUMNS_WINTER,
     SPECIFIC_PARAM_FOLDER,
     SPECIFIC_PARAM_NAME_FILE,
+    WEIGHTED_AVERAGE_COLUMNS,
     OutputThermalSpecificColumns,
-    weighted_avg,
 )
 from antares.data_collection.thermal.utils import (
+    CapacityModulationMinima,
     apply_round_to_numeric_columns,
+    compute_capacity_modulation_minima,
     get_path_capacity_modulation_file,
 )
+from antares.data_collection.utils import UnitLifetimeIndex
 
 ZoneId: TypeAlias = str
 ClusterId: TypeAlias = str
@@ -54,54 +60,32 @@ class ThermalSpecificParamParser:
         Additional rules:
             - NET_MIN_STAB_GEN: min_stable_generation_default*NET_MAX_GEN_CAP
         """
+        df = df.copy()
+        masks = {column: df[column].isna() for column in COMMON_DATA_DEFAULT_COLUMNS}
+        masks[InputThermalColumns.NET_MIN_STAB_GEN] |= df[InputThermalColumns.NET_MIN_STAB_GEN] == 0
+        rows_to_fill = pd.concat(masks, axis=1).any(axis=1)
+        if not rows_to_fill.any():
+            return df
 
-        # STD_EFF_NCV / efficiency_default
-        mask_std_eff_nvc = df[InputThermalColumns.STD_EFF_NCV].isna()
-        if mask_std_eff_nvc.any():
-            df = self._fill_from_common_data(
-                df, mask_std_eff_nvc, InputThermalColumns.STD_EFF_NCV, "efficiency_default"
-            )
-
-        # FORCED_OUTAGE_RATE / FO_rate_default
-        mask_forced_outage_rate = df[InputThermalColumns.FORCED_OUTAGE_RATE].isna()
-        if mask_forced_outage_rate.any():
-            df = self._fill_from_common_data(
-                df, mask_forced_outage_rate, InputThermalColumns.FORCED_OUTAGE_RATE, "fo_rate_default"
-            )
-
-        # MEAN_TIME_REPAIR / FO_duration_default
-        mask_mean_time_repair = df[InputThermalColumns.MEAN_TIME_REPAIR].isna()
-        if mask_mean_time_repair.any():
-            df = self._fill_from_common_data(
-                df, mask_mean_time_repair, InputThermalColumns.MEAN_TIME_REPAIR, "fo_duration_default"
-            )
-
-        # PLAN_OUTAGE_ANNUAL_DAYS / PO_duration_default
-        mask_plan_outage_annual_days = df[InputThermalColumns.PLAN_OUTAGE_ANNUAL_DAYS].isna()
-        if mask_plan_outage_annual_days.any():
-            df = self._fill_from_common_data(
-                df, mask_plan_outage_annual_days, InputThermalColumns.PLAN_OUTAGE_ANNUAL_DAYS, "po_duration_default"
+        # We have to handle `Bio` clusters as we don't have their mapping inside the `MainParams` class
+        clusters = df[ANTARES_CLUSTER_NAME_COLUMN].str.removesuffix(f" {BIOMASS_CLUSTER_SUFFIX}")
+        common_data = self.main_params.get_antares_clusters_common_data()
+        missing_clusters = clusters[rows_to_fill & ~clusters.isin(common_data.index)]
+        if not missing_clusters.empty:
+            raise ValueError(
+                f"Cluster {missing_clusters.iloc[0]} not found inside sheet {ReferentialSheetNames.COMMON_DATA}"
             )
 
-        # PLAN_OUTAGE_WINTER / PO_winter_default
-        mask_plan_outage_annual_win = df[InputThermalColumns.PLAN_OUTAGE_WINTER].isna()
-        if mask_plan_outage_annual_win.any():
-            df = self._fill_from_common_data(
-                df, mask_plan_outage_annual_win, InputThermalColumns.PLAN_OUTAGE_WINTER, "po_winter_default"
-            )
+        # Default values of every row, joined on the cluster name
+        defaults = common_data.reindex(clusters)
+        defaults.index = df.index
 
-        # NET_MIN_STAB_GEN / min_stable_generation_default
-        mask_net_min_stab_gen = (df[InputThermalColumns.NET_MIN_STAB_GEN].isna()) | (
-            df[InputThermalColumns.NET_MIN_STAB_GEN] == 0
-        )
-        if mask_net_min_stab_gen.any():
-            df = self._fill_from_common_data(
-                df, mask_net_min_stab_gen, InputThermalColumns.NET_MIN_STAB_GEN, "min_stable_generation_default"
-            )
-            # specific treatment
-            df.loc[mask_net_min_stab_gen, InputThermalColumns.NET_MIN_STAB_GEN] *= df[
-                InputThermalColumns.NET_MAX_GEN_CAP
-            ]
+        for column, attribute in COMMON_DATA_DEFAULT_COLUMNS.items():
+            default_values = defaults[attribute]
+            if column == InputThermalColumns.NET_MIN_STAB_GEN:
+                # specific treatment
+                default_values = default_values * df[InputThermalColumns.NET_MAX_GEN_CAP]
+            df[column] = df[column].mask(masks[column], default_values)
 
         return df
 
@@ -137,20 +121,6 @@ class ThermalSpecificParamParser:
 
         return df
 
-    def _fill_from_common_data(
-        self, dftofill: pd.DataFrame, mask: pd.Series, column: InputThermalColumns, attr: str
-    ) -> pd.DataFrame:
-        df_to_fill = dftofill.copy()
-        clusters = df_to_fill.loc[mask, ANTARES_CLUSTER_NAME_COLUMN].tolist()
-
-        # We have to handle `Bio` clusters as we don't have their mapping inside the `MainParams` class
-        clusters = [cluster.removesuffix(f" {BIOMASS_CLUSTER_SUFFIX}") for cluster in clusters]
-
-        values = [getattr(x, attr) for x in self.main_params.get_antares_clusters_common_data_params(clusters)]
-        df_to_fill.loc[mask, column] = values
-
-        return df_to_fill
-
     def _filter_columns_for_output_specific(self, df: pd.DataFrame) -> pd.DataFrame:
         """Only keep the input columns we need to create the output file."""
         expected_cols = [
@@ -175,143 +145,107 @@ class ThermalSpecificParamParser:
         return df[expected_cols]
 
     def _build_thermal_specific_pegase(
-        self, df: pd.DataFrame, df_cm_min_values: dict[YearId, dict[ZoneId, dict[ClusterId, MininalCapacityModulation]]]
+        self,
+        df: pd.DataFrame,
+        df_cm_min_values: dict[YearId, dict[ZoneId, dict[ClusterId, MininalCapacityModulation]]],
+        lifetime_index: UnitLifetimeIndex | None = None,
     ) -> pd.DataFrame:
-        years = self.years
-        years_date_format: dict[int, pd.Timestamp] = {year: pd.Timestamp(year=year, month=1, day=1) for year in years}
-
-        grouped_dfs = df.groupby([ANTARES_NODE_NAME_COLUMN, ANTARES_CLUSTER_NAME_COLUMN])
-
-        output_data: dict[str, list[Any]] = {
-            OutputThermalSpecificColumns.NODE: [],
-            OutputThermalSpecificColumns.CLUSTER: [],
-            "YEAR": [],
-            OutputThermalSpecificColumns.MIN_STABLE_GEN: [],
-            OutputThermalSpecificColumns.SPINNING: [],
-            OutputThermalSpecificColumns.EFFICIENCY: [],
-            OutputThermalSpecificColumns.FO_RATE: [],
-            OutputThermalSpecificColumns.FO_DURATION: [],
-            OutputThermalSpecificColumns.PO_DURATION: [],
-            OutputThermalSpecificColumns.PO_WINTER: [],
-            OutputThermalSpecificColumns.MARGINAL_COST: [],
-            OutputThermalSpecificColumns.MARKET_BID: [],
-            OutputThermalSpecificColumns.MR_SPECIFIC: [],
-            OutputThermalSpecificColumns.CM_SPECIFIC: [],
-            OutputThermalSpecificColumns.NPO_MAX_WINTER: [],
-            OutputThermalSpecificColumns.NPO_MAX_SUMMER: [],
-            OutputThermalSpecificColumns.NB_UNIT: [],
-            **{col: [] for col in F_COLUMNS},
-            **{col: [] for col in P_COLUMNS},
-        }
-
-        for (antares_node, cluster_name), grouped_df in grouped_dfs:
-            for year, year_date in years_date_format.items():
-                assert isinstance(antares_node, str)
-                assert isinstance(cluster_name, str)
-
-                mask = (grouped_df[InputThermalColumns.COMMISSIONING_DATE] <= year_date) & (
-                    grouped_df[InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED] >= year_date
-                )
-
-                active_units = grouped_df.loc[mask]
-                if active_units.empty:
-                    continue
-
-                # computations all indicators
-                nb_unit = active_units.shape[0]
-
-                cap = active_units[InputThermalColumns.NET_MAX_GEN_CAP]
-
-                ##
-                # special treatments for `min_stable_gen`
-                ##
-
-                # need to compare and keep min value with min of TS from capacity modulation file
-                min_stable = active_units[InputThermalColumns.NET_MIN_STAB_GEN].sum() / cap.sum()
-
-                # get min of TS capacity modulation
-                cm_min_value = df_cm_min_values[year].get(antares_node, {}).get(cluster_name)
-
-                if cm_min_value:
-                    min_stable = min(min_stable, cm_min_value)
-
-                efficiency = weighted_avg(
-                    active_units, InputThermalColumns.STD_EFF_NCV, InputThermalColumns.NET_MAX_GEN_CAP
-                )
-
-                fo_rate = weighted_avg(
-                    active_units, InputThermalColumns.FORCED_OUTAGE_RATE, InputThermalColumns.NET_MAX_GEN_CAP
-                )
-
-                fo_duration = weighted_avg(
-                    active_units, InputThermalColumns.MEAN_TIME_REPAIR, InputThermalColumns.NET_MAX_GEN_CAP
-                )
-
-                po_duration = weighted_avg(
-                    active_units, InputThermalColumns.PLAN_OUTAGE_ANNUAL_DAYS, InputThermalColumns.NET_MAX_GEN_CAP
-                )
-
-                po_winter = weighted_avg(
-                    active_units, InputThermalColumns.PLAN_OUTAGE_WINTER, InputThermalColumns.NET_MAX_GEN_CAP
-                )
-
-                mr_specific = int(
-                    (
-                        active_units[
-                            [
-                                "GRP_MRUN_CURVE_ID",
-                                "GEN_UNT_MRUN_CURVE_ID",
-                                "GEN_UNT_INELASTIC_ID",
-                            ]
-                        ]
-                        .notna()
-                        .any()
-                        .any()
-                    )
-                )
+        """
+        Computes the indicators of every (node, cluster) for every year in a single grouped aggregation.
 
-                cm_specific = int(
-                    active_units[
-                        [
-                            "GEN_UNT_D_CURVE_ID",
-                            "GRP_D_CURVE_ID",
-                            "GEN_UNT_INELASTIC_ID",
-                        ]
-                    ]
-                    .notna()
-                    .any()
-                    .any()
-                )
+        Each unit is repeated once per year it is active, with its capacity-weighted values computed beforehand:
+        the weighted averages, the number of units and the specific flags all come from the same `groupby`.
+        """
+        years = list(dict.fromkeys(self.years))
+        if lifetime_index is None or not lifetime_index.index.equals(df.index):
+            lifetime_index = UnitLifetimeIndex(
+                df, years, InputThermalColumns.COMMISSIONING_DATE, InputThermalColumns.DECOMMISSIONING_DATE_EXPECTED
+            )
+        active_years = np.column_stack(
+            [lifetime_index.get_active_mask(year).to_numpy() for year in years] or [np.zeros(len(df), dtype=bool)]
+        )
+        rows, year_positions = np.nonzero(active_years)
+
+        cap = df[InputThermalColumns.NET_MAX_GEN_CAP]
+        exploded_data: dict[str, Any] = {
+            OutputThermalSpecificColumns.NODE: df[ANTARES_NODE_NAME_COLUMN].to_numpy()[rows],
+            OutputThermalSpecificColumns.CLUSTER: df[ANTARES_CLUSTER_NAME_COLUMN].to_numpy()[rows],
+            "YEAR": np.array(years, dtype=np.int64)[year_positions],
+            InputThermalColumns.NET_MAX_GEN_CAP: cap.to_numpy()[rows],
+            InputThermalColumns.NET_MIN_STAB_GEN: df[InputThermalColumns.NET_MIN_STAB_GEN].to_numpy()[rows],
+            OutputThermalSpecificColumns.MR_SPECIFIC: df[MR_SPECIFIC_COLUMNS].notna().any(axis=1).to_numpy()[rows],
+            OutputThermalSpecificColumns.CM_SPECIFIC: df[CM_SPECIFIC_COLUMNS].notna().any(axis=1).to_numpy()[rows],
+        }
+        for output_col, input_col in WEIGHTED_AVERAGE_COLUMNS.items():
+            exploded_data[output_col] = (df[input_col] * cap).to_numpy()[rows]
+        exploded = pd.DataFrame(exploded_data)
+
+        aggregations: dict[str, tuple[str, str]] = {
+            "cap_sum": (InputThermalColumns.NET_MAX_GEN_CAP, "sum"),
+            "min_stab_sum": (InputThermalColumns.NET_MIN_STAB_GEN, "sum"),
+            OutputThermalSpecificColumns.NB_UNIT: (InputThermalColumns.NET_MAX_GEN_CAP, "size"),
+            OutputThermalSpecificColumns.MR_SPECIFIC: (OutputThermalSpecificColumns.MR_SPECIFIC, "max"),
+            OutputThermalSpecificColumns.CM_SPECIFIC: (OutputThermalSpecificColumns.CM_SPECIFIC, "max"),
+        }
+        for output_col in WEIGHTED_AVERAGE_COLUMNS:
+            aggregations[f"{output_col}_sum"] = (output_col, "sum")
+            # A missing value makes the weighted average missing
+            aggregations[f"{output_col}_count"] = (output_col, "count")
+        aggregated = exploded.groupby(
+            [OutputThermalSpecificColumns.NODE, OutputThermalSpecificColumns.CLUSTER, "YEAR"]
+        ).agg(**aggregations)
+
+        nb_unit = aggregated[OutputThermalSpecificColumns.NB_UNIT]
+        cap_sum = aggregated["cap_sum"]
+        averages: dict[str, pd.Series] = {
+            output_col: (aggregated[f"{output_col}_sum"] / cap_sum).where(aggregated[f"{output_col}_count"] == nb_unit)
+            for output_col in WEIGHTED_AVERAGE_COLUMNS
+        }
 
-                # ---- store result ----
-                output_data[OutputThermalSpecificColumns.NODE].append(antares_node)
-                output_data[OutputThermalSpecificColumns.CLUSTER].append(cluster_name)
-                output_data["YEAR"].append(year)
-
-                output_data[OutputThermalSpecificColumns.MIN_STABLE_GEN].append(min_stable)
-                output_data[OutputThermalSpecificColumns.SPINNING].append(0)
-                output_data[OutputThermalSpecificColumns.EFFICIENCY].append(efficiency)
-                output_data[OutputThermalSpecificColumns.FO_RATE].append(fo_rate)
-                output_data[OutputThermalSpecificColumns.FO_DURATION].append(fo_duration)
-                output_data[OutputThermalSpecificColumns.PO_DURATION].append(po_duration)
-                output_data[OutputThermalSpecificColumns.PO_WINTER].append(po_winter)
-                output_data[OutputThermalSpecificColumns.MARGINAL_COST].append(pd.NA)
-                output_data[OutputThermalSpecificColumns.MARKET_BID].append(pd.NA)
-                output_data[OutputThermalSpecificColumns.MR_SPECIFIC].append(mr_specific)
-                output_data[OutputThermalSpecificColumns.CM_SPECIFIC].append(cm_specific)
-                output_data[OutputThermalSpecificColumns.NPO_MAX_WINTER].append(0)
-                output_data[OutputThermalSpecificColumns.NPO_MAX_SUMMER].append(0)
-                output_data[OutputThermalSpecificColumns.NB_UNIT].append(nb_unit)
-                for col in F_COLUMNS:
-                    output_data[col].append(fo_rate)
-                # winter
-                for col in P_COLUMNS:
-                    if col in P_COLUMNS_WINTER:
-                        output_data[col].append((po_duration / 182) * po_winter)
-                    else:
-                        output_data[col].append((po_duration / 183) * (1 - po_winter))
-
-        return pd.DataFrame(output_data)
+        ##
+        # special treatments for `min_stable_gen`
+        ##
+
+        # need to compare and keep min value with the (non-zero) min of TS from capacity modulation file
+        min_stable = aggregated["min_stab_sum"] / cap_sum
+        cm_min_values_by_key = {
+            (antares_node, cluster_name, year): cm_min_value
+            for year in years
+            for antares_node, clusters in df_cm_min_values[year].items()
+            for cluster_name, cm_min_value in clusters.items()
+        }
+        cm_min_values = pd.Series(
+            list(cm_min_values_by_key.values()),
+            index=pd.MultiIndex.from_tuples(list(cm_min_values_by_key), names=aggregated.index.names),
+            dtype=float,
+        ).reindex(aggregated.index)
+        min_stable = min_stable.mask((cm_min_values != 0) & (cm_min_values < min_stable), cm_min_values)
+
+        output_data: dict[str, Any] = {
+            OutputThermalSpecificColumns.MIN_STABLE_GEN: min_stable,
+            OutputThermalSpecificColumns.SPINNING: 0,
+            **averages,
+            OutputThermalSpecificColumns.MARGINAL_COST: pd.Series(pd.NA, index=aggregated.index, dtype=object),
+            OutputThermalSpecificColumns.MARKET_BID: pd.Series(pd.NA, index=aggregated.index, dtype=object),
+            OutputThermalSpecificColumns.MR_SPECIFIC: aggregated[OutputThermalSpecificColumns.MR_SPECIFIC].astype(int),
+            OutputThermalSpecificColumns.CM_SPECIFIC: aggregated[OutputThermalSpecificColumns.CM_SPECIFIC].astype(int),
+            OutputThermalSpecificColumns.NPO_MAX_WINTER: 0,
+            OutputThermalSpecificColumns.NPO_MAX_SUMMER: 0,
+            OutputThermalSpecificColumns.NB_UNIT: nb_unit,
+        }
+        fo_rate = averages[OutputThermalSpecificColumns.FO_RATE]
+        po_duration = averages[OutputThermalSpecificColumns.PO_DURATION]
+        po_winter = averages[OutputThermalSpecificColumns.PO_WINTER]
+        for col in F_COLUMNS:
+            output_data[col] = fo_rate
+        # winter
+        for col in P_COLUMNS:
+            if col in P_COLUMNS_WINTER:
+                output_data[col] = (po_duration / 182) * po_winter
+            else:
+                output_data[col] = (po_duration / 183) * (1 - po_winter)
+
+        return pd.DataFrame(output_data, index=aggregated.index).reset_index()
 
     def _export_specific_param_dataframe(self, df: pd.DataFrame) -> None:
         parent_dir = self.output_folder / SPECIFIC_PARAM_FOLDER
@@ -331,56 +265,50 @@ class ThermalSpecificParamParser:
                 year_df.to_excel(writer, sheet_name=sheet_name, index=False)
 
     def _parse_capacity_ts_modulation_file(
-        self,
+        self, capacity_modulation_minima: dict[YearId, CapacityModulationMinima] | None = None
     ) -> dict[YearId, dict[ZoneId, dict[ClusterId, MininalCapacityModulation]]]:
         """Parse the time series capacity modulation file.
 
-        - Compute min value for every time series"""
+        - Compute min value for every time series
+        - The minima already computed while writing the files (`capacity_modulation_minima`) are used as is"""
         years = self.years
+        capacity_modulation_minima = capacity_modulation_minima or {}
 
         result: dict[YearId, dict[ZoneId, dict[ClusterId, MininalCapacityModulation]]] = {}
         for year in years:
+            if year in capacity_modulation_minima:
+                result[year] = capacity_modulation_minima[year]
+                continue
+
             cm_path_file = get_path_capacity_modulation_file(year, self.output_folder)
             if not cm_path_file.exists():
                 raise FileNotFoundError(
                     f"Capacity modulation file not found to compute minimal values of time series: {cm_path_file}"
                 )
 
-            # read file
-            df_year = pd.read_csv(cm_path_file)
-
-            # compute min of TS
-            excluded_cols = [OutputModulationColumns.DATE.value]
-            dict_zone_cluster_min = self._compute_min_of_ts_modulation_year(df_year, excluded_cols)
-
-            result[year] = dict_zone_cluster_min
+            # read file and compute min of TS
+            result[year] = compute_capacity_modulation_minima(pd.read_csv(cm_path_file))
 
         return result
 
-    def _compute_min_of_ts_modulation_year(
-        self, df: pd.DataFrame, excluded_cols: list[str]
-    ) -> dict[ZoneId, dict[ClusterId, MininalCapacityModulation]]:
-        """Return a dictionary of miniaml value from time series files structured by area/cluster."""
-        result: dict[ZoneId, dict[ClusterId, MininalCapacityModulation]] = {}
-
-        cols = df.columns.difference(excluded_cols)
-
-        for col in cols:
-            min_val = df[col].min()
-            zone_id, cluster_id = col.split("_")
-            result.setdefault(zone_id, {})[cluster_id] = min_val
-
-        return result
-
-    def build_thermal_specific_param(self, df: pd.DataFrame) -> None:
+    def build_thermal_specific_param(
+        self,
+        df: pd.DataFrame,
+        lifetime_index: UnitLifetimeIndex | None = None,
+        capacity_modulation_minima: dict[YearId, CapacityModulationMinima] | None = None,
+    ) -> None:
+        """
+        If the capacity modulation files were just built by the same process, `capacity_modulation_minima` should be
+        given so that they are not read again.
+        """
         df = self._update_existing_columns_with_commondata(df)
         df = self._update_column_net_min_stab_gen(df)
 
         # use TS modulation file to compute min of TS
-        dict_of_cm_min_value = self._parse_capacity_ts_modulation_file()
+        dict_of_cm_min_value = self._parse_capacity_ts_modulation_file(capacity_modulation_minima)
 
         df = self._filter_columns_for_output_specific(df)
-        df = self._build_thermal_specific_pegase(df, dict_of_cm_min_value)
+        df = self._build_thermal_specific_pegase(df, dict_of_cm_min_value, lifetime_index)
         df = apply_round_to_numeric_columns(
             df, [OutputThermalSpecificColumns.FO_DURATION, OutputThermalSpecificColumns.PO_DURATION]
         )
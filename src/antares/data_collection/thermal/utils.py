@@ -11,11 +11,16 @@
 # This file is part of the Antares project.
 
 from pathlib import Path
+from typing import TypeAlias
 
 import pandas as pd
 
+from antares.data_collection.thermal.constants import OutputModulationColumns
 from antares.data_collection.thermal.param_modulation.constants import CAPACITY_MODULATION_NAME, TECHNICAL_PARAMS_FOLDER
 
+# Minimal value of every capacity modulation time series, by Antares zone and cluster
+CapacityModulationMinima: TypeAlias = dict[str, dict[str, float]]
+
 
 def get_path_capacity_modulation_file(year: int, root_export_folder: Path) -> Path:
     name_file = f"{CAPACITY_MODULATION_NAME}_{year - 1}-{year}.csv"
@@ -23,6 +28,20 @@ def get_path_capacity_modulation_file(year: int, root_export_folder: Path) -> Pa
     return full_path_file
 
 
+def compute_capacity_modulation_minima(df: pd.DataFrame, decimals: int | None = None) -> CapacityModulationMinima:
+    """
+    Returns the minimal value of each `<zone>_<cluster>` time series of a capacity modulation DataFrame.
+
+    If the DataFrame is written with `decimals` digits, the minima are rounded the same way to match the file content.
+    """
+    result: CapacityModulationMinima = {}
+    minima = df.drop(columns=OutputModulationColumns.DATE.value).min()
+    for col, min_val in minima.items():
+        zone_id, cluster_id = str(col).split("_")
+        result.setdefault(zone_id, {})[cluster_id] = min_val if decimals is None else round(float(min_val), decimals)
+    return result
+
+
 def get_starting_and_ending_timestamps_for_outputs(year: int) -> tuple[pd.Timestamp, pd.Timestamp]:
     """
     Implicit rule: For a given year, we have to consider the year starts in July of the previous year
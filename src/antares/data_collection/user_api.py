@@ -10,6 +10,7 @@
 #
 # This file is part of the Antares project.
 from pathlib import Path
+from typing import Callable
 
 from antares.data_collection.batteries.constants import (
     EFFICIENCY_INJECTION,
@@ -19,48 +20,126 @@ from antares.data_collection.batteries.constants import (
     PEMMDB_PLANT_TYPE_RESIDENTIAL,
 )
 from antares.data_collection.batteries.parsing import BatteriesParser
+from antares.data_collection.constants import DEFAULT_CACHE_MAX_SIZE
 from antares.data_collection.dsr.parsing import DsrParser
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.links.constants import FILL_FOR_VALUES
 from antares.data_collection.links.parsing import LinksParser
 from antares.data_collection.misc.parsing import MiscParser
 from antares.data_collection.referential_data.main_params import parse_main_params
+from antares.data_collection.referential_data.missing_mappings import MissingMappingsReport
 from antares.data_collection.thermal.parsing import ThermalParser
 
 
 class PEMMDBConverter:
-    def __init__(self, input_folder: Path, output_folder: Path, main_params_path: Path, years: list[int]) -> None:
+    def __init__(
+        self,
+        input_folder: Path,
+        output_folder: Path,
+        main_params_path: Path,
+        years: list[int],
+        cache_folder: Path | None = None,
+        cache_max_size: int = DEFAULT_CACHE_MAX_SIZE,
+        max_workers: int | None = None,
+    ) -> None:
+        """
+        If `cache_folder` is given, the parsed input files and referential are stored inside it and re-used on the
+        next runs as long as the input files are unchanged. The cache is limited to `cache_max_size` bytes.
+
+        If `max_workers` is greater than 1, the thermal modulation files of the different years are built in
+        parallel by a pool of `max_workers` processes.
+        """
         self._input_folder = input_folder
         self._output_folder = output_folder
-        self._main_params = parse_main_params(main_params_path)
+        self._input_cache = InputFileCache(cache_folder, cache_max_size) if cache_folder else None
+        self._main_params = parse_main_params(main_params_path, self._input_cache)
         self._years = years
+        self._max_workers = max_workers
+
+    def _run_build(self, build: Callable[[], None]) -> MissingMappingsReport:
+        """
+        Runs `build` and returns the values it could not find inside MAIN_PARAMS.xlsx, after logging them.
+        They are reset even if the build fails, so that they are not reported by the next one.
+        """
+        try:
+            build()
+        finally:
+            report = self._main_params.pop_missing_mappings_report()
+        report.log()
+        return report
+
+    def build_thermal_files(self, op_stat_values: list[str]) -> MissingMappingsReport:
+        def build() -> None:
+            parser = ThermalParser(
+                self._input_folder,
+                self._output_folder,
+                op_stat_values,
+                self._main_params,
+                self._years,
+                self._input_cache,
+                self._max_workers,
+            )
+            parser.build_installed_power()
+            parser.build_param_modulation()
+            parser.build_specific_param()
+
+        return self._run_build(build)
+
+    def build_dsr_files(
+        self, op_stat_values: list[str], dsr_type_values: list[str], act_price_da: list[int]
+    ) -> MissingMappingsReport:
+        def build() -> None:
+            parser = DsrParser(
+                self._input_folder,
+                self._output_folder,
+                op_stat_values,
+                dsr_type_values,
+                act_price_da,
+                self._main_params,
+                self._years,
+                self._input_cache,
+            )
+            parser.build_dsr_cluster_part()
+            parser.build_dsr_capacity_modulation_part()
 
-    def build_thermal_files(self, op_stat_values: list[str]) -> None:
-        parser = ThermalParser(self._input_folder, self._output_folder, op_stat_values, self._main_params, self._years)
-        parser.build_installed_power()
-        parser.build_param_modulation()
-        parser.build_specific_param()
-
-    def build_dsr_files(self, op_stat_values: list[str], dsr_type_values: list[str], act_price_da: list[int]) -> None:
-        parser = DsrParser(
-            self._input_folder,
-            self._output_folder,
-            op_stat_values,
-            dsr_type_values,
-            act_price_da,
-            self._main_params,
-            self._years,
-        )
-        parser.build_dsr_cluster_part()
-        parser.build_dsr_capacity_modulation_part()
-
-    def build_misc_files(self, op_stat_values: list[str]) -> None:
-        parser = MiscParser(self._input_folder, self._output_folder, op_stat_values, self._main_params, self._years)
-        parser.build_misc_installed_power_part()
-        parser.build_misc_load_factor_part()
-
-    def build_link_files(self, for_limit_value: float = FILL_FOR_VALUES) -> None:
-        parser = LinksParser(self._input_folder, self._output_folder, self._main_params, self._years, for_limit_value)
-        parser.build_links()
+        return self._run_build(build)
+
+    def build_misc_files(self, op_stat_values: list[str]) -> MissingMappingsReport:
+        def build() -> None:
+            parser = MiscParser(
+                self._input_folder,
+                self._output_folder,
+                op_stat_values,
+                self._main_params,
+                self._years,
+                self._input_cache,
+            )
+            parser.build_misc_installed_power_part()
+            parser.build_misc_load_factor_part()
+
+        return self._run_build(build)
+
+    def build_link_files(
+        self, for_limit_value: float = FILL_FOR_VALUES, median_tolerance: float | None = None
+    ) -> MissingMappingsReport:
+        """
+        The NTC medians are exact by default. With a `median_tolerance`, they are approximated within
+        `median_tolerance / 2` while reading the NTC file by chunks, for files with many rows.
+        """
+
+        def build() -> None:
+            parser = LinksParser(
+                self._input_folder,
+                self._output_folder,
+                self._main_params,
+                self._years,
+                for_limit_value,
+                self._input_cache,
+                median_tolerance,
+            )
+            parser.build_links()
+
+        return self._run_build(build)
 
     def build_batteries_files(
         self,
@@ -69,16 +148,20 @@ class PEMMDBConverter:
         pemmdb_plant_type_residential: list[str] = PEMMDB_PLANT_TYPE_RESIDENTIAL,
         op_stat_residential: list[str] = OP_STAT_RESIDENTIAL,
         efficiency_injection: float = EFFICIENCY_INJECTION,
-    ) -> None:
-        parser = BatteriesParser(
-            self._input_folder,
-            self._output_folder,
-            self._main_params,
-            self._years,
-            pemmdb_plant_type_market,
-            op_stat_market,
-            pemmdb_plant_type_residential,
-            op_stat_residential,
-            efficiency_injection,
-        )
-        parser.build_batteries()
+    ) -> MissingMappingsReport:
+        def build() -> None:
+            parser = BatteriesParser(
+                self._input_folder,
+                self._output_folder,
+                self._main_params,
+                self._years,
+                pemmdb_plant_type_market,
+                op_stat_market,
+                pemmdb_plant_type_residential,
+                op_stat_residential,
+                efficiency_injection,
+                self._input_cache,
+            )
+            parser.build_batteries()
+
+        return self._run_build(build)
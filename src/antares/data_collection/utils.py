@@ -13,8 +13,10 @@ import calendar
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Iterable, Iterator, Mapping
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import polars as pl
 import xlsxwriter  # type: ignore[import-untyped]
@@ -23,7 +25,11 @@ from antares.data_collection.constants import (
     ANTARES_NODE_NAME_COLUMN,
     DEFAULT_DECOMMISSIONING_DATE,
     MAX_DECIMAL_DIGITS,
+    SCENARIO_TO_ALWAYS_CONSIDER,
+    STUDY_SCENARIO_SEPARATOR,
 )
+from antares.data_collection.filter_pipeline import FilterPipeline, FilterStage
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.referential_data.main_params import MainParams
 
 
@@ -33,15 +39,20 @@ def write_csv_file(file_path: Path, df: pd.DataFrame) -> None:
     polars_df.write_csv(file_path, separator=",", float_precision=MAX_DECIMAL_DIGITS)
 
 
-def filter_based_on_op_stat(filter_op_stat_values: list[str], df: pd.DataFrame, column_name: str) -> pd.DataFrame:
+def op_stat_stage(filter_op_stat_values: list[str], column_name: str) -> FilterStage:
     """We want to keep only the lines were the OP_STAT value matches the user given ones"""
-    if not filter_op_stat_values:
-        return df
-    df = df[df[column_name].isin(filter_op_stat_values)]
-    if df.empty:
-        # We want to raise as soon as possible to have a clear error msg
-        raise ValueError(f"The given op_stat values {filter_op_stat_values} are not present in the dataframe")
-    return df
+
+    def build_mask(df: pd.DataFrame) -> pd.Series | None:
+        if not filter_op_stat_values:
+            return None
+        return df[column_name].isin(filter_op_stat_values)
+
+    msg = f"The given op_stat values {filter_op_stat_values} are not present in the dataframe"
+    return FilterStage("op_stat", build_mask, msg)
+
+
+def filter_based_on_op_stat(filter_op_stat_values: list[str], df: pd.DataFrame, column_name: str) -> pd.DataFrame:
+    return FilterPipeline([op_stat_stage(filter_op_stat_values, column_name)]).apply(df)
 
 
 @dataclass(frozen=True)
@@ -63,114 +74,259 @@ def get_starting_and_ending_timestamps(years: list[int]) -> Iterator[Commissioni
         )
 
 
-def filter_based_on_commission_date(
+def _parse_commission_dates(
     df: pd.DataFrame,
-    years: list[int],
     commissioning_name_column: str,
     decommissioning_name_column: str,
-    default_decommissioning_date: pd.Timestamp = DEFAULT_DECOMMISSIONING_DATE,
-) -> pd.DataFrame:
-    if not years:
-        return df
-
+    default_decommissioning_date: pd.Timestamp,
+) -> dict[str, pd.Series]:
     for column in [commissioning_name_column, decommissioning_name_column]:
         if column not in df.columns:
             raise ValueError(f"Column {column} not found in the dataframe")
 
-    # Dates objects are stored as Strings for the moment, we have to change this to perform checks.
-    df[commissioning_name_column] = pd.to_datetime(df[commissioning_name_column])
+    return {
+        # Dates objects are stored as Strings for the moment, we have to change this to perform checks.
+        commissioning_name_column: pd.to_datetime(df[commissioning_name_column]),
+        # Some values might be missing inside `decommissioning_name_column`.
+        # If so, we should consider the decommissioning year to be 2100.
+        decommissioning_name_column: pd.to_datetime(df[decommissioning_name_column]).fillna(
+            value=default_decommissioning_date
+        ),
+    }
+
 
-    # Some values might be missing inside `decommissioning_name_column`.
-    # If so, we should consider the decommissioning year to be 2100.
-    df[decommissioning_name_column] = pd.to_datetime(df[decommissioning_name_column]).fillna(
-        value=default_decommissioning_date
+def convert_commission_dates(
+    df: pd.DataFrame,
+    commissioning_name_column: str,
+    decommissioning_name_column: str,
+    default_decommissioning_date: pd.Timestamp = DEFAULT_DECOMMISSIONING_DATE,
+) -> pd.DataFrame:
+    """Returns a copy of `df` with its (de)commissioning date columns converted to timestamps."""
+    dates = _parse_commission_dates(
+        df, commissioning_name_column, decommissioning_name_column, default_decommissioning_date
     )
+    return df.assign(**dates)
 
-    # Reindex the dataframe to use Series freely
-    df.index = pd.RangeIndex(len(df))
-
-    commissioning_limits = list(get_starting_and_ending_timestamps(years))
-    start_dates = df[commissioning_name_column]
-    end_dates = df[decommissioning_name_column]
-    index_to_drop = []
-    for k in range(len(df)):
-        start_date = start_dates[k]
-        end_date = end_dates[k]
-        invalid_limits = 0
-        for limit in commissioning_limits:
-            if (
-                start_date > limit.last_possible_commissioning_date
-                or end_date < limit.earliest_possible_decommissioning_date
-            ):
-                invalid_limits += 1
 
-        # If no year matches the commissioning dates, we don't want to consider the row.
-        if invalid_limits == len(commissioning_limits):
-            index_to_drop.append(k)
+def commission_date_stage(
+    years: list[int],
+    commissioning_name_column: str,
+    decommissioning_name_column: str,
+    default_decommissioning_date: pd.Timestamp = DEFAULT_DECOMMISSIONING_DATE,
+) -> FilterStage:
+    """
+    Only keeps the units that are commissioned during at least one of the given years.
+    The date columns are left as is: see `convert_commission_dates` to convert them once the rows are filtered.
+    """
 
-    df = df.drop(index_to_drop)
+    def build_mask(df: pd.DataFrame) -> pd.Series | None:
+        if not years:
+            return None
 
-    if df.empty:
-        # We want to raise as soon as possible to have a clear error msg
-        msg = f"No input data matched the given (de)commissioning dates for the given years {years}"
-        raise ValueError(msg)
-    return df
+        dates = _parse_commission_dates(
+            df, commissioning_name_column, decommissioning_name_column, default_decommissioning_date
+        )
+
+        commissioning_limits = list(get_starting_and_ending_timestamps(years))
+        last_commissioning_dates = np.array(
+            [limit.last_possible_commissioning_date for limit in commissioning_limits], dtype="datetime64[ns]"
+        )
+        earliest_decommissioning_dates = np.array(
+            [limit.earliest_possible_decommissioning_date for limit in commissioning_limits], dtype="datetime64[ns]"
+        )
 
+        # (rows, years) matrix telling if the row is out of the commissioning window of the year
+        start_dates = dates[commissioning_name_column].to_numpy()[:, np.newaxis]
+        end_dates = dates[decommissioning_name_column].to_numpy()[:, np.newaxis]
+        invalid_limits = (start_dates > last_commissioning_dates) | (end_dates < earliest_decommissioning_dates)
 
-def filter_based_on_study_scenarios(
-    df: pd.DataFrame, main_params: MainParams, years: list[int], study_scenario_name_column: str
+        # If no year matches the commissioning dates, we don't want to consider the row.
+        return pd.Series(~invalid_limits.all(axis=1), index=df.index)
+
+    msg = f"No input data matched the given (de)commissioning dates for the given years {years}"
+    return FilterStage("commission_date", build_mask, msg)
+
+
+def filter_based_on_commission_date(
+    df: pd.DataFrame,
+    years: list[int],
+    commissioning_name_column: str,
+    decommissioning_name_column: str,
+    default_decommissioning_date: pd.Timestamp = DEFAULT_DECOMMISSIONING_DATE,
 ) -> pd.DataFrame:
+    stage = commission_date_stage(
+        years, commissioning_name_column, decommissioning_name_column, default_decommissioning_date
+    )
+    df = FilterPipeline([stage]).apply(df)
+    return convert_commission_dates(
+        df, commissioning_name_column, decommissioning_name_column, default_decommissioning_date
+    )
+
+
+class StudyScenarioIndex:
+    """
+    Factorizes a study scenario column (e.g. `ERAA&TYNDP`) once, so that its rows can then be matched against
+    several scenario types with a lookup on the scenario codes instead of a scan of the strings.
+    A row matches if one of its `&` separated scenarios is exactly one of the wanted ones (case-insensitive).
+    """
+
+    def __init__(self, study_scenarios: pd.Series):
+        self.index = study_scenarios.index
+        # Missing values are given the code -1
+        self._codes, uniques = pd.factorize(study_scenarios)
+        self._scenarios = [
+            frozenset(scenario.strip().upper() for scenario in str(value).split(STUDY_SCENARIO_SEPARATOR))
+            for value in uniques
+        ]
+
+    def get_mask(self, scenario_types: Iterable[str]) -> pd.Series:
+        wanted_scenarios = {scenario_type.upper() for scenario_type in scenario_types}
+        # The last element is the one of the missing values
+        matching_codes = np.array([bool(scenarios & wanted_scenarios) for scenarios in self._scenarios] + [False])
+        return pd.Series(matching_codes[self._codes], index=self.index)
+
+
+def study_scenarios_stage(
+    main_params: MainParams,
+    years: list[int],
+    study_scenario_name_column: str,
+    scenario_index: StudyScenarioIndex | None = None,
+) -> FilterStage:
     """
     Using MainParams and the user given years, we retrieve the study scenarios we have to consider.
     Other scenarios present in the input file will be ignored.
+    A `scenario_index` built on the filtered DataFrame can be given to filter it for several years.
     """
-    scenario_types = list(main_params.get_scenario_types(years=years))
 
-    if not scenario_types:
-        return df
+    def build_mask(df: pd.DataFrame) -> pd.Series | None:
+        scenario_types = main_params.get_scenario_types(years=years)
 
-    if study_scenario_name_column not in df.columns:
-        raise ValueError(f"Column {study_scenario_name_column} not found in the dataframe")
+        if not scenario_types:
+            return None
 
-    df = df[df[study_scenario_name_column].str.contains("|".join(scenario_types), case=False, na=False)]
-    if df.empty:
-        # We want to raise as soon as possible to have a clear error msg
-        raise ValueError(f"No input data matched the given study scenario for the given years {years}")
-    return df
+        if study_scenario_name_column not in df.columns:
+            raise ValueError(f"Column {study_scenario_name_column} not found in the dataframe")
 
+        index = scenario_index or StudyScenarioIndex(df[study_scenario_name_column])
+        return index.get_mask(scenario_types)
 
-def filter_non_declared_areas(main_params: MainParams, df: pd.DataFrame, market_node_name_column: str) -> pd.DataFrame:
+    msg = f"No input data matched the given study scenario for the given years {years}"
+    return FilterStage("study_scenarios", build_mask, msg)
+
+
+def filter_based_on_study_scenarios(
+    df: pd.DataFrame,
+    main_params: MainParams,
+    years: list[int],
+    study_scenario_name_column: str,
+    scenario_index: StudyScenarioIndex | None = None,
+) -> pd.DataFrame:
+    stage = study_scenarios_stage(main_params, years, study_scenario_name_column, scenario_index)
+    return FilterPipeline([stage]).apply(df)
+
+
+def declared_areas_stage(main_params: MainParams, market_node_name_column: str) -> FilterStage:
     """
     Some nodes are not inside RTE study perimeter and therefore not registered inside the main parameters file.
     We don't want to consider them.
-    We simply log a message for each area we find in this case
+    They are reported by `MainParams` as missing mappings.
     """
-    if market_node_name_column not in df.columns:
-        raise ValueError(f"Column {market_node_name_column} not found in the dataframe")
-
-    all_market_nodes = set(df[market_node_name_column])
-    missing_nodes = []
-    for node in all_market_nodes:
-        antares_code = main_params.get_antares_code(node)
-        if not antares_code:
-            missing_nodes.append(node)
-
-    if missing_nodes:
-        return df[~df[market_node_name_column].isin(missing_nodes)]
-    return df
 
+    def build_mask(df: pd.DataFrame) -> pd.Series:
+        if market_node_name_column not in df.columns:
+            raise ValueError(f"Column {market_node_name_column} not found in the dataframe")
+        _, missing_mask = main_params.map_antares_codes(df[market_node_name_column])
+        return ~missing_mask
 
-def filter_based_on_net_max_gen_cap(df: pd.DataFrame, net_max_gen_cap_name_column: str) -> pd.DataFrame:
+    return FilterStage(f"declared_areas ({market_node_name_column})", build_mask)
+
+
+def filter_non_declared_areas(main_params: MainParams, df: pd.DataFrame, market_node_name_column: str) -> pd.DataFrame:
+    return FilterPipeline([declared_areas_stage(main_params, market_node_name_column)]).apply(df)
+
+
+def net_max_gen_cap_stage(net_max_gen_cap_name_column: str) -> FilterStage:
     """We do not consider clusters with a `NET_MAX_GEN_CAP` of 0."""
-    if net_max_gen_cap_name_column not in df.columns:
-        raise ValueError(f"Column {net_max_gen_cap_name_column} not found in the dataframe")
-    return df.loc[df[net_max_gen_cap_name_column] > 0]
+
+    def build_mask(df: pd.DataFrame) -> pd.Series:
+        if net_max_gen_cap_name_column not in df.columns:
+            raise ValueError(f"Column {net_max_gen_cap_name_column} not found in the dataframe")
+        return df[net_max_gen_cap_name_column] > 0
+
+    return FilterStage(f"net_max_gen_cap ({net_max_gen_cap_name_column})", build_mask)
+
+
+def filter_based_on_net_max_gen_cap(df: pd.DataFrame, net_max_gen_cap_name_column: str) -> pd.DataFrame:
+    return FilterPipeline([net_max_gen_cap_stage(net_max_gen_cap_name_column)]).apply(df)
+
+
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+
+
+class UnitLifetimeIndex:
+    """
+    Lifetimes of the units of a filtered DataFrame, computed once and shared by all the per-year filters.
+
+    The (de)commissioning dates are stored as int64 day numbers, and each row gets a bitmask of the given
+    `years` during which it is active, i.e. commissioned on the 1st January of the year.
+    """
+
+    def __init__(
+        self, df: pd.DataFrame, years: list[int], commissioning_name_column: str, decommissioning_name_column: str
+    ):
+        self.index = df.index
+        self._year_bits = {year: k for k, year in enumerate(years)}
+
+        # `start <= 1st January` <=> `ceil(start) <= 1st January` as the 1st January is at midnight (floor for `end`)
+        start_dates = df[commissioning_name_column].to_numpy(dtype="datetime64[ns]")
+        end_dates = df[decommissioning_name_column].to_numpy(dtype="datetime64[ns]")
+        self._start_days = -(-start_dates.view(np.int64) // NANOSECONDS_PER_DAY)
+        self._end_days = end_dates.view(np.int64) // NANOSECONDS_PER_DAY
+        # Units with a missing date are never active
+        self._start_days[np.isnat(start_dates)] = np.iinfo(np.int64).max
+        self._end_days[np.isnat(end_dates)] = np.iinfo(np.int64).min
+
+        active_years = np.column_stack([self._compute_active_rows(year) for year in years] or [self._no_rows()])
+        self._active_years_bitmask = np.packbits(active_years, axis=1, bitorder="little")
+
+    def _no_rows(self) -> npt.NDArray[np.bool_]:
+        return np.zeros(len(self.index), dtype=bool)
+
+    def _compute_active_rows(self, year: int) -> npt.NDArray[np.bool_]:
+        first_day = np.datetime64(f"{year}-01-01", "D").astype(np.int64)
+        active_rows: npt.NDArray[np.bool_] = (self._start_days <= first_day) & (self._end_days >= first_day)
+        return active_rows
+
+    def get_active_mask(self, year: int) -> pd.Series:
+        """Returns the rows that are active on the 1st January of `year`."""
+        bit = self._year_bits.get(year)
+        if bit is None:
+            return pd.Series(self._compute_active_rows(year), index=self.index)
+        active_rows = (self._active_years_bitmask[:, bit >> 3] >> (bit & 7)) & 1
+        return pd.Series(active_rows.astype(bool), index=self.index)
+
+    def select(self, df: pd.DataFrame, year: int) -> pd.DataFrame:
+        """Only keeps the rows of `df` (the indexed DataFrame or a subset of it) that are active during `year`."""
+        mask = self.get_active_mask(year)
+        if not df.index.equals(self.index):
+            mask = mask.reindex(df.index)
+        return df.loc[mask]
 
 
 def filter_out_based_on_year(
-    df: pd.DataFrame, year: int, commissioning_name_column: str, decommissioning_name_column: str
+    df: pd.DataFrame,
+    year: int,
+    commissioning_name_column: str,
+    decommissioning_name_column: str,
+    lifetime_index: UnitLifetimeIndex | None = None,
 ) -> pd.DataFrame:
-    """This function only keeps rows where the unit is commissioned on the 1st January of the given year."""
+    """
+    This function only keeps rows where the unit is commissioned on the 1st January of the given year.
+    If `df` is filtered for several years, the `lifetime_index` of the DataFrame should be given.
+    """
+    if lifetime_index is not None:
+        return lifetime_index.select(df, year)
+
     date = pd.Timestamp(year=year, month=1, day=1)
     mask = (df[commissioning_name_column] <= date) & (df[decommissioning_name_column] >= date)
 
@@ -178,23 +334,40 @@ def filter_out_based_on_year(
 
 
 def add_code_antares_colum(main_params: MainParams, df: pd.DataFrame, market_node_name_column: str) -> pd.DataFrame:
-    node_list = df[market_node_name_column].tolist()
-    df[ANTARES_NODE_NAME_COLUMN] = main_params.get_antares_codes(node_list)
+    # The missing nodes were reported by `declared_areas_stage`, which filtered them out
+    df[ANTARES_NODE_NAME_COLUMN], _ = main_params.map_antares_codes(df[market_node_name_column], report_missing=False)
+    return df
+
+
+def read_csv_file(file_path: Path, input_cache: InputFileCache | None = None, **read_options: Any) -> pd.DataFrame:
+    """Reads a CSV input file, through the on-disk cache if the user enabled it."""
+    if input_cache is not None:
+        return input_cache.read_csv(file_path, **read_options)
+    df: pd.DataFrame = pd.read_csv(file_path, **read_options)
     return df
 
 
-def parse_input_file(input_file_path: Path, expected_columns: list[str]) -> pd.DataFrame:
+def parse_input_file(
+    input_file_path: Path,
+    expected_columns: list[str],
+    input_cache: InputFileCache | None = None,
+    dtypes: Mapping[str, type] | None = None,
+) -> pd.DataFrame:
+    """
+    Reads only the `expected_columns` of the given CSV file.
+    The header is read first so that a missing column is reported before parsing the whole file.
+    """
     if not input_file_path.exists():
         raise ValueError(f"File {input_file_path} not found")
 
     # Checks that all expected columns exist
-    df = pd.read_csv(input_file_path)
-    existing_cols = set(df.columns)
+    existing_cols = set(pd.read_csv(input_file_path, nrows=0).columns)
     for expected_column in expected_columns:
         if expected_column not in existing_cols:
             raise ValueError(f"Column {expected_column} not found in {input_file_path}")
 
-    # Keep useful columns only
+    # Parse useful columns only
+    df = read_csv_file(input_file_path, input_cache, usecols=expected_columns, dtype=dtypes)
     return df[expected_columns]
 
 
@@ -236,12 +409,123 @@ def write_excel_workbook(
         workbook.close()
 
 
-def filter_index_files_with_scenario_year(
-    main_params: MainParams, df: pd.DataFrame, year: int, filter_scenario_value: str, target_year_col: str
-) -> pd.DataFrame:
+def get_index_target_years(main_params: MainParams, year: int) -> list[str]:
+    """Returns the `TARGET_YEAR` values of the index files rows to consider for the given year."""
     scenario = main_params.get_scenario_type(year=year)
-    acceptable_scenario_types = [filter_scenario_value, f"{scenario}_{year}", f"All_years_{scenario}"]
-    return df[df[target_year_col].isin(acceptable_scenario_types)]
+    return [SCENARIO_TO_ALWAYS_CONSIDER, f"{scenario}_{year}", f"All_years_{scenario}"]
+
+
+class CurveIndex:
+    """
+    Index file (zone, id, target year and curve UID columns) prebuilt once for all the years.
+
+    The rows are sorted by (zone, id), keeping the file order of each pair, and the target years are factorized:
+    the curve UIDs of a pair for a given year are a slice of the rows, filtered on the target year codes,
+    instead of filtering and grouping the whole file again for every year.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        main_params: MainParams,
+        zone_col: str,
+        id_col: str,
+        target_year_col: str,
+        curve_uid_col: str,
+    ):
+        self.main_params = main_params
+        self.zone_col = zone_col
+        self.id_col = id_col
+        self.curve_uid_col = curve_uid_col
+
+        # Rows without zone or id can never be looked up
+        df = df.dropna(subset=[zone_col, id_col])
+        zone_codes, zones = pd.factorize(df[zone_col], sort=True)
+        id_codes, ids = pd.factorize(df[id_col], sort=True)
+        # `lexsort` is stable: each pair keeps the file order of its rows
+        order = np.lexsort((id_codes, zone_codes))
+        zone_codes, id_codes = zone_codes[order], id_codes[order]
+        self._zones = np.asarray(zones)[zone_codes]
+        self._ids = np.asarray(ids)[id_codes]
+        self._curve_uids = df[curve_uid_col].to_numpy()[order]
+        # Missing target years are given the code -1
+        target_year_codes, self._target_years = pd.factorize(df[target_year_col])
+        self._target_year_codes = target_year_codes[order]
+
+        new_pair = np.ones(len(order), dtype=bool)
+        new_pair[1:] = (np.diff(zone_codes) != 0) | (np.diff(id_codes) != 0)
+        starts = np.flatnonzero(new_pair)
+        ends = np.append(starts[1:], len(order))
+        self._pairs: dict[tuple[str, str], tuple[int, int]] = {
+            (zone, id_value): (start, end)
+            for zone, id_value, start, end in zip(
+                self._zones[starts], self._ids[starts], starts.tolist(), ends.tolist()
+            )
+        }
+        self._year_masks: dict[int, npt.NDArray[np.bool_]] = {}
+
+    def _get_year_mask(self, year: int) -> npt.NDArray[np.bool_]:
+        if year not in self._year_masks:
+            target_years = get_index_target_years(self.main_params, year)
+            codes = self._target_years.get_indexer(pd.Index(target_years))
+            self._year_masks[year] = np.isin(self._target_year_codes, codes[codes >= 0])
+        return self._year_masks[year]
+
+    def get_curve_uids(self, zone: str, id_value: str, year: int) -> list[str]:
+        """Returns the curve UIDs of the (zone, id) pair for the given year, in the file order."""
+        bounds = self._pairs.get((zone, id_value))
+        if bounds is None:
+            return []
+        start, end = bounds
+        curve_uids: list[str] = self._curve_uids[start:end][self._get_year_mask(year)[start:end]].tolist()
+        return curve_uids
+
+    def select_year(self, year: int) -> pd.DataFrame:
+        """Returns the zone, id and curve UID of the rows to consider for the given year, sorted by (zone, id)."""
+        mask = self._get_year_mask(year)
+        return pd.DataFrame(
+            {
+                self.zone_col: self._zones[mask],
+                self.id_col: self._ids[mask],
+                self.curve_uid_col: self._curve_uids[mask],
+            }
+        )
+
+    def get_referenced_curve_uids(self, years: list[int]) -> set[str]:
+        """Returns the curve UIDs that are used by at least one of the given years."""
+        mask = np.zeros(len(self._curve_uids), dtype=bool)
+        for year in years:
+            mask |= self._get_year_mask(year)
+        return set(self._curve_uids[mask])
+
+
+def read_time_series_header(file_path: Path, columns: set[str]) -> pd.Index:
+    """Reads the header of a time series file and checks that it contains all the given `columns`."""
+    header = pd.read_csv(file_path, nrows=0).columns
+    missing_columns = columns.difference(header)
+    if missing_columns:
+        raise ValueError(f"Columns {sorted(missing_columns)} not found in {file_path}")
+    return header
+
+
+def parse_time_series_file(
+    file_path: Path,
+    curve_uids: set[str],
+    input_cache: InputFileCache | None = None,
+    other_columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Time series files contain thousands of curves but only a few of them are referenced by the index files.
+    We only parse the `curve_uids` ones (and `other_columns` if given).
+    If the cache is enabled, the file is read from its memory-mapped binary version.
+    """
+    columns_to_keep = curve_uids.union(other_columns or [])
+    header = read_time_series_header(file_path, columns_to_keep)
+    usecols = [col for col in header if col in columns_to_keep]
+    if input_cache is not None:
+        return input_cache.read_time_series(file_path, usecols)
+    df: pd.DataFrame = pd.read_csv(file_path, usecols=usecols)
+    return df
 
 
 def insert_str_date_time_reindex(df: pd.DataFrame, year: int, datetime_column_name: str) -> pd.DataFrame:
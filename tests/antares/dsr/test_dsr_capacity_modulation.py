@@ -16,7 +16,14 @@ from pathlib import Path
 
 import pandas as pd
 
-from antares.data_collection.dsr.capacity_modulation.constants import DSR_CAPACITY_MODULATION_FOLDER
+from antares.data_collection.dsr.capacity_modulation.constants import (
+    DEFAULT_DSR_DERATING_TS,
+    DSR_CAPACITY_MODULATION_FOLDER,
+)
+from antares.data_collection.dsr.capacity_modulation.parsing import (
+    DsrCapacityModulationParser,
+    TimeSeriesAndClusterPair,
+)
 from antares.data_collection.dsr.parsing import DsrParser
 from antares.data_collection.referential_data.main_params import parse_main_params
 from tests.conftest import RESOURCE_PATH
@@ -64,3 +71,23 @@ def test_nominal_case(tmp_path: Path) -> None:
     sheet_name = list(generated_df.keys())[1]
     expected_df_2035 = pd.read_excel(expected_wb, sheet_name=sheet_name)
     pd.testing.assert_frame_equal(generated_df[sheet_name], expected_df_2035, check_dtype=False)
+
+
+def test_area_series_is_its_last_weighted_derating_curve(tmp_path: Path) -> None:
+    main_params = parse_main_params(RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+    parser = DsrCapacityModulationParser(RESOURCE_PATH, tmp_path, main_params, [2030])
+    curve = pd.Series([0.5] * 8760)
+
+    df = parser._build_pegase_dataframe(
+        {
+            "FR": {
+                "A": [TimeSeriesAndClusterPair(0.25, curve)],
+                "B": [TimeSeriesAndClusterPair(0.75, DEFAULT_DSR_DERATING_TS)],
+            },
+            "DE": {"A": [TimeSeriesAndClusterPair(1.0, curve)]},
+        }
+    )
+
+    assert list(df.columns[1:]) == ["FR_DSR", "DE_DSR"]
+    assert (df["FR_DSR"] == 0.75).all()
+    assert (df["DE_DSR"] == 0.5).all()
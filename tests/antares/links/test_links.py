@@ -10,15 +10,24 @@
 #
 # This file is part of the Antares project.
 
+import shutil
 import time
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
-from antares.data_collection.links.constants import LINKS_CLUSTER_FOLDER
-from antares.data_collection.links.parsing import LinksParser
+from antares.data_collection.links.constants import (
+    LINKS_CLUSTER_FOLDER,
+    LINKS_NTC_TS_NAME,
+    NTC_MEDIAN_COLUMNS,
+    InputNTCsColumns,
+    InputTransferLinksColumns,
+)
+from antares.data_collection.links.parsing import InternalMapping, LinksParser
 from antares.data_collection.referential_data.main_params import parse_main_params
+from antares.data_collection.utils import parse_time_series_file
 from tests.conftest import RESOURCE_PATH
 
 
@@ -65,3 +74,66 @@ def test_nominal_case(tmp_path: Path) -> None:
     sheet_name = list(generated_df.keys())[2]
     expected_df_2035 = pd.read_excel(expected_wb, sheet_name=sheet_name)
     pd.testing.assert_frame_equal(generated_df[sheet_name], expected_df_2035, check_dtype=False)
+
+
+def test_links_profile_selection(tmp_path: Path) -> None:
+    main_params = parse_main_params(RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+    parser = LinksParser(RESOURCE_PATH, tmp_path, main_params, [2030])
+
+    df = pd.DataFrame(
+        {
+            InputTransferLinksColumns.ZONE: ["FR", "FR", "FR", "IT", "IT"],
+            InputTransferLinksColumns.MARKET_ZONE_SOURCE: ["FR", "FR", "FR", "IT", "FR"],
+            InputTransferLinksColumns.MARKET_ZONE_DESTINATION: ["IT", "IT", "IT", "FR", "IT"],
+            InputTransferLinksColumns.TRANSFER_TECHNOLOGY: ["HVAC", "HVDC", "HVDC", "HVAC", "HVAC"],
+            InputTransferLinksColumns.NTC_LIMIT_CAPACITY_STATIC: [100.0, 10.0, 20.0, 50.0, None],
+            InputTransferLinksColumns.NTC_CURVE_ID: [None, None, None, None, "curve"],
+            InputTransferLinksColumns.NO_POLES: [0, 1, 2, 0, 0],
+            InputTransferLinksColumns.FOR: [0.05, 0.1, 0.2, 0.05, 0.05],
+        }
+    )
+    medians = pd.DataFrame([[1.0, 2.0, 3.0, 4.0, 500.0]], index=["IT:curve"], columns=NTC_MEDIAN_COLUMNS)
+    index = pd.DataFrame({"ZONE": ["IT"], "ID": ["curve"], "CURVE_UID": ["IT:curve"]})
+
+    active_rows = np.ones(len(df), dtype=bool)
+    result = parser._select_links_profiles(df, InternalMapping(index, medians), [active_rows])[0].iloc[0]
+
+    assert result["Name"] == "FR-IT"
+    # Direct: the IT profile has a curve whereas the FR one has HVDC links
+    assert result["Winter_HP_Direct_MW"] == 1.0
+    assert result["HVDC_Nb_Direct"] == 0
+    # Indirect: the FR profile has no row in this direction, so it is selected with null values
+    assert result["Winter_HP_Indirect_MW"] == 0.0
+
+
+def test_approximate_ntc_medians(tmp_path: Path) -> None:
+    # The NTC file is not inside the resources: it is generated from its index file, with integer values
+    input_folder = tmp_path / "input"
+    shutil.copytree(RESOURCE_PATH, input_folder, ignore=shutil.ignore_patterns("expected_output_files"))
+    hours = pd.read_csv(RESOURCE_PATH / "Group Derating.csv", usecols=list(InputNTCsColumns))
+    curve_uids = pd.read_csv(input_folder / "NTCs Index.csv")["CURVE_UID"].dropna().unique()
+    rng = np.random.default_rng(0)
+    curves = pd.DataFrame(rng.integers(0, 3000, (len(hours), len(curve_uids))).astype(float), columns=curve_uids)
+    curves.iloc[::5, 0] = np.nan
+    pd.concat([hours, curves], axis=1).to_csv(input_folder / LINKS_NTC_TS_NAME, index=False)
+
+    main_params = parse_main_params(RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+    workbooks: dict[float | None, dict[str, pd.DataFrame]] = {}
+    for tolerance in [None, 1.0]:
+        output_folder = tmp_path / f"output_{tolerance}"
+        LinksParser(input_folder, output_folder, main_params, [2030, 2035], median_tolerance=tolerance).build_links()
+        workbooks[tolerance] = pd.read_excel(output_folder / LINKS_CLUSTER_FOLDER / "PEMMDB_LINK.xlsx", sheet_name=None)
+
+    # A tolerance that divides the values gives the exact medians
+    assert workbooks[1.0].keys() == workbooks[None].keys()
+    for sheet_name, df in workbooks[None].items():
+        pd.testing.assert_frame_equal(workbooks[1.0][sheet_name], df)
+
+    # A coarse one keeps each median of each curve within half of it
+    parser = LinksParser(input_folder, tmp_path, main_params, [2030])
+    ntc_df = parse_time_series_file(input_folder / LINKS_NTC_TS_NAME, set(curve_uids), None, list(InputNTCsColumns))
+    exact = parser._compute_ntc_median_repartition(ntc_df)
+    tolerance = 50.0
+    approximate = parser._estimate_ntc_median_repartition(set(curve_uids), tolerance)
+    pd.testing.assert_index_equal(approximate.index, exact.index)
+    assert ((approximate - exact).abs() <= tolerance / 2).all().all()
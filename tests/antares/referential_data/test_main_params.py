@@ -11,14 +11,18 @@
 # This file is part of the Antares project.
 import pytest
 
+import pickle
 import re
 
+from dataclasses import asdict
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+from antares.data_collection.input_cache import InputFileCache
 from antares.data_collection.referential_data.main_params import ClusterParams, parse_main_params
+from antares.data_collection.referential_data.missing_mappings import MissingMappingCategory
 from tests.conftest import RESOURCE_PATH
 
 
@@ -281,6 +285,33 @@ def test_main_params_getters() -> None:
     assert main_params.get_peak_month_label(1) == "winter"
     assert main_params.get_peak_month_label(8) == "summer"
 
+    # Bulk lookups
+    codes, missing_mask = main_params.map_antares_codes(pd.Series(["AT00", "AL00", "unknown", "AT00"]))
+    assert missing_mask.tolist() == [False, True, True, False]
+    assert codes[~missing_mask].tolist() == ["AT", "AT"]
+
+    clusters, missing_mask = main_params.map_thermal_clusters_bp(pd.Series(["Gas/CCGT CCS", "unknown"]))
+    assert clusters.iloc[0] == "CCGT CCS"
+    assert missing_mask.tolist() == [False, True]
+
+    # List getters
+    assert main_params.get_antares_codes(["AT00", "AL00", "unknown"]) == ["AT", None, None]
+    assert main_params.get_thermal_clusters_bp(["Gas/CCGT CCS", "unknown"]) == ["CCGT CCS", None]
+    assert main_params.get_antares_clusters_common_data_params(["Nuclear"]) == [
+        main_params.get_antares_cluster_common_data_params("Nuclear")
+    ]
+
+    # An empty value is not a mapping
+    main_params._misc_cluster_pemmdb_to_antares["empty"] = ""
+    _, missing_mask = main_params.map_misc_clusters_bp(pd.Series(["empty"]))
+    assert missing_mask.tolist() == [True]
+    assert main_params.get_misc_clusters_bp(["empty"]) == [None]
+
+    common_data = main_params.get_antares_clusters_common_data()
+    nuclear_params = main_params.get_antares_cluster_common_data_params("Nuclear")
+    assert common_data.loc["Nuclear"].to_dict() == asdict(nuclear_params)
+    assert len(common_data) == len(main_params._cluster_antares)
+
 
 def test_parse_main_params_real_test_case(tmp_path: Path) -> None:
     # Use real test case
@@ -1033,3 +1064,38 @@ def test_parse_main_params_real_test_case(tmp_path: Path) -> None:
         11.0: "winter",
         12.0: "winter",
     }
+
+
+def test_parse_main_params_with_cache(tmp_path: Path) -> None:
+    file_path = RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx"
+    expected_main_params = parse_main_params(file_path=file_path)
+
+    for _ in range(2):  # compilation then cached read
+        main_params = parse_main_params(file_path=file_path, input_cache=InputFileCache(tmp_path / "cache"))
+        # `repr` as unpickled NaN values are not the `np.nan` object anymore
+        assert repr(main_params) == repr(expected_main_params)
+        assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+
+def test_missing_mappings_report(caplog: pytest.LogCaptureFixture) -> None:
+    main_params = parse_main_params(file_path=RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+
+    market_nodes = pd.Series(["AT00", "unknown", "unknown", "AL00"])
+    main_params.map_antares_codes(market_nodes)
+    # Rows mapped again are only counted by their first lookup
+    main_params.map_antares_codes(market_nodes[1:], report_missing=False)
+    # Other frames are counted even if their index labels are the same
+    main_params.map_antares_codes(pd.Series(["unknown", None]))
+    assert main_params.get_antares_code("unknown") is None
+    assert main_params.get_thermal_cluster_bp("Gas/CCGT CCS") == "CCGT CCS"
+
+    # The report belongs to the build, not to the referential
+    assert main_params == parse_main_params(file_path=RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+    assert pickle.loads(pickle.dumps(main_params)).pop_missing_mappings_report().is_empty()
+
+    report = main_params.pop_missing_mappings_report()
+    assert report.missing_values == {MissingMappingCategory.MARKET_NODE: {"unknown": 4, "AL00": 1, None: 1}}
+    assert main_params.pop_missing_mappings_report().is_empty()
+
+    report.log()
+    assert "Market node 'unknown' was not found inside `MainParams` (4 occurrences)" in caplog.text
@@ -9,15 +9,25 @@
 # SPDX-License-Identifier: MPL-2.0
 #
 # This file is part of the Antares project.
+import shutil
 import time
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from antares.data_collection.referential_data.main_params import parse_main_params
 from antares.data_collection.thermal.param_modulation.constants import TECHNICAL_PARAMS_FOLDER
+from antares.data_collection.thermal.param_modulation.parsing import (
+    InternalMapping,
+    LoadedCurves,
+    SearchDirection,
+    SharedCurves,
+    ThermalParamModulationParser,
+)
 from antares.data_collection.thermal.parsing import ThermalParser
+from antares.data_collection.utils import write_csv_file
 from tests.conftest import RESOURCE_PATH
 
 
@@ -64,3 +74,84 @@ def test_nominal_case(tmp_path: Path) -> None:
 
     expected_mr_2035 = pd.read_csv(expected_folder_path / "MR_PEMMDB_2034-2035.csv")
     pd.testing.assert_frame_equal(generated_mr_2035, expected_mr_2035, check_dtype=False)
+
+
+def test_curve_selection_on_curve_means(tmp_path: Path) -> None:
+    curves = LoadedCurves.from_data(
+        pd.DataFrame({"low": [0.0, 0.2], "low_bis": [0.1, 0.1], "high": [1.0, 0.8], "empty": [None, None]})
+    )
+    index = pd.DataFrame(
+        {
+            "ZONE": ["FR", "FR", "FR", "FR", "DE"],
+            "ID": ["A", "A", "A", "A", "B"],
+            "CURVE_UID": ["low", "high", "low_bis", "empty", "high"],
+        }
+    )
+    mapping = {0: InternalMapping(index, curves), 1: InternalMapping(index.iloc[:0], curves)}
+    groups = pd.DataFrame({"ID_0": ["A", "B", None], "ID_1": [None, None, "C"], "ZONE": ["FR", "FR", "FR"]})
+    parser = ThermalParamModulationParser(
+        tmp_path, tmp_path, parse_main_params(RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx"), []
+    )
+
+    # On equal means, the last candidate is selected
+    selected, not_present = parser._select_curves(groups, "ZONE", mapping, SearchDirection(lowest_mean=True))
+    assert selected["group"].tolist() == [0]
+    assert selected["CURVE_UID"].tolist() == ["low_bis"]
+    assert not_present.tolist() == [False, True, True]
+
+    selected, _ = parser._select_curves(groups, "ZONE", mapping, SearchDirection(lowest_mean=False))
+    assert selected["CURVE_UID"].tolist() == ["high"]
+
+
+def test_shared_curves_are_read_back_identically() -> None:
+    data = pd.DataFrame(
+        {
+            "float": [0.1, 0.2, np.nan],
+            "integer": [1, 1, 0],
+            "float32": np.array([0.5, 0.25, 1 / 3], dtype=np.float32),
+        }
+    )
+    curves = LoadedCurves.from_data(data)
+
+    shared, block = SharedCurves.create(curves)
+    try:
+        attached_curves, attached_block = shared.attach()
+        pd.testing.assert_frame_equal(attached_curves.data, data)
+        pd.testing.assert_series_equal(attached_curves.means, curves.means)
+        # Float curves are read-only views on the shared block
+        assert not attached_curves.data["float"].to_numpy().flags.writeable
+        del attached_curves
+        attached_block.close()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def test_years_built_in_parallel_after_polars_was_used(tmp_path: Path) -> None:
+    # The large time series files are not inside the resources: they are generated from their index files
+    input_folder = tmp_path / "input"
+    shutil.copytree(RESOURCE_PATH, input_folder, ignore=shutil.ignore_patterns("expected_output_files"))
+    hours = pd.read_csv(RESOURCE_PATH / "Group Derating.csv", usecols=["MONTH", "DAY", "HOUR"])
+    rng = np.random.default_rng(0)
+    for name in ["Derating", "Inelastic", "Must-run"]:
+        curve_uids = pd.read_csv(input_folder / f"{name} Index.csv")["CURVE_UID"].dropna().unique()
+        curves = pd.DataFrame(rng.integers(0, 100, (len(hours), len(curve_uids))) / 100, columns=curve_uids)
+        pd.concat([hours, curves], axis=1).to_csv(input_folder / f"{name}.csv", index=False)
+
+    main_params = parse_main_params(RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+    # Polars starts its thread pool, whose locks were inherited by forked workers and made them hang
+    write_csv_file(tmp_path / "polars.csv", pd.DataFrame({"A": [1]}))
+
+    output_files: dict[int, dict[str, bytes]] = {}
+    for max_workers in [1, 2]:
+        output_folder = tmp_path / f"output_{max_workers}"
+        parser = ThermalParser(
+            input_folder, output_folder, ["Available on market"], main_params, [2030, 2035], max_workers=max_workers
+        )
+        parser.build_param_modulation()
+        output_files[max_workers] = {
+            path.name: path.read_bytes() for path in (output_folder / TECHNICAL_PARAMS_FOLDER).iterdir()
+        }
+
+    assert len(output_files[1]) == 4
+    assert output_files[2] == output_files[1]
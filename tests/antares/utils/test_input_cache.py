@@ -0,0 +1,126 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import shutil
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from antares.data_collection.input_cache import InputFileCache
+from tests.conftest import RESOURCE_PATH
+
+
+def test_cached_file_matches_csv_parsing(tmp_path: Path) -> None:
+    input_path = RESOURCE_PATH / "Thermal.csv"
+    cache = InputFileCache(tmp_path / "cache")
+
+    first_read = cache.read_csv(input_path)
+    assert len(list((tmp_path / "cache").glob("*.parquet"))) == 1
+
+    # A new cache object on the same folder loads the Parquet file back
+    second_read = InputFileCache(tmp_path / "cache").read_csv(input_path)
+    pd.testing.assert_frame_equal(second_read, pd.read_csv(input_path))
+    pd.testing.assert_frame_equal(second_read, first_read)
+
+
+def test_cache_is_invalidated_when_the_file_changes(tmp_path: Path) -> None:
+    input_path = tmp_path / "input.csv"
+    pd.DataFrame({"A": [1, 2], "B": ["x", "y"]}).to_csv(input_path, index=False)
+    cache = InputFileCache(tmp_path / "cache")
+    assert cache.read_csv(input_path)["A"].tolist() == [1, 2]
+
+    pd.DataFrame({"A": [3, 4, 5], "B": ["x", "y", "z"]}).to_csv(input_path, index=False)
+    assert cache.read_csv(input_path)["A"].tolist() == [3, 4, 5]
+
+    # Reading options are part of the key
+    assert list(cache.read_csv(input_path, usecols=["B"]).columns) == ["B"]
+
+
+def test_files_that_cannot_be_stored_are_not_cached(tmp_path: Path) -> None:
+    input_path = tmp_path / "input.csv"
+    pd.DataFrame({"A": ["1", "x"]}).to_csv(input_path, index=False)
+    # Object column mixing integers and strings, which Parquet cannot store
+    converters = {"A": lambda value: int(value) if value.isdigit() else value}
+
+    cache = InputFileCache(tmp_path / "cache")
+    df = cache.read_csv(input_path, converters=converters)
+    assert df["A"].tolist() == [1, "x"]
+    assert not list((tmp_path / "cache").glob("*.parquet"))
+    assert not list((tmp_path / "cache").glob("*.tmp"))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    paths = []
+    for name in ["Batteries.csv", "DSR.csv", "Renewables.csv"]:
+        shutil.copy(RESOURCE_PATH / name, tmp_path / name)
+        paths.append(tmp_path / name)
+
+    cache_folder = tmp_path / "cache"
+    cache = InputFileCache(cache_folder)
+    for path in paths:
+        cache.read_csv(path)
+    sizes = sorted(p.stat().st_size for p in cache_folder.glob("*.parquet"))
+    assert len(sizes) == 3
+
+    # Shrink the budget: only the most recently used file is kept
+    cache.read_csv(paths[2])
+    small_cache = InputFileCache(cache_folder, max_size=sizes[-1])
+    remaining_entries = {p.name for p in cache_folder.glob("*.parquet")}
+    assert remaining_entries == {f"{InputFileCache._build_key(paths[2], {})}.parquet"}
+
+    # Reading it again is a cache hit
+    pd.testing.assert_frame_equal(small_cache.read_csv(paths[2]), pd.read_csv(paths[2]))
+    assert {p.name for p in cache_folder.glob("*.parquet")} == remaining_entries
+
+
+def test_time_series_are_memory_mapped(tmp_path: Path) -> None:
+    input_path = RESOURCE_PATH / "Group Derating.csv"
+    usecols = ["MONTH", "HOUR", "CY:Group_Derating_Paramount_All_years_ERAA_TYNDP_All__other__weather_scenarios"]
+    expected_df = pd.read_csv(input_path, usecols=usecols)
+
+    cache = InputFileCache(tmp_path / "cache")
+    for _ in range(2):  # ingestion then memory-mapped read
+        df = cache.read_time_series(input_path, usecols)
+        pd.testing.assert_frame_equal(df, expected_df)
+        assert len(list((tmp_path / "cache").glob("*.bin"))) == 1
+
+    # Curves are views on the read-only mapped file
+    assert not df[usecols[2]].to_numpy().flags.writeable
+
+    # Less precise storage
+    float32_cache = InputFileCache(tmp_path / "cache_32", time_series_dtype=np.float32)
+    df_32 = float32_cache.read_time_series(input_path, usecols)
+    pd.testing.assert_frame_equal(df_32, expected_df, check_dtype=False, rtol=1e-6)
+
+
+def test_entries_larger_than_the_budget_are_still_read(tmp_path: Path) -> None:
+    input_path = RESOURCE_PATH / "Group Derating.csv"
+    usecols = ["MONTH", "HOUR", "CY:Group_Derating_Paramount_All_years_ERAA_TYNDP_All__other__weather_scenarios"]
+    expected_df = pd.read_csv(input_path, usecols=usecols)
+
+    cache_folder = tmp_path / "cache"
+    cache = InputFileCache(cache_folder, max_size=1000)
+    pd.testing.assert_frame_equal(cache.read_time_series(input_path, usecols), expected_df)
+
+    # The mapped matrix is in use: it is not evicted by the next entries
+    pd.testing.assert_frame_equal(cache.read_csv(RESOURCE_PATH / "DSR.csv"), pd.read_csv(RESOURCE_PATH / "DSR.csv"))
+    assert len(list(cache_folder.glob("*.bin"))) == 1
+    pd.testing.assert_frame_equal(cache.read_time_series(input_path, usecols), expected_df)
+
+    # The Parquet entry is evicted once another one is read
+    pd.testing.assert_frame_equal(
+        cache.read_csv(RESOURCE_PATH / "Thermal.csv"), pd.read_csv(RESOURCE_PATH / "Thermal.csv")
+    )
+    assert {p.name for p in cache_folder.glob("*.parquet")} == {
+        f"{InputFileCache._build_key(RESOURCE_PATH / 'Thermal.csv', {})}.parquet"
+    }
@@ -0,0 +1,38 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+import numpy as np
+
+from antares.data_collection.quantile_sketch import BinnedMedianSketch
+
+
+def test_medians_are_within_the_tolerance() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.normal(1000, 300, size=(3, 5001))
+    values[1, ::7] = np.nan
+    keys = np.repeat(np.arange(3), values.shape[1])
+
+    tolerance = 2.0
+    sketch = BinnedMedianSketch(tolerance)
+    # Streamed by parts, in any order
+    for part in np.array_split(rng.permutation(values.size), 4):
+        sketch.update(keys[part], values.ravel()[part])
+
+    # The key 3 has no value
+    medians = sketch.medians(np.array([2, 0, 1, 3]))
+    expected = np.nanmedian(values, axis=1)[[2, 0, 1]]
+    assert np.all(np.abs(medians[:3] - expected) <= tolerance / 2)
+    assert np.isnan(medians[3])
+
+    # Values that are multiples of the tolerance are exact
+    exact_sketch = BinnedMedianSketch(1.0)
+    exact_sketch.update(np.zeros(4, dtype=np.int64), np.array([4.0, 1.0, 2.0, 10.0]))
+    assert exact_sketch.medians(np.array([0])).tolist() == [3.0]
@@ -14,9 +14,26 @@ import pytest
 
 import re
 
+from pathlib import Path
+
 import pandas as pd
 
-from antares.data_collection.utils import filter_based_on_op_stat
+from antares.data_collection.filter_pipeline import FilterPipeline, FilterStage
+from antares.data_collection.referential_data.main_params import parse_main_params
+from antares.data_collection.utils import (
+    CurveIndex,
+    StudyScenarioIndex,
+    UnitLifetimeIndex,
+    commission_date_stage,
+    filter_based_on_commission_date,
+    filter_based_on_op_stat,
+    filter_out_based_on_year,
+    net_max_gen_cap_stage,
+    op_stat_stage,
+    parse_input_file,
+    parse_time_series_file,
+)
+from tests.conftest import RESOURCE_PATH
 
 
 @pytest.fixture
@@ -42,3 +59,143 @@ def test_filter_df_values_based_on_op_stat_empty_df(df_test_utils_filter: pd.Dat
         ValueError, match=re.escape(f"The given op_stat values {list_value_filter} are not present in the dataframe")
     ):
         filter_based_on_op_stat(list_value_filter, df, colname_filter)
+
+
+def test_parse_input_file_reads_expected_columns_only(tmp_path: Path) -> None:
+    file_path = tmp_path / "input.csv"
+    pd.DataFrame({"A": [1, 2], "B": ["x", None], "C": ["1", "2"], "D": [0.1, 0.2]}).to_csv(file_path, index=False)
+
+    df = parse_input_file(file_path, ["C", "A", "B"], dtypes={"B": str, "C": str})
+    assert list(df.columns) == ["C", "A", "B"]
+    assert df["C"].tolist() == ["1", "2"]
+    assert df["B"].isna().tolist() == [False, True]
+
+    with pytest.raises(ValueError, match=re.escape(f"Column E not found in {file_path}")):
+        parse_input_file(file_path, ["A", "E"])
+
+
+def test_parse_time_series_file_only_reads_referenced_curves() -> None:
+    main_params = parse_main_params(RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+    index_df = pd.read_csv(RESOURCE_PATH / "Group Derating Index.csv")
+    curve_index = CurveIndex(index_df, main_params, "ZONE", "ID", "TARGET_YEAR", "CURVE_UID")
+    curve_uids = curve_index.get_referenced_curve_uids([2030])
+    assert "CY:Group_Derating_Paramount_All_years_ERAA_TYNDP_All__other__weather_scenarios" in curve_uids
+    assert "CY:Group_Derating_VASS_FL_ERAA_2028_All__other__weather_scenarios" not in curve_uids
+
+    file_path = RESOURCE_PATH / "Group Derating.csv"
+    df = parse_time_series_file(file_path, curve_uids, other_columns=["HOUR"])
+    full_df = pd.read_csv(file_path)
+    expected_columns = [col for col in full_df.columns if col in curve_uids or col == "HOUR"]
+    assert list(df.columns) == expected_columns
+    pd.testing.assert_frame_equal(df, full_df[expected_columns])
+
+    # A referenced curve must be inside the file
+    with pytest.raises(ValueError, match="Columns \\['CY:unknown'\\] not found"):
+        parse_time_series_file(file_path, curve_uids | {"CY:unknown"})
+
+
+def test_curve_index_matches_the_index_file_grouped_by_year() -> None:
+    main_params = parse_main_params(RESOURCE_PATH / "MAIN_PARAMS_2025.xlsx")
+    index_df = pd.read_csv(RESOURCE_PATH / "Group Derating Index.csv")
+    curve_index = CurveIndex(index_df, main_params, "ZONE", "ID", "TARGET_YEAR", "CURVE_UID")
+
+    for year in [2030, 2035]:
+        scenario = main_params.get_scenario_type(year)
+        target_years = ["All_years_ERAA_TYNDP", f"{scenario}_{year}", f"All_years_{scenario}"]
+        year_df = index_df[index_df["TARGET_YEAR"].isin(target_years)]
+        for (zone, id_value), group_df in year_df.groupby(["ZONE", "ID"]):
+            assert curve_index.get_curve_uids(str(zone), str(id_value), year) == group_df["CURVE_UID"].tolist()
+
+        selected_df = curve_index.select_year(year)
+        assert len(selected_df) == len(year_df.dropna(subset=["ZONE", "ID"]))
+
+    assert curve_index.get_curve_uids("unknown", "unknown", 2030) == []
+
+
+def test_filter_based_on_commission_date() -> None:
+    df = pd.DataFrame(
+        {
+            "ID": ["too_late", "too_early", "no_end", "in_2030", "in_2035"],
+            "START": ["2036-01-01", "2000-01-01", "2000-01-01", "2029-06-01", "2035-12-31"],
+            "END": ["2040-01-01", "2028-12-31", None, "2029-01-01", "2036-01-01"],
+        }
+    )
+
+    filtered_df = filter_based_on_commission_date(df, [2030, 2035], "START", "END")
+    assert filtered_df["ID"].tolist() == ["no_end", "in_2030", "in_2035"]
+    # Missing decommissioning dates are set to the default one
+    assert filtered_df["END"].iloc[0] == pd.Timestamp(year=2100, month=1, day=1)
+
+    with pytest.raises(ValueError, match=re.escape("No input data matched the given (de)commissioning dates")):
+        filter_based_on_commission_date(df.iloc[:2].copy(), [2030], "START", "END")
+
+
+def test_study_scenario_index_matches_exact_scenarios() -> None:
+    study_scenarios = pd.Series(["ERAA&TYNDP", "TYNDP", "eraa", "ERAA_2", None], index=[10, 11, 12, 13, 14])
+    scenario_index = StudyScenarioIndex(study_scenarios)
+
+    assert scenario_index.get_mask(["ERAA"]).tolist() == [True, False, True, False, False]
+    assert scenario_index.get_mask(["TYNDP"]).tolist() == [True, True, False, False, False]
+    assert scenario_index.get_mask([]).index.tolist() == [10, 11, 12, 13, 14]
+
+
+def test_filter_pipeline() -> None:
+    df = pd.DataFrame(
+        {
+            "OP_STAT": ["ok", "ok", "ko", "ok"],
+            "CAP": [10, 0, 10, 10],
+            "START": ["2000-01-01", "2000-01-01", "2000-01-01", "2040-01-01"],
+            "END": [None, None, None, None],
+        }
+    )
+    pipeline = FilterPipeline(
+        [op_stat_stage([], "OP_STAT"), op_stat_stage(["ok"], "OP_STAT"), net_max_gen_cap_stage("CAP")]
+    )
+
+    filtered_df = pipeline.apply(df)
+    assert filtered_df.index.tolist() == [0, 3]
+    assert [(r.name, r.rows_in, r.rows_out) for r in pipeline.reports] == [
+        ("op_stat", 4, 4),
+        ("op_stat", 4, 3),
+        ("net_max_gen_cap (CAP)", 3, 2),
+    ]
+
+    # Masks are aligned on the labels of the remaining rows, e.g. when they are built on the unfiltered DataFrame
+    external_mask = pd.Series([False, True, True, True], index=[3, 2, 1, 0])
+    external_stage = FilterStage("external", lambda _: external_mask)
+    assert FilterPipeline([op_stat_stage(["ok"], "OP_STAT"), external_stage]).apply(df).index.tolist() == [0, 1]
+    with pytest.raises(ValueError, match="The mask of the filter 'external' does not cover all the filtered rows"):
+        FilterPipeline([FilterStage("external", lambda _: external_mask.iloc[:2])]).apply(df)
+
+    # Stages do not modify the input DataFrame
+    input_df = df.copy()
+    FilterPipeline([commission_date_stage([2030], "START", "END")]).apply(df)
+    pd.testing.assert_frame_equal(df, input_df)
+
+    # Empty results are raised by the stage that removed the last rows
+    pipeline.stages.append(commission_date_stage([2030], "START", "END"))
+    pipeline.stages.append(op_stat_stage(["unknown"], "OP_STAT"))
+    with pytest.raises(ValueError, match=re.escape("No input data matched the given (de)commissioning dates")):
+        pipeline.apply(df[~df.index.isin([0])].copy())
+
+
+def test_unit_lifetime_index_matches_date_comparisons() -> None:
+    df = pd.DataFrame(
+        {
+            "START": pd.to_datetime(
+                pd.Series(["2029-06-01 00:00", "2030-01-01 06:00", "2030-01-01 00:00", None, "2000-01-01 00:00"])
+            ),
+            "END": pd.to_datetime(
+                pd.Series(["2031-01-01 00:00", "2040-01-01 00:00", "2029-12-31 23:00", "2040-01-01 00:00", None])
+            ),
+        },
+    )
+    df.index = pd.Index([5, 6, 7, 8, 9])
+    lifetime_index = UnitLifetimeIndex(df, [2030, 2031], "START", "END")
+
+    # 2032 is not part of the index years
+    for year in [2030, 2031, 2032]:
+        expected_df = filter_out_based_on_year(df, year, "START", "END")
+        pd.testing.assert_frame_equal(filter_out_based_on_year(df, year, "START", "END", lifetime_index), expected_df)
+
+    assert lifetime_index.select(df.loc[[6, 5]], 2031).index.tolist() == [6, 5]